@@ -0,0 +1,142 @@
+# Komendy administracyjne, uruchamiane z folderu api:
+#   python -m app.cli rebuild-ratings
+#   python -m app.cli geocode-restaurants
+#   python -m app.cli rebuild-cuisines
+#   python -m app.cli rebuild-search
+#   python -m app.cli rebuild-stats
+#   python -m app.cli check-query-plans
+#   python -m app.cli import products menu.csv
+import argparse
+import sys
+import time
+
+from app.core import bulk
+from app.core.config import BULK_IMPORT_CHUNK_SIZE
+from app.db.database import SessionLocal, engine
+from app.db.query_plans import check_query_plans
+from app.main import app  # noqa: F401 - rejestruje modele i tworzy tabele
+from app.modules.orders import importer as order_importer
+from app.modules.orders import service as order_service
+from app.modules.orders import stats as order_stats
+from app.modules.restaurants import geocoding, importer, search
+from app.modules.restaurants import service as restaurant_service
+
+
+def rebuild_ratings(args):
+    db = SessionLocal()
+    try:
+        updated = order_service.rebuild_rating_aggregates(db)
+        print(f"Przeliczono oceny {updated} restauracji")
+    finally:
+        db.close()
+
+
+def geocode_restaurants(args):
+    db = SessionLocal()
+    try:
+        filled = geocoding.fill_missing_coordinates(db)
+        print(f"Uzupełniono współrzędne {filled} restauracji")
+    finally:
+        db.close()
+
+
+def rebuild_cuisines(args):
+    db = SessionLocal()
+    try:
+        links = restaurant_service.rebuild_cuisine_index(db)
+        print(f"Zapisano {links} powiązań restauracja-kuchnia")
+    finally:
+        db.close()
+
+
+def rebuild_search(args):
+    db = SessionLocal()
+    try:
+        indexed = search.rebuild_search_index(db)
+        print(f"Zaindeksowano {indexed} restauracji do wyszukiwania")
+    finally:
+        db.close()
+
+
+def rebuild_stats(args):
+    db = SessionLocal()
+    try:
+        days = order_stats.rebuild_order_stats(db)
+        print(f"Przeliczono {days} dziennych agregatów zamówień")
+    finally:
+        db.close()
+
+
+def check_plans(args):
+    failed = 0
+    with engine.connect() as connection:
+        for name, plan, scans in check_query_plans(connection):
+            print(("SKAN  " if scans else "OK    ") + name)
+            if scans or args.verbose:
+                for line in plan:
+                    print("        " + line)
+            failed += bool(scans)
+    if failed:
+        print(f"{failed} zapytań bez indeksu")
+        sys.exit(1)
+
+
+IMPORTERS = {
+    "restaurants": importer.import_restaurants,
+    "products": importer.import_products,
+    "orders": order_importer.import_orders,
+}
+
+
+def import_data(args):
+    try:
+        fmt = bulk.detect_format(args.file, args.format)
+    except ValueError as exc:
+        print(exc)
+        sys.exit(2)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(args.file, "rb") as stream:
+            report = IMPORTERS[args.kind](db, stream, fmt, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    for error in report.errors:
+        print(f"wiersz {error['row']}: {error['error']}")
+    if report.failed > len(report.errors):
+        print(f"... i {report.failed - len(report.errors)} kolejnych błędów")
+    print(f"Zapisano {report.inserted}, odrzucono {report.failed} w {time.perf_counter() - started:.1f} s")
+    if report.failed:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-ratings", help="Przelicz agregaty ocen restauracji z tabeli reviews")\
+        .set_defaults(func=rebuild_ratings)
+    commands.add_parser("geocode-restaurants", help="Uzupełnij brakujące współrzędne restauracji")\
+        .set_defaults(func=geocode_restaurants)
+    commands.add_parser("rebuild-cuisines", help="Odbuduj tabelę restaurant_cuisines z pola cuisines")\
+        .set_defaults(func=rebuild_cuisines)
+    commands.add_parser("rebuild-search", help="Odbuduj indeks wyszukiwania pełnotekstowego")\
+        .set_defaults(func=rebuild_search)
+    commands.add_parser("rebuild-stats", help="Odbuduj agregaty statystyk właścicieli z tabeli orders")\
+        .set_defaults(func=rebuild_stats)
+    plans = commands.add_parser("check-query-plans", help="Sprawdź (EXPLAIN), czy gorące zapytania używają indeksów")
+    plans.add_argument("-v", "--verbose", action="store_true", help="Wypisz plany wszystkich zapytań")
+    plans.set_defaults(func=check_plans)
+    imports = commands.add_parser("import", help="Import masowy z pliku CSV / JSONL / JSON")
+    imports.add_argument("kind", choices=sorted(IMPORTERS))
+    imports.add_argument("file")
+    imports.add_argument("--format", choices=bulk.FORMATS, help="Domyślnie z rozszerzenia pliku")
+    imports.add_argument("--chunk-size", type=int, default=BULK_IMPORT_CHUNK_SIZE)
+    imports.set_defaults(func=import_data)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Wspólna zależność uwierzytelniania dla wszystkich routerów
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt, JWTError
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db, SessionLocal
+from app.core.cache import TTLCache
+from app.core.config import SECRET_KEY, ALGORITHM, AUTH_CACHE_TTL_SECONDS, AUTH_CACHE_MAX_SIZE
+from app.modules.users.models import User
+from app.modules.users.schemas import CurrentUser
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+_optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
+
+# token -> CurrentUser; powtórne żądania z tym samym tokenem nie dotykają bazy
+_user_cache = TTLCache(max_size=AUTH_CACHE_MAX_SIZE, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+
+def _credentials_exception():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> CurrentUser:
+    """
+    Zwraca migawkę zalogowanego użytkownika (id, email, rola).
+    Wynik jest cache'owany per token do czasu wygaśnięcia tokena lub AUTH_CACHE_TTL_SECONDS.
+    """
+    cached = _user_cache.get(token)
+    if cached is not None:
+        return cached
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            raise _credentials_exception()
+    except JWTError:
+        raise _credentials_exception()
+
+    user = db.query(User.id, User.email, User.role).filter(User.email == email).first()
+    if user is None:
+        raise _credentials_exception()
+
+    snapshot = CurrentUser.model_validate(user)
+    ttl = payload["exp"] - time.time() if "exp" in payload else None
+    _user_cache.set(token, snapshot, ttl)
+    return snapshot
+
+
+def get_stream_user(
+    token: Optional[str] = Depends(_optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None),
+) -> CurrentUser:
+    """
+    Dla strumieni SSE: EventSource w przeglądarce nie wysyła nagłówków, więc token
+    może przyjść też w ?access_token=. Sesja DB jest zamykana od razu, a nie trzyma
+    połączenia przez cały czas trwania strumienia.
+    """
+    token = token or access_token
+    if not token:
+        raise _credentials_exception()
+    db = SessionLocal()
+    try:
+        return get_current_user(token, db)
+    finally:
+        db.close()
+
+
+def get_current_db_user(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Pełny obiekt User z bazy - dla endpointów, które go modyfikują lub zwracają."""
+    user = db.get(User, current_user.id)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+def invalidate_user(user_id: int):
+    """Wywołać po zmianie roli lub usunięciu użytkownika."""
+    _user_cache.delete_where(lambda snapshot: snapshot.id == user_id)
@@ -0,0 +1,170 @@
+# Import masowy z plików CSV / JSONL / JSON: strumieniowy odczyt, walidacja w paczkach,
+# zapis przez executemany - jedna transakcja na paczkę - i raport błędów per wiersz.
+import csv
+import io
+import json
+from itertools import islice
+from typing import Callable, IO, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import BULK_IMPORT_CHUNK_SIZE, BULK_IMPORT_MAX_ERRORS
+
+FORMATS = ("csv", "jsonl", "json")
+
+Record = Tuple[int, dict]  # (numer wiersza od 1, dane)
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = False  # błędów było więcej niż BULK_IMPORT_MAX_ERRORS
+
+
+class ImportReport:
+    def __init__(self, max_errors: int = BULK_IMPORT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def error(self, row: int, message: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": message})
+
+    def result(self) -> ImportResult:
+        return ImportResult(
+            inserted=self.inserted,
+            failed=self.failed,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors),
+        )
+
+
+# --- Odczyt ---
+
+def detect_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    fmt = (requested or (filename or "").rsplit(".", 1)[-1]).lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in FORMATS:
+        raise ValueError(f"Nieobsługiwany format pliku: {fmt or '?'} (dozwolone: {', '.join(FORMATS)})")
+    return fmt
+
+
+def upload_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    """detect_format dla endpointów - nieznany format to 400."""
+    try:
+        return detect_format(filename, requested)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def read_records(stream: IO[bytes], fmt: str) -> Iterator[Record]:
+    """
+    Rekordy z pliku binarnego. CSV i JSONL są czytane strumieniowo (pamięć nie rośnie z rozmiarem pliku),
+    JSON - tablica obiektów - w całości. Puste pola CSV są pomijane (wartość domyślna schematu).
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, {key: value for key, value in row.items() if value not in ("", None)}
+    elif fmt == "jsonl":
+        number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, {"__error__": f"Niepoprawny JSON: {exc.msg}"}
+    else:
+        data = json.load(text)
+        if not isinstance(data, list):
+            raise ValueError("Plik JSON musi zawierać tablicę obiektów")
+        yield from enumerate(data, start=1)
+
+
+def _guarded(records: Iterable[Record], report: ImportReport) -> Iterator[Record]:
+    # uszkodzony plik (kodowanie, CSV, JSON) kończy import - zapisane paczki zostają, błąd trafia do raportu
+    number = 0
+    try:
+        for number, data in records:
+            yield number, data
+    except (ValueError, csv.Error) as exc:
+        report.error(number + 1, f"Nie można odczytać pliku: {exc}")
+
+
+def chunked(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate(chunk: List[Record], schema, report: ImportReport) -> List[Tuple[int, BaseModel]]:
+    """Wiersze zgodne ze schematem pydantic; pozostałe trafiają do raportu."""
+    valid = []
+    for number, data in chunk:
+        if not isinstance(data, dict):
+            report.error(number, "Wiersz musi być obiektem")
+            continue
+        if "__error__" in data:
+            report.error(number, data["__error__"])
+            continue
+        try:
+            valid.append((number, schema.model_validate(data)))
+        except ValidationError as exc:
+            report.error(number, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+            ))
+    return valid
+
+
+# --- Zapis ---
+
+def import_records(
+    db,
+    records: Iterable[Record],
+    prepare: Callable[[object, List[Record], ImportReport], List[Tuple[int, dict]]],
+    insert: Callable[[object, List[dict]], None],
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+    report: Optional[ImportReport] = None,
+) -> ImportReport:
+    """
+    prepare(db, paczka, raport) - walidacja i sprawdzenia w bazie (jedno zapytanie IN na paczkę),
+    zwraca (numer wiersza, wiersz do zapisu); insert(db, wiersze) - zapis executemany.
+    Błąd bazy w paczce: paczka jest powtarzana wiersz po wierszu (savepoint), żeby wskazać winny wiersz.
+    """
+    report = report or ImportReport()
+    for chunk in chunked(_guarded(records, report), chunk_size):
+        rows = prepare(db, chunk, report)
+        if not rows:
+            continue
+        try:
+            insert(db, [row for _, row in rows])
+            db.commit()
+            report.inserted += len(rows)
+        except DBAPIError:
+            db.rollback()
+            for number, row in rows:
+                try:
+                    with db.begin_nested():
+                        insert(db, [row])
+                    report.inserted += 1
+                except DBAPIError as exc:
+                    report.error(number, str(exc.orig))
+            db.commit()
+    return report
@@ -0,0 +1,145 @@
+# Publish/subscribe zdarzeń aplikacji (np. zmiany statusu zamówień dla strumieni SSE).
+# "local" - w pamięci procesu (jeden worker, testy); "redis" - między procesami/serwerami.
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.core.config import EVENTS_BACKEND, EVENTS_REDIS_URL, EVENTS_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# wstawiane zamiast wiadomości, gdy subskrybent nie nadąża - strumień się kończy,
+# a klient (EventSource) łączy się ponownie i dostaje świeży stan
+OVERFLOW = object()
+
+
+class Subscription:
+    async def get(self, timeout: float):
+        """Następna wiadomość (dict), OVERFLOW albo None po upływie timeout."""
+        raise NotImplementedError
+
+
+class EventBroker:
+    name = "base"
+
+    async def publish(self, channel: str, message: dict):
+        raise NotImplementedError
+
+    def subscribe(self, channel: str):
+        """Async context manager zwracający Subscription."""
+        raise NotImplementedError
+
+
+# --- W pamięci procesu ---
+
+class _LocalSubscription(Subscription):
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+
+    def deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self, timeout: float):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker(EventBroker):
+    name = "local"
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def publish(self, channel: str, message: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            # subskrybent może żyć w innej pętli zdarzeń niż publikujący
+            subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        subscription = _LocalSubscription()
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscription)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+# --- Redis (opcjonalna zależność: pip install redis) ---
+
+class _RedisSubscription(Subscription):
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    async def get(self, timeout: float):
+        message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        return json.loads(message["data"])
+
+
+class RedisBroker(EventBroker):
+    name = "redis"
+
+    def __init__(self, url: str = EVENTS_REDIS_URL):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("EVENTS_BACKEND=redis wymaga pakietu redis (pip install redis)")
+        self._redis = redis.from_url(url)
+
+    async def publish(self, channel: str, message: dict):
+        await self._redis.publish(channel, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            yield _RedisSubscription(pubsub)
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+
+_BROKERS = {"local": LocalBroker, "redis": RedisBroker}
+_broker: Optional[EventBroker] = None
+
+
+def get_broker() -> EventBroker:
+    global _broker
+    if _broker is None:
+        _broker = _BROKERS[EVENTS_BACKEND]()
+    return _broker
+
+
+def set_broker(broker: EventBroker):
+    global _broker
+    _broker = broker
+
+
+async def publish(channel: str, message: dict):
+    """Publikuje bez przerywania żądania - zapis w bazie już się udał, strumień to dodatek."""
+    try:
+        await get_broker().publish(channel, message)
+    except Exception as e:
+        logger.warning(f"Nie udało się opublikować zdarzenia na {channel}: {e}")
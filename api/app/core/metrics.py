@@ -0,0 +1,219 @@
+# Metryki wydajności żądań: czas odpowiedzi, liczba zapytań SQL i czas bazy per endpoint.
+# Eksport w formacie Prometheus (GET /metrics) i w nagłówku Server-Timing każdej odpowiedzi.
+# Liczniki są w pamięci procesu - przy kilku workerach Prometheus zbiera każdy osobno.
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import METRICS_LATENCY_BUCKETS, METRICS_SQL_BUCKETS
+
+
+class RequestStats:
+    """Zapytania SQL bieżącego żądania - zmieniane przez hooki silnika, także z wątków puli."""
+
+    __slots__ = ("sql_count", "db_seconds", "scope")
+
+    def __init__(self, scope=None):
+        self.sql_count = 0
+        self.db_seconds = 0.0
+        self.scope = scope  # scope ASGI - po routingu zawiera "route"
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_route() -> Optional[str]:
+    """"GET /orders/{order_id}" dla bieżącego żądania; None poza żądaniem HTTP."""
+    stats = _current.get()
+    if stats is None or stats.scope is None:
+        return None
+    return f"{stats.scope['method']} {route_label(stats.scope)}"
+
+
+# --- Hooki SQLAlchemy ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _handle_error(exception_context):
+    # zapytanie zakończone błędem nie wywołuje after_cursor_execute
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Liczenie zapytań i czasu bazy; dla AsyncEngine podajemy engine.sync_engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --- Rejestr metryk ---
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # ostatni kubełek: +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, route, status) -> histogram czasu odpowiedzi
+        self.latency: Dict[Tuple[str, str, str], Histogram] = {}
+        # (method, route) -> histogram liczby zapytań SQL na żądanie
+        self.sql_statements: Dict[Tuple[str, str], Histogram] = {}
+        # (method, route) -> łączny czas bazy
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            key = (method, route, str(status))
+            if key not in self.latency:
+                self.latency[key] = Histogram(METRICS_LATENCY_BUCKETS)
+            self.latency[key].observe(seconds)
+
+            key = (method, route)
+            if key not in self.sql_statements:
+                self.sql_statements[key] = Histogram(METRICS_SQL_BUCKETS)
+            self.sql_statements[key].observe(stats.sql_count)
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + stats.db_seconds
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.sql_statements.clear()
+            self.db_seconds.clear()
+
+    def render(self) -> str:
+        """Format tekstowy Prometheusa (text/plain; version=0.0.4)."""
+        lines = []
+        with self._lock:
+            _render_histogram(
+                lines, "http_request_duration_seconds", "Czas obsługi żądania HTTP",
+                ("method", "route", "status"), self.latency,
+            )
+            _render_histogram(
+                lines, "http_request_sql_statements", "Liczba zapytań SQL na żądanie",
+                ("method", "route"), self.sql_statements,
+            )
+            lines.append("# HELP http_request_db_seconds_total Łączny czas zapytań SQL")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for key, value in sorted(self.db_seconds.items()):
+                lines.append(f"http_request_db_seconds_total{_labels(('method', 'route'), key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = 'le="{}"'.format("+Inf" if bound == float("inf") else _number(bound))
+            lines.append(f"{name}_bucket{_labels(label_names, key, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, key)} {_number(histogram.sum)}")
+        lines.append(f"{name}_count{_labels(label_names, key)} {cumulative}")
+
+
+registry = MetricsRegistry()
+
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: mierzy żądanie i dopisuje nagłówek Server-Timing (db - zapytania SQL, app - całość).
+    Etykieta route to szablon ścieżki (/orders/{order_id}), nie konkretny adres - stała liczba serii.
+    Strumienie SSE (text/event-stream) dostają nagłówek, ale nie trafiają do histogramów.
+    """
+
+    def __init__(self, app, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = {"status": 500, "streaming": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                response["streaming"] = any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                )
+                headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            if not response["streaming"]:
+                registry.observe(
+                    scope["method"],
+                    route_label(scope),
+                    response["status"],
+                    time.perf_counter() - started,
+                    stats,
+                )
+
+
+def _server_timing(stats: RequestStats, seconds: float) -> str:
+    return (
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.sql_count} SQL", '
+        f"app;dur={seconds * 1000:.2f}"
+    )
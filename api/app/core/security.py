@@ -1,10 +1,23 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Tuple
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
-from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.config import (
+    SECRET_KEY, ALGORITHM, BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min = max = domyślny koszt, więc hash z innym kosztem wymaga przeliczenia (rehash przy logowaniu)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -12,6 +25,57 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    # (czy hasło poprawne, nowy hash jeśli zmienił się koszt - inaczej None)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# --- Hashowanie poza pętlą zdarzeń ---
+# bcrypt to ~250 ms CPU, więc liczymy go w osobnej puli procesów.
+# Gdy w kolejce jest już PASSWORD_HASH_MAX_PENDING zadań, od razu zwracamy 429.
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        return _hash_pool
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+async def _run_in_hash_pool(fn, *args):
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=429,
+            detail="Serwer jest przeciążony, spróbuj ponownie za chwilę",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), fn, *args)
+    finally:
+        _pending.release()
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_in_hash_pool(verify_and_update_password, plain_password, hashed_password)
+
+
 # --- POPRAWIONA FUNKCJA ---
 # Dodano argument expires_delta: Optional[timedelta] = None
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
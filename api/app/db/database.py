@@ -1,15 +1,89 @@
-#SQLite
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-import os
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'foodapp.db')}"
-
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}  # wymagane dla SQLite
+from sqlalchemy.pool import QueuePool
+from app.core.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE, METRICS_ENABLED, SLOW_QUERY_LOG_ENABLED,
 )
+from app.core import metrics
+from app.db import slow_queries
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: czytelnicy nie blokują zapisu zamówień; NORMAL w WAL jest bezpieczne przy awarii procesu
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL):
+    if make_url(url).get_backend_name() == "sqlite":
+        engine = create_engine(
+            url,
+            connect_args={
+                "check_same_thread": False,  # wymagane dla SQLite
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+
+    return create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+# sterowniki async dla tej samej bazy (aiosqlite / asyncpg)
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def create_async_db_engine(url: str = DATABASE_URL):
+    async_url = make_url(url)
+    backend = async_url.get_backend_name()
+    async_url = async_url.set(drivername=_ASYNC_DRIVERS.get(backend, async_url.drivername))
+
+    if backend == "sqlite":
+        async_engine = create_async_engine(
+            async_url, connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        )
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return async_engine
+
+    return create_async_engine(
+        async_url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+if METRICS_ENABLED:
+    # liczba zapytań i czas bazy per żądanie (app/core/metrics.py)
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(async_engine.sync_engine)
+if SLOW_QUERY_LOG_ENABLED:
+    # zapytania powyżej SLOW_QUERY_THRESHOLD_MS z planem (app/db/slow_queries.py)
+    slow_queries.instrument_engine(engine)
+    slow_queries.instrument_engine(async_engine.sync_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: po commicie nie ma leniwego doładowania atrybutów (w async jest zabronione)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -20,3 +94,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# asynchroniczna sesja DB dla endpointów async def
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dopisuje brakujące kolumny i indeksy do istniejących tabel. Schematem zarządza Alembic -
+# to jest tylko jednorazowe doprowadzenie bazy sprzed migracji do rewizji bazowej (db/schema.py)
+def sync_schema(bind):
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in columns:
+                    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+                    if column.server_default is not None:
+                        ddl += f" DEFAULT {column.server_default.arg}"
+                    conn.exec_driver_sql(ddl)
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
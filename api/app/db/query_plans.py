@@ -0,0 +1,114 @@
+# Plany zapytań (EXPLAIN) dla gorących zapytań routerów - sprawdzenie, że każde trafia w indeks.
+# Uruchamiane z folderu api: python -m app.cli check-query-plans (kod wyjścia 1 przy pełnym skanie).
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import select, text
+
+from app.modules.orders import export as order_export, service as order_service
+from app.modules.orders.models import Order, OrderItem, OrderStatusEvent, Review
+from app.modules.restaurants import geo, search, service as restaurant_service
+from app.modules.restaurants.models import Product, Restaurant
+from app.modules.users.models import User, UserAddress
+
+
+def explain(connection, statement, parameters=None) -> List[str]:
+    """
+    Plan zapytania jako lista wierszy tekstu (SQLite: EXPLAIN QUERY PLAN, PostgreSQL: EXPLAIN).
+    statement - wyrażenie SQLAlchemy albo tekst SQL; parameters - parametry sterownika dla tekstu
+    (np. przechwyconego z before_cursor_execute).
+    """
+    if parameters is not None:
+        prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+        rows = connection.exec_driver_sql(prefix + statement, parameters)
+        return [row[3] if connection.dialect.name == "sqlite" else row[0] for row in rows]
+    if isinstance(statement, str):
+        sql = statement
+    else:
+        # wartości wpisane w SQL - SQLite dobiera indeksy częściowe tylko do literałów
+        sql = str(statement.compile(connection, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        return [row[3] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql))]
+    return [row[0] for row in connection.execute(text("EXPLAIN " + sql))]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Wiersze planu oznaczające przejście całej tabeli bez indeksu."""
+    # SQLite: przejście zmaterializowanego podzapytania / CTE to nie skan tabeli
+    subqueries = {line.split(" ", 1)[1] for line in plan if line.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    scans = []
+    for line in plan:
+        if line.startswith("SCAN ") and " USING " not in line:  # SQLite
+            target = line[len("SCAN "):]
+            if target in subqueries or target.startswith("(subquery") or " VIRTUAL TABLE INDEX " in line:
+                continue  # VIRTUAL TABLE INDEX - dopasowanie przez indeks FTS5
+            scans.append(line)
+        elif "Seq Scan" in line:  # PostgreSQL
+            scans.append(line)
+    return scans
+
+
+def hot_queries(dialect: str = "sqlite") -> List[Tuple[str, object]]:
+    """
+    (nazwa, zapytanie) dla przykładowych wartości - budowane tymi samymi funkcjami serwisów co w routerach.
+    Zapytania ładowania relacji (selectinload) i proste filtry z routerów sprawdza dodatkowo
+    tests/test_query_plans.py na SQL-u faktycznie wysłanym przez endpointy.
+    """
+    lat, lon = 50.06, 19.94  # Kraków
+    return [
+        ("orders: moje zamówienia",
+         order_service.orders_page_statement(order_service.user_orders_select(1))),
+        ("orders: moje zamówienia - następna strona",
+         order_service.orders_page_statement(
+             order_service.user_orders_select(1), order_service.encode_cursor(Order(id=1, created_at=datetime(2025, 1, 1))))),
+        ("orders: zamówienia restauracji",
+         order_service.orders_page_statement(order_service.restaurant_orders_select(1))),
+        ("orders: zamówienia restauracji wg statusu",
+         order_service.orders_page_statement(order_service.restaurant_orders_select(1), statuses=["confirmed"])),
+        ("orders: zamówienia restauracji z zakresu dat",
+         order_service.orders_page_statement(
+             order_service.restaurant_orders_select(1), date_from=datetime(2024, 1, 1), date_to=datetime(2025, 1, 1))),
+        ("orders: aktywne zamówienie",
+         order_service.active_order_select(1)),
+        ("orders: pozycje zamówień (selectinload)",
+         select(OrderItem).where(OrderItem.order_id.in_([1, 2, 3]))),
+        ("orders: historia statusów",
+         select(OrderStatusEvent).where(OrderStatusEvent.order_id == 1).order_by(OrderStatusEvent.created_at)),
+        ("orders: eksport restauracji",
+         order_export.orders_statement([1], datetime(2024, 1, 1), datetime(2025, 1, 1))),
+        ("reviews: recenzja zamówienia",
+         select(Review).where(Review.order_id == 1)),
+        ("reviews: recenzje restauracji",
+         order_service.restaurant_reviews_page_statement(1)),
+        ("reviews: eksport restauracji",
+         order_export.reviews_statement([1], datetime(2024, 1, 1), datetime(2025, 1, 1))),
+        ("restaurants: zatwierdzone",
+         select(Restaurant).where(Restaurant.status == "approved")),
+        ("restaurants: wnioski",
+         select(Restaurant).where(Restaurant.status == "pending")),
+        ("restaurants: historia wniosków",
+         select(Restaurant).where(Restaurant.status.in_(["approved", "rejected"]))),
+        ("restaurants: restauracje właściciela",
+         select(Restaurant).where(Restaurant.owner_id == 1)),
+        ("restaurants: w pobliżu",
+         geo.nearby_statement(lat, lon, 10)),
+        ("restaurants: wyszukiwanie",
+         search.search_statement(dialect, "pizza", 20)),
+        ("products: menu restauracji",
+         select(Product).where(Product.restaurant_id == 1)),
+        ("products: menu wielu restauracji",
+         restaurant_service.menus_statement([1, 2], 100)),
+        ("users: wnioski o rolę właściciela",
+         select(User).where(User.role_request == "pending")),
+        ("users: adresy użytkownika",
+         select(UserAddress).where(UserAddress.user_id == 1)),
+    ]
+
+
+def check_query_plans(connection) -> List[Tuple[str, List[str], List[str]]]:
+    """(nazwa, plan, pełne skany) dla każdego gorącego zapytania."""
+    results = []
+    for name, statement in hot_queries(connection.dialect.name):
+        plan = explain(connection, statement)
+        results.append((name, plan, full_scans(plan)))
+    return results
@@ -0,0 +1,43 @@
+# Schemat bazy zarządzany przez Alembic (api/migrations, api/alembic.ini).
+# Nowe tabele / kolumny / indeksy: zmiana w modelach + alembic revision --autogenerate.
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.db.database import Base, engine, sync_schema
+
+# modele muszą być zaimportowane, żeby trafiły do Base.metadata
+from app.modules.users import models as user_models  # noqa: F401
+from app.modules.restaurants import models as restaurant_models  # noqa: F401
+from app.modules.orders import models as order_models  # noqa: F401
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False  # nie nadpisuj logowania aplikacji
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def upgrade_schema(bind=engine):
+    """
+    alembic upgrade head. Baza utworzona wcześniej przez create_all (bez alembic_version)
+    jest najpierw uzupełniana do schematu bazowego i oznaczana rewizją BASELINE_REVISION.
+    """
+    tables = set(inspect(bind).get_table_names())
+    legacy = "alembic_version" not in tables and "users" in tables
+    if legacy:
+        Base.metadata.create_all(bind=bind)
+        sync_schema(bind)
+
+    with bind.begin() as connection:
+        config = alembic_config(connection)
+        if legacy:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, "head")
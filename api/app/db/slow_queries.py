@@ -0,0 +1,107 @@
+# Dziennik wolnych zapytań (opt-in, SLOW_QUERY_LOG_ENABLED=1): zapytania dłuższe niż próg,
+# kształt parametrów, endpoint, z którego przyszły, i plan zapytania (EXPLAIN) z chwili wykonania.
+# Trzymane w buforze cyklicznym w pamięci procesu; podgląd: GET /slow-queries (admin).
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import SLOW_QUERY_EXPLAIN, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_THRESHOLD_MS
+from app.core.metrics import current_route
+
+MAX_STATEMENT_LENGTH = 4000
+# plan liczymy tylko dla zapytań, które EXPLAIN obsługuje (nie dla PRAGMA, DDL itp.)
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+class SlowQueryLog:
+    def __init__(self, size: int = SLOW_QUERY_LOG_SIZE):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=size)
+        self.recorded = 0  # łącznie, także wypchnięte z bufora
+
+    def add(self, entry: dict):
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+
+    def entries(self) -> List[dict]:
+        """Od najnowszych."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.recorded = 0
+
+
+slow_query_log = SlowQueryLog()
+
+
+def parameter_shape(parameters, executemany: bool):
+    """Typy parametrów zamiast wartości - w logu nie ma haseł, e-maili ani adresów."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"executemany": len(rows), "row": parameter_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    return [type(value).__name__ for value in (parameters or ())]
+
+
+def explain(connection, statement: str, parameters) -> List[str]:
+    """Plan zapytania na surowym kursorze DBAPI - bez hooków silnika (nie liczy się do metryk)."""
+    if connection.dialect.name == "sqlite":
+        sql, column = "EXPLAIN QUERY PLAN " + statement, 3
+    else:
+        sql, column = "EXPLAIN " + statement, 0
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(sql, parameters)
+        return [row[column] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()) * 1000
+    if duration_ms < SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    plan: Optional[List[str]] = None
+    plan_error = None
+    if SLOW_QUERY_EXPLAIN and not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as exc:  # plan jest dodatkiem - nie może zepsuć zapytania
+            plan_error = str(exc)
+
+    slow_query_log.add({
+        "recorded_at": datetime.utcnow(),
+        "duration_ms": round(duration_ms, 2),
+        "statement": statement[:MAX_STATEMENT_LENGTH],
+        "parameters": parameter_shape(parameters, executemany),
+        "route": current_route(),
+        "plan": plan,
+        "plan_error": plan_error,
+    })
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("slow_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Dla AsyncEngine podajemy engine.sync_engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -1,30 +1,37 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from contextlib import asynccontextmanager
 
-from app.db.database import Base, engine, SessionLocal
-from app.core.security import hash_password
+from app.db.database import engine, SessionLocal
+from app.db.schema import upgrade_schema
+from app.core.auth import get_current_user
+from app.core.config import METRICS_ENABLED, SLOW_QUERY_LOG_ENABLED, SLOW_QUERY_THRESHOLD_MS
+from app.core.metrics import MetricsMiddleware, registry as metrics_registry
+from app.db.slow_queries import slow_query_log
+from app.core.security import hash_password, shutdown_hash_pool
 
 # --- IMPORTY MODUŁÓW (POPRAWIONE ŚCIEŻKI) ---
 from app.modules.users.router import router as users_router
 from app.modules.users import models 
+from app.modules.users.schemas import CurrentUser
 
 from app.modules.restaurants.router import router as restaurants_router
 from app.modules.restaurants import models as restaurant_models
+from app.modules.restaurants.service import ensure_cuisine_index
+from app.modules.restaurants.geo import backfill_geo_cells
+from app.modules.restaurants.search import ensure_search_index
 
 # <--- POPRAWKA: Dodano "app." na początku
 from app.modules.orders import router as orders_router
 from app.modules.orders import models as order_models 
+from app.modules.orders.stats import ensure_order_stats
 
 print(">>> MAIN FILE:", os.path.abspath(__file__))
-print(">>> DB PATH:", os.path.abspath("app/db/foodapp.db"))
+print(">>> DB URL:", engine.url.render_as_string(hide_password=True))
 
-# Tworzenie tabel w bazie SQLite
-# SQLAlchemy potrzebuje zaimportowanych modeli, żeby wiedzieć co utworzyć
-Base.metadata.create_all(bind=engine)
-restaurant_models.Base.metadata.create_all(bind=engine)
-order_models.Base.metadata.create_all(bind=engine) # <--- POPRAWKA: Tworzymy tabele zamówień
+# Schemat bazy: migracje Alembic (api/migrations) do najnowszej rewizji
+upgrade_schema(engine)
 
 def create_default_admin():
     db = SessionLocal()
@@ -63,10 +70,23 @@ def create_default_admin():
     finally:
         db.close()
 
+# Jednorazowe uzupełnienie danych dla funkcji dodanych do istniejącej bazy
+def migrate_data():
+    db = SessionLocal()
+    try:
+        ensure_cuisine_index(db)
+        backfill_geo_cells(db)
+        ensure_search_index(db)
+        ensure_order_stats(db)
+    finally:
+        db.close()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_default_admin()
+    migrate_data()
     yield
+    shutdown_hash_pool()
 
 app = FastAPI(lifespan=lifespan) 
 
@@ -77,8 +97,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing", "Content-Disposition"],
 )
 
+# Metryki: czas odpowiedzi i zapytania SQL per endpoint (Prometheus + Server-Timing)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+# Wolne zapytania z planami - tylko admin; endpoint zapytania SQL jest znany przy włączonych metrykach
+@app.get("/slow-queries", include_in_schema=False)
+def get_slow_queries(current_user: CurrentUser = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
+    return {
+        "enabled": SLOW_QUERY_LOG_ENABLED,
+        "threshold_ms": SLOW_QUERY_THRESHOLD_MS,
+        "recorded": slow_query_log.recorded,
+        "queries": slow_query_log.entries(),
+    }
+
+
+@app.delete("/slow-queries", status_code=204, include_in_schema=False)
+def clear_slow_queries(current_user: CurrentUser = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
+    slow_query_log.clear()
+
 
 # Podpięcie routerów
 app.include_router(users_router, prefix="/users", tags=["Users"])
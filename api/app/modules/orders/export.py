@@ -0,0 +1,217 @@
+# Eksport zamówień i opinii do rozliczeń (CSV / JSONL, opcjonalnie gzip) - strumieniowo:
+# kursor po stronie serwera (yield_per) czyta paczkami po EXPORT_BATCH_SIZE, każda paczka od razu
+# trafia do odpowiedzi, więc pamięć nie rośnie z zakresem dat.
+# Kolumny zamówień jak w schemas.OrderImportRow - plik CSV/JSONL można wczytać z powrotem (app.cli import orders).
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import EXPORT_BATCH_SIZE
+from app.db.database import AsyncSessionLocal
+from app.modules.restaurants.models import Restaurant
+from app.modules.users.models import User
+from app.modules.users.schemas import CurrentUser
+from .models import Order, OrderItem, Review
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+ORDER_FIELDS = (
+    "id", "created_at", "restaurant_id", "restaurant_name", "user_id", "user_email", "customer_name",
+    "status", "total_amount", "payment_method", "document_type", "nip", "delivery_address",
+    "delivery_time_type", "remarks", "items",
+)
+
+REVIEW_FIELDS = ("id", "created_at", "restaurant_id", "restaurant_name", "order_id", "user_id", "rating", "comment")
+
+
+# --- Zakres eksportu ---
+
+async def export_scope(db: AsyncSession, current_user: CurrentUser, restaurant_id: Optional[int]) -> Optional[List[int]]:
+    """Restauracje, z których wolno eksportować: admin - wszystkie (None) albo wskazana, właściciel - swoje."""
+    if current_user.role not in ("admin", "właściciel"):
+        raise HTTPException(status_code=403, detail="Tylko dla właścicieli restauracji")
+
+    if restaurant_id is not None:
+        restaurant = (await db.execute(
+            select(Restaurant.id, Restaurant.owner_id).where(Restaurant.id == restaurant_id)
+        )).first()
+        if restaurant is None:
+            raise HTTPException(status_code=404, detail="Restauracja nie znaleziona")
+        if current_user.role != "admin" and restaurant.owner_id != current_user.id:
+            raise HTTPException(status_code=403, detail="To nie jest Twoja restauracja")
+        return [restaurant_id]
+    if current_user.role == "admin":
+        return None
+
+    restaurant_ids = list(await db.scalars(select(Restaurant.id).where(Restaurant.owner_id == current_user.id)))
+    if not restaurant_ids:
+        raise HTTPException(status_code=404, detail="Nie masz restauracji")
+    return restaurant_ids
+
+
+def date_bounds(date_from: Optional[date], date_to: Optional[date]):
+    """Dni włącznie -> [od, do) na created_at."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from nie może być późniejsza niż date_to")
+    start = datetime.combine(date_from, time.min) if date_from else None
+    end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+    return start, end
+
+
+def _filtered(stmt, model, restaurant_ids, start, end):
+    if restaurant_ids is not None:
+        stmt = stmt.where(model.restaurant_id.in_(restaurant_ids))
+    if start:
+        stmt = stmt.where(model.created_at >= start)
+    if end:
+        stmt = stmt.where(model.created_at < end)
+    # kolejność zgodna z indeksem (restaurant_id, created_at) - kursor czyta indeks bez sortowania całości
+    return stmt.order_by(model.restaurant_id, model.created_at, model.id)
+
+
+# --- Zapytania ---
+
+def orders_statement(restaurant_ids, start, end, statuses: Optional[List[str]] = None):
+    stmt = (
+        select(
+            Order.id, Order.created_at, Order.restaurant_id, Restaurant.name.label("restaurant_name"),
+            Order.user_id, User.email.label("user_email"), User.first_name, User.last_name,
+            Order.status, Order.total_amount, Order.payment_method, Order.document_type, Order.nip,
+            Order.delivery_address, Order.delivery_time_type, Order.remarks,
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .outerjoin(User, User.id == Order.user_id)
+    )
+    if statuses:
+        stmt = stmt.where(Order.status.in_(statuses))
+    return _filtered(stmt, Order, restaurant_ids, start, end)
+
+
+def reviews_statement(restaurant_ids, start, end):
+    stmt = (
+        select(
+            Review.id, Review.created_at, Review.restaurant_id, Restaurant.name.label("restaurant_name"),
+            Review.order_id, Review.user_id, Review.rating, Review.comment,
+        )
+        .outerjoin(Restaurant, Restaurant.id == Review.restaurant_id)
+    )
+    return _filtered(stmt, Review, restaurant_ids, start, end)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _order_row(row) -> dict:
+    data = row._asdict()
+    data["created_at"] = _isoformat(data["created_at"])
+    data["customer_name"] = " ".join(part for part in (data.pop("first_name"), data.pop("last_name")) if part)
+    data["items"] = []
+    return data
+
+
+def _review_row(row) -> dict:
+    data = row._asdict()
+    data["created_at"] = _isoformat(data["created_at"])
+    return data
+
+
+async def _attach_items(db: AsyncSession, rows: List[dict]):
+    # pozycje całej paczki jednym zapytaniem IN
+    by_id = {row["id"]: row for row in rows}
+    result = await db.execute(
+        select(OrderItem.order_id, OrderItem.product_id, OrderItem.name, OrderItem.quantity, OrderItem.price)
+        .where(OrderItem.order_id.in_(by_id))
+        .order_by(OrderItem.order_id, OrderItem.id)
+    )
+    for order_id, product_id, name, quantity, price in result:
+        by_id[order_id]["items"].append({"product_id": product_id, "name": name, "quantity": quantity, "price": price})
+
+
+# --- Zapis ---
+
+
+def _encode_csv(rows: List[dict], fields: Sequence[str], header: bool) -> bytes:
+    buffer = io.StringIO()
+    if header:
+        buffer.write("\ufeff")  # BOM - Excel poprawnie otwiera polskie znaki
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    for row in rows:
+        # lista pozycji jako tablica JSON - tak jak oczekuje import
+        writer.writerow([
+            json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+            for value in map(row.get, fields)
+        ])
+    return buffer.getvalue().encode()
+
+
+def _encode_jsonl(rows: List[dict], fields: Sequence[str], header: bool) -> bytes:
+    return "".join(
+        json.dumps(row, ensure_ascii=False) + "\n" for row in rows
+    ).encode()
+
+
+async def _records(
+    stmt, fields: Sequence[str], fmt: str, to_row: Callable[[Row], dict],
+    enrich: Optional[Callable] = None,
+) -> AsyncIterator[bytes]:
+    encode = _encode_csv if fmt == "csv" else _encode_jsonl
+    # własna sesja - żyje tyle co strumień, a nie tyle co obsługa żądania
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        header = True
+        async for partition in result.partitions():
+            rows = [to_row(row) for row in partition]
+            if enrich:
+                await enrich(db, rows)
+            yield encode(rows, fields, header)
+            header = False
+        if header and fmt == "csv":
+            yield encode([], fields, True)  # pusty eksport - sam nagłówek
+
+
+async def _gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 - format gzip
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _filename(name: str, date_from: Optional[date], date_to: Optional[date], fmt: str, compress: bool) -> str:
+    parts = [name] + [str(day) for day in (date_from, date_to) if day]
+    return "_".join(parts) + f".{fmt}" + (".gz" if compress else "")
+
+
+def _response(chunks, name: str, fmt: str, compress: bool, date_from, date_to) -> StreamingResponse:
+    headers: Dict[str, str] = {
+        "Content-Disposition": f'attachment; filename="{_filename(name, date_from, date_to, fmt, compress)}"'
+    }
+    if compress:
+        return StreamingResponse(_gzipped(chunks), media_type="application/gzip", headers=headers)
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+def export_orders(restaurant_ids, date_from, date_to, statuses, fmt: str, compress: bool) -> StreamingResponse:
+    start, end = date_bounds(date_from, date_to)
+    chunks = _records(orders_statement(restaurant_ids, start, end, statuses), ORDER_FIELDS, fmt, _order_row, _attach_items)
+    return _response(chunks, "zamowienia", fmt, compress, date_from, date_to)
+
+
+def export_reviews(restaurant_ids, date_from, date_to, fmt: str, compress: bool) -> StreamingResponse:
+    start, end = date_bounds(date_from, date_to)
+    chunks = _records(reviews_statement(restaurant_ids, start, end), REVIEW_FIELDS, fmt, _review_row)
+    return _response(chunks, "opinie", fmt, compress, date_from, date_to)
@@ -0,0 +1,96 @@
+# Import historycznych zamówień (CSV / JSONL / JSON) - np. przy przenoszeniu restauracji z innego systemu.
+# Jeden rekord = zamówienie z pozycjami (schemas.OrderImportRow; w CSV kolumna items to tablica JSON).
+# Zapis paczkami przez executemany; agregaty statystyk właścicieli są przeliczane raz, na końcu.
+from typing import IO, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import bulk
+from app.core.config import BULK_IMPORT_CHUNK_SIZE
+from app.modules.restaurants.models import Product, Restaurant
+from app.modules.users.models import User
+from .models import Order, OrderItem, OrderStatusEvent
+from .schemas import OrderImportRow
+from .stats import rebuild_order_stats
+
+ORDER_COLUMNS = (
+    "restaurant_id", "user_id", "status", "created_at", "total_amount", "delivery_address",
+    "delivery_time_type", "payment_method", "document_type", "nip", "remarks",
+)
+
+
+def _prepare_orders(db: Session, chunk: List[bulk.Record], report: bulk.ImportReport):
+    valid = bulk.validate(chunk, OrderImportRow, report)
+
+    # po jednym zapytaniu IN na paczkę: restauracje, klienci, produkty
+    restaurant_ids = {row.restaurant_id for _, row in valid}
+    known_restaurants = set(db.scalars(
+        select(Restaurant.id).where(Restaurant.id.in_(restaurant_ids))
+    )) if restaurant_ids else set()
+    emails = {row.user_email.lower() for _, row in valid if row.user_email}
+    by_email = dict(db.execute(
+        select(func.lower(User.email), User.id).where(func.lower(User.email).in_(emails))
+    ).all()) if emails else {}
+    user_ids = {row.user_id for _, row in valid if row.user_id is not None}
+    known_users = set(db.scalars(select(User.id).where(User.id.in_(user_ids)))) if user_ids else set()
+    product_ids = {item.product_id for _, row in valid for item in row.items}
+    product_restaurant = dict(db.execute(
+        select(Product.id, Product.restaurant_id).where(Product.id.in_(product_ids))
+    ).all()) if product_ids else {}
+
+    rows = []
+    for number, row in valid:
+        if row.restaurant_id not in known_restaurants:
+            report.error(number, f"restaurant_id: brak restauracji {row.restaurant_id}")
+            continue
+        user_id = row.user_id
+        if row.user_email:
+            user_id = by_email.get(row.user_email.lower())
+            if user_id is None:
+                report.error(number, f"user_email: brak użytkownika {row.user_email}")
+                continue
+        elif user_id is not None and user_id not in known_users:
+            report.error(number, f"user_id: brak użytkownika {user_id}")
+            continue
+        foreign = [
+            item.product_id for item in row.items
+            if product_restaurant.get(item.product_id) != row.restaurant_id
+        ]
+        if foreign:
+            report.error(number, f"items: produkty {foreign} nie należą do restauracji {row.restaurant_id}")
+            continue
+
+        data = row.model_dump(include=set(ORDER_COLUMNS))
+        data["user_id"] = user_id
+        data["status"] = row.status.value
+        if data["total_amount"] is None:
+            data["total_amount"] = round(sum(item.quantity * item.price for item in row.items), 2)
+        data["items"] = [item.model_dump() for item in row.items]
+        rows.append((number, data))
+    return rows
+
+
+def _insert_orders(db: Session, rows: List[dict]):
+    orders = [{key: value for key, value in row.items() if key != "items"} for row in rows]
+    ids = db.execute(
+        insert(Order).returning(Order.id, sort_by_parameter_order=True), orders
+    ).scalars().all()
+    db.execute(insert(OrderItem), [
+        {**item, "order_id": order_id}
+        for order_id, row in zip(ids, rows)
+        for item in row["items"]
+    ])
+    # historia: jeden wpis ze statusem końcowym (pośrednich etapów plik nie zawiera)
+    db.execute(insert(OrderStatusEvent), [
+        {"order_id": order_id, "from_status": None, "to_status": row["status"],
+         "changed_by": None, "created_at": row["created_at"]}
+        for order_id, row in zip(ids, rows)
+    ])
+
+
+def import_orders(db: Session, stream: IO[bytes], fmt: str, chunk_size: int = BULK_IMPORT_CHUNK_SIZE):
+    report = bulk.import_records(db, bulk.read_records(stream, fmt), _prepare_orders, _insert_orders, chunk_size)
+    if report.inserted:
+        rebuild_order_stats(db)
+    return report
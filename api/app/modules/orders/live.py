@@ -0,0 +1,69 @@
+# Statusy zamówień na żywo: kanały pub/sub i strumienie Server-Sent Events.
+# Klient subskrybuje swoje zamówienie, właściciel - wszystkie zamówienia swojej restauracji.
+import json
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from app.core import events
+from app.core.config import EVENTS_HEARTBEAT_SECONDS
+from .schemas import OrderResponse
+from .status import is_active
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx nie buforuje strumienia
+}
+
+
+def order_channel(order_id: int) -> str:
+    return f"order:{order_id}"
+
+
+def restaurant_channel(restaurant_id: int) -> str:
+    return f"restaurant:{restaurant_id}:orders"
+
+
+def order_payload(serialized_order: dict) -> dict:
+    """Wynik serialize_order w postaci JSON (jak odpowiedź OrderResponse)."""
+    return OrderResponse.model_validate(serialized_order).model_dump(mode="json")
+
+
+async def publish_order(serialized_order: dict):
+    payload = order_payload(serialized_order)
+    await events.publish(order_channel(payload["id"]), payload)
+    await events.publish(restaurant_channel(payload["restaurant_id"]), payload)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def order_event_stream(
+    channel: str,
+    snapshot: Optional[Callable[[], Awaitable[Optional[dict]]]] = None,
+    until_final: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Strumień SSE: zdarzenie "order" dla każdej zmiany, komentarz co EVENTS_HEARTBEAT_SECONDS.
+    Subskrypcja startuje przed odczytem stanu (snapshot), więc żadna zmiana nie ginie.
+    Rozłączenie klienta anuluje generator (StreamingResponse), co zamyka subskrypcję.
+    """
+    async with events.get_broker().subscribe(channel) as subscription:
+        if snapshot is not None:
+            current = await snapshot()
+            if current is not None:
+                yield _sse("order", current)
+                if until_final and not is_active(current["status"]):
+                    return
+        else:
+            yield _sse("ready", {})
+
+        while True:
+            message = await subscription.get(EVENTS_HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": ping\n\n"
+            elif message is events.OVERFLOW:
+                return
+            else:
+                yield _sse("order", message)
+                if until_final and not is_active(message["status"]):
+                    return
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.database import Base
 from pydantic import BaseModel
+from .status import ACTIVE_STATUSES_SQL
 
 class Order(Base):
     __tablename__ = "orders"
@@ -30,6 +31,37 @@ class Order(Base):
     restaurant = relationship("app.modules.restaurants.models.Restaurant", back_populates="orders")
     items = relationship("OrderItem", back_populates="order")
 
+    status_events = relationship("OrderStatusEvent", order_by="OrderStatusEvent.id")
+
+    # Indeksy pod stronicowanie historii zamówień (klient / właściciel)
+    # + częściowy indeks tylko zamówień w toku (/orders/active)
+    __table_args__ = (
+        Index("ix_orders_user_created", "user_id", "created_at"),
+        Index("ix_orders_restaurant_created", "restaurant_id", "created_at"),
+        Index("ix_orders_restaurant_status_created", "restaurant_id", "status", "created_at"),
+        Index(
+            "ix_orders_active_user", "user_id", "created_at",
+            sqlite_where=text(ACTIVE_STATUSES_SQL),
+            postgresql_where=text(ACTIVE_STATUSES_SQL),
+        ),
+    )
+
+
+class OrderStatusEvent(Base):
+    """Dziennik zmian statusu (tylko dopisywanie) - historia i czasy etapów realizacji."""
+    __tablename__ = "order_status_events"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    from_status = Column(String, nullable=True)  # None - utworzenie zamówienia
+    to_status = Column(String, nullable=False)
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_order_status_events_order", "order_id", "created_at"),
+    )
+
 
 class OrderItem(Base):
     __tablename__ = "order_items"
@@ -47,6 +79,10 @@ class OrderItem(Base):
     order = relationship("Order", back_populates="items")
     product = relationship("app.modules.restaurants.models.Product")
 
+    __table_args__ = (
+        Index("ix_order_items_order_id", "order_id"),
+    )
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -61,4 +97,34 @@ class Review(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # stronicowanie recenzji restauracji od najnowszych
+    __table_args__ = (
+        Index("ix_reviews_restaurant_created", "restaurant_id", "created_at"),
+    )
 
+
+
+
+# --- Agregaty dzienne dla statystyk właściciela (/orders/owner/stats) ---
+# Aktualizowane przyrostowo przy tworzeniu / anulowaniu zamówienia (stats.py),
+# odbudowa: python -m app.cli rebuild-stats
+
+class RestaurantDailyStats(Base):
+    __tablename__ = "restaurant_daily_stats"
+
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)  # bez anulowanych
+    revenue = Column(Float, nullable=False, default=0)
+    cancelled_count = Column(Integer, nullable=False, default=0)
+
+
+class RestaurantDailyProductStats(Base):
+    __tablename__ = "restaurant_daily_product_stats"
+
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    name = Column(String)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
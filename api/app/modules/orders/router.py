@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+from datetime import date, datetime, timedelta
 import logging
 
-from app.db.database import get_db
-from app.modules.users.router import get_current_user
-from app.modules.users.models import User
+from app.db.database import get_db, get_async_db, AsyncSessionLocal
+from app.core.auth import get_current_user, get_stream_user
+from app.core.bulk import ImportResult, upload_format
+from app.modules.users.schemas import CurrentUser
 from app.modules.restaurants.models import Restaurant, Product
-from . import models, schemas
+from app.modules.restaurants.catalog_cache import invalidate_catalog
+from . import models, schemas, service, live, stats, importer, export
 from pydantic import BaseModel
-from .models import Order, Review, OrderItem
+from .models import Order, Review, OrderStatusEvent
+from .status import OrderStatus, check_transition
 from .schemas import ReviewCreate, ReorderRequest
 
 
@@ -23,189 +31,259 @@ logger = logging.getLogger(__name__)
 # ==========================================
 
 @router.post("/", response_model=schemas.OrderResponse)
-def create_order(
+async def create_order(
     order_data: schemas.OrderCreate, 
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Tworzy nowe zamówienie.
     """
     logger.info(f"Tworzenie zamówienia dla użytkownika {current_user.id}")
     
-    restaurant = db.query(Restaurant).filter(Restaurant.id == order_data.restaurant_id).first()
+    restaurant = await db.get(Restaurant, order_data.restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restauracja nie znaleziona")
     
+    # Wszystkie produkty jednym zapytaniem IN; ceny i nazwy bierzemy z bazy, nie od klienta
+    product_ids = {item.product_id for item in order_data.items}
+    products = {
+        p.id: p for p in (await db.execute(
+            select(Product.id, Product.restaurant_id, Product.name, Product.price)
+            .where(Product.id.in_(product_ids))
+        )).all()
+    }
     for item in order_data.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        product = products.get(item.product_id)
         if not product:
             raise HTTPException(status_code=404, detail=f"Produkt o ID {item.product_id} nie znaleziony")
+        if product.restaurant_id != order_data.restaurant_id:
+            raise HTTPException(status_code=400, detail=f"Produkt o ID {item.product_id} nie należy do tej restauracji")
+
+    item_rows = [
+        {
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "price": products[item.product_id].price,
+            "name": products[item.product_id].name,
+        }
+        for item in order_data.items
+    ]
     
-    new_order = models.Order(
-        user_id=current_user.id,
-        restaurant_id=order_data.restaurant_id,
-        total_amount=order_data.total_amount,
-        status="confirmed",
+    serialized = await service.place_order(
+        db, current_user.id, restaurant, item_rows,
         delivery_address=order_data.delivery_address,
         delivery_time_type=order_data.delivery_time_type,
         payment_method=order_data.payment_method,
         document_type=order_data.document_type,
         nip=order_data.nip,
-        remarks=order_data.remarks
+        remarks=order_data.remarks,
     )
-    db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
-    
-    for item in order_data.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        new_item = models.OrderItem(
-            order_id=new_order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            price=item.price,
-            name=product.name if product else item.name
-        )
-        db.add(new_item)
-    db.commit()
-    db.refresh(new_order)
-    
-    logger.info(f"Zamówienie {new_order.id} utworzone pomyślnie")
-    
-    return {
-        "id": new_order.id,
-        "user_id": new_order.user_id,
-        "restaurant_id": new_order.restaurant_id,
-        "status": new_order.status,
-        "total_amount": new_order.total_amount,
-        "delivery_address": new_order.delivery_address,
-        "delivery_time_type": new_order.delivery_time_type,
-        "payment_method": new_order.payment_method,
-        "document_type": new_order.document_type,
-        "nip": new_order.nip,
-        "remarks": new_order.remarks,
-        "created_at": new_order.created_at,
-        "items": new_order.items,
-        "restaurant_name": restaurant.name,
-        "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}"
-    }
+    logger.info(f"Zamówienie {serialized['id']} utworzone pomyślnie")
+    return serialized
 
 # ------------------------------------------
 # Pobierz historię zamówień klienta
 # ------------------------------------------
 @router.get("/my-orders", response_model=List[schemas.OrderResponse])
-def get_my_orders(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_my_orders(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
+    status: Optional[List[str]] = Query(None),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    orders = db.query(models.Order)\
-        .filter(models.Order.user_id == current_user.id)\
-        .order_by(models.Order.created_at.desc())\
-        .all()
+    stmt = service.user_orders_select(current_user.id)
+    orders, next_cursor = await service.paginate_orders(db, stmt, cursor, limit, status, date_from, date_to)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    result = []
-    for order in orders:
-        restaurant = db.query(Restaurant).filter(Restaurant.id == order.restaurant_id).first()
-        result.append({
-            "id": order.id,
-            "user_id": order.user_id,
-            "restaurant_id": order.restaurant_id,
-            "status": order.status,
-            "total_amount": order.total_amount,
-            "delivery_address": order.delivery_address,
-            "delivery_time_type": order.delivery_time_type,
-            "payment_method": order.payment_method,
-            "document_type": order.document_type,
-            "nip": order.nip,
-            "remarks": order.remarks,
-            "created_at": order.created_at,
-            "items": order.items,
-            "restaurant_name": restaurant.name if restaurant else "Nieznana restauracja",
-            "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}" if restaurant else ""
-        })
-    return result
+    return [service.serialize_order(order, "Nieznana restauracja") for order in orders]
 
 # ------------------------------------------
 # Pobierz aktywne zamówienie klienta
 # ------------------------------------------
 @router.get("/active", response_model=Optional[schemas.OrderResponse])
-def get_active_order(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_active_order(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    active_statuses = ["confirmed", "preparing", "delivery", "arrived"]
-    order = db.query(models.Order)\
-        .filter(models.Order.user_id == current_user.id)\
-        .filter(models.Order.status.in_(active_statuses))\
-        .order_by(models.Order.created_at.desc())\
-        .first()
+    result = await db.execute(service.active_order_select(current_user.id))
+    order = result.scalars().first()
     
     if order:
-        restaurant = db.query(Restaurant).filter(Restaurant.id == order.restaurant_id).first()
-        return {
-            **order.__dict__,
-            "items": order.items,
-            "restaurant_name": restaurant.name if restaurant else "",
-            "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}" if restaurant else ""
-        }
+        return service.serialize_order(order)
     return None
 
 # ------------------------------------------
 # Pobierz zamówienia dla właściciela restauracji
 # ------------------------------------------
 @router.get("/owner", response_model=List[schemas.OrderResponse])
-def get_restaurant_orders(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_restaurant_orders(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
+    status: Optional[List[str]] = Query(None),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != "właściciel":
         return []
 
-    my_restaurant = db.query(Restaurant).filter(Restaurant.owner_id == current_user.id).first()
-    if not my_restaurant:
+    my_restaurant_id = await db.scalar(
+        select(Restaurant.id).where(Restaurant.owner_id == current_user.id).limit(1)
+    )
+    if not my_restaurant_id:
         return []
 
-    orders = db.query(models.Order)\
-        .filter(models.Order.restaurant_id == my_restaurant.id)\
-        .order_by(models.Order.created_at.desc())\
-        .all()
+    stmt = service.restaurant_orders_select(my_restaurant_id)
+    orders, next_cursor = await service.paginate_orders(db, stmt, cursor, limit, status, date_from, date_to)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
-    result = []
-    for order in orders:
-        restaurant = db.query(Restaurant).filter(Restaurant.id == order.restaurant_id).first()
-        result.append({
-            **order.__dict__,
-            "items": order.items,
-            "restaurant_name": restaurant.name if restaurant else "",
-            "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}" if restaurant else ""
-        })
-    return result
+    return [service.serialize_order(order) for order in orders]
 
 
 # ------------------------------------------
-# Zmiana statusu zamówienia przez właściciela
+# Statystyki restauracji właściciela (z agregatów dziennych)
+# ------------------------------------------
+@router.get("/owner/stats", response_model=schemas.OwnerStatsResponse)
+async def get_restaurant_stats(
+    period: str = Query("day", pattern="^(day|week|month)$"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    top: int = Query(5, ge=1, le=50),
+    restaurant_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.role != "właściciel":
+        raise HTTPException(status_code=403, detail="Tylko dla właścicieli restauracji")
+
+    # domyślnie pierwsza restauracja właściciela (jak /orders/owner)
+    stmt = select(Restaurant.id).where(Restaurant.owner_id == current_user.id)
+    if restaurant_id is not None:
+        stmt = stmt.where(Restaurant.id == restaurant_id)
+    my_restaurant_id = await db.scalar(stmt.limit(1))
+    if not my_restaurant_id:
+        raise HTTPException(status_code=404, detail="Restauracja nie znaleziona")
+
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from nie może być późniejsza niż date_to")
+
+    return await stats.restaurant_stats(db, my_restaurant_id, period, date_from, date_to, top)
+
+
+# ------------------------------------------
+# Import historycznych zamówień z pliku CSV / JSONL / JSON (admin)
+# ------------------------------------------
+@router.post("/import", response_model=ImportResult)
+def import_orders(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv / jsonl / json - domyślnie z rozszerzenia pliku"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
+    fmt = upload_format(file.filename, format)
+    return importer.import_orders(db, file.file, fmt).result()
+
+
+# ------------------------------------------
+# Eksport zamówień do rozliczeń - CSV / JSONL strumieniowo (właściciel - swoje restauracje, admin - wszystkie)
 # ------------------------------------------
+@router.get("/export")
+async def export_orders(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    gzip: bool = False,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    restaurant_id: Optional[int] = None,
+    status: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    restaurant_ids = await export.export_scope(db, current_user, restaurant_id)
+    return export.export_orders(restaurant_ids, date_from, date_to, status, format, gzip)
 
-class OrderStatusUpdate(BaseModel):
-    new_status: str
+
+# ------------------------------------------
+# Statusy na żywo (Server-Sent Events)
+# ------------------------------------------
+# Sesja DB tylko na czas sprawdzenia uprawnień / odczytu stanu - nie przez cały strumień.
+
+@router.get("/owner/events")
+async def stream_restaurant_orders(current_user: CurrentUser = Depends(get_stream_user)):
+    """Nowe zamówienia i zmiany statusów w restauracji właściciela."""
+    if current_user.role != "właściciel":
+        raise HTTPException(status_code=403, detail="Tylko dla właścicieli restauracji")
+    async with AsyncSessionLocal() as db:
+        restaurant_id = await db.scalar(
+            select(Restaurant.id).where(Restaurant.owner_id == current_user.id).limit(1)
+        )
+    if not restaurant_id:
+        raise HTTPException(status_code=404, detail="Nie masz restauracji")
+
+    return StreamingResponse(
+        live.order_event_stream(live.restaurant_channel(restaurant_id)),
+        media_type="text/event-stream",
+        headers=live.SSE_HEADERS,
+    )
+
+
+@router.get("/{order_id}/events")
+async def stream_order(order_id: int, current_user: CurrentUser = Depends(get_stream_user)):
+    """Aktualny stan zamówienia, potem każda zmiana statusu; kończy się po odbiorze."""
+    async with AsyncSessionLocal() as db:
+        order = await db.get(models.Order, order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail="Zamówienie nie istnieje")
+        owner_id = await db.scalar(select(Restaurant.owner_id).where(Restaurant.id == order.restaurant_id))
+    if current_user.id not in (order.user_id, owner_id) and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak dostępu do tego zamówienia")
+
+    async def snapshot():
+        async with AsyncSessionLocal() as db:
+            current = await service.get_order(db, order_id)
+            return live.order_payload(service.serialize_order(current)) if current else None
+
+    return StreamingResponse(
+        live.order_event_stream(live.order_channel(order_id), snapshot, until_final=True),
+        media_type="text/event-stream",
+        headers=live.SSE_HEADERS,
+    )
+
+
+# ------------------------------------------
+# Zmiana statusu zamówienia przez właściciela
+# ------------------------------------------
 
 @router.patch("/{order_id}/status", response_model=schemas.OrderResponse)
-def update_order_status(
+async def update_order_status(
     order_id: int,
-    status_update: OrderStatusUpdate,   # FastAPI bierze new_status z body
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    status_update: schemas.OrderStatusUpdate,   # FastAPI bierze new_status z body
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     new_status = status_update.new_status
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    order = await db.get(models.Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Zamówienie nie istnieje")
 
     # Jeśli właściciel restauracji
     if current_user.role == "właściciel":
-        restaurant = db.query(Restaurant).filter(Restaurant.owner_id == current_user.id).first()
-        if not restaurant or restaurant.id != order.restaurant_id:
+        restaurant_id = await db.scalar(
+            select(Restaurant.id).where(Restaurant.owner_id == current_user.id).limit(1)
+        )
+        if not restaurant_id or restaurant_id != order.restaurant_id:
             raise HTTPException(status_code=403, detail="Nie możesz zmieniać zamówień tej restauracji")
     
     # Jeśli klient
@@ -215,45 +293,56 @@ def update_order_status(
                 status_code=403,
                 detail="Nie możesz zmieniać cudzego zamówienia"
             )
-        if new_status not in ["delivered", "completed"]:
-            raise HTTPException(
-                status_code=403,
-                detail="Klient może tylko potwierdzić odbiór"
-            )
     
     # Inne role
     else:
         raise HTTPException(status_code=403, detail="Brak uprawnień")
 
-    # Aktualizacja statusu
-    order.status = new_status
-    db.commit()
-    db.refresh(order)
+    check_transition(order.status, new_status, current_user.role)
 
-    restaurant = db.query(Restaurant).filter(Restaurant.id == order.restaurant_id).first()
-    return {
-        "id": order.id,
-        "status": order.status,
-        "created_at": order.created_at,
-        "total_amount": order.total_amount,
-        "restaurant_id": order.restaurant_id,
-        "delivery_address": order.delivery_address,
-        "delivery_time_type": order.delivery_time_type,
-        "payment_method": order.payment_method,
-        "document_type": order.document_type,
-        "nip": order.nip,
-        "items": [
-            {
-                "id": item.id,
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "price": item.price,
-                "name": item.name
-            } for item in order.items
-        ],
-        "restaurant_name": restaurant.name if restaurant else "",
-        "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}" if restaurant else ""
-    }
+    # Aktualizacja statusu tylko jeśli nikt go w międzyczasie nie zmienił + wpis w dzienniku
+    previous_status = order.status
+    result = await db.execute(
+        update(models.Order)
+        .where(models.Order.id == order.id, models.Order.status == previous_status)
+        .values(status=new_status.value)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=409, detail="Status zamówienia zmienił się w międzyczasie")
+    db.add(OrderStatusEvent(
+        order_id=order.id, from_status=previous_status, to_status=new_status.value, changed_by=current_user.id
+    ))
+    if new_status == OrderStatus.CANCELLED:
+        await stats.record_cancellation(db, order)
+    await db.commit()
+
+    serialized = service.serialize_order(await service.get_order(db, order.id))
+    await live.publish_order(serialized)
+    return serialized
+
+
+# ------------------------------------------
+# Historia zmian statusu zamówienia
+# ------------------------------------------
+@router.get("/{order_id}/history", response_model=List[schemas.OrderStatusEventResponse])
+async def get_order_history(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    order = await db.get(models.Order, order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Zamówienie nie istnieje")
+    owner_id = await db.scalar(select(Restaurant.owner_id).where(Restaurant.id == order.restaurant_id))
+    if current_user.id not in (order.user_id, owner_id) and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak dostępu do tego zamówienia")
+
+    return (await db.scalars(
+        select(OrderStatusEvent)
+        .where(OrderStatusEvent.order_id == order_id)
+        .order_by(OrderStatusEvent.created_at, OrderStatusEvent.id)
+    )).all()
 
 
 # =========================
@@ -265,7 +354,7 @@ def add_review(
     order_id: int, 
     review: ReviewCreate, 
     db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     order = db.query(Order).filter(Order.id == order_id).first()
 
@@ -282,7 +371,7 @@ def add_review(
     if existing:
         raise HTTPException(400, "To zamówienie jest już ocenione")
 
-    # --- dodajemy nową recenzję ---
+    # --- dodajemy nową recenzję i doliczamy ją do średniej w jednej transakcji ---
     new_review = Review(
         rating=review.rating,
         comment=review.comment,
@@ -291,17 +380,19 @@ def add_review(
         order_id=order.id
     )
     db.add(new_review)
-    db.commit()
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(400, "To zamówienie jest już ocenione")
 
-    # --- przelicz średnią ocenę restauracji ---
-    restaurant = db.query(Restaurant).filter(Restaurant.id == order.restaurant_id).first()
-    all_reviews = db.query(Review).filter(Review.restaurant_id == restaurant.id).all()
-    restaurant.rating = round(sum(r.rating for r in all_reviews) / len(all_reviews),1)
+    average_rating = service.apply_review_rating(db, order.restaurant_id, review.rating)
     db.commit()
+    invalidate_catalog()  # ocena restauracji jest częścią publicznej listy
 
     return {
         "message": "Dziękujemy za ocenę!",
-        "average_rating": restaurant.rating
+        "average_rating": average_rating
     }
 
 
@@ -310,8 +401,11 @@ def add_review(
 # =========================
 @router.get("/reviews/mine")
 def get_my_restaurant_reviews(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != "właściciel":
         raise HTTPException(403, "Nie jesteś właścicielem żadnej restauracji")
@@ -321,29 +415,27 @@ def get_my_restaurant_reviews(
     if not restaurant:
         return []
 
-    # Pobierz wszystkie recenzje dla tej restauracji
-    reviews = db.query(Review).filter(Review.restaurant_id == restaurant.id).all()
-    
-    result = []
-    for r in reviews:
-        # Pobierz powiązane zamówienie
-        order = db.query(Order).filter(Order.id == r.order_id).first()
-        items = [{"quantity": i.quantity, "name": i.name} for i in order.items] if order else []
-
-        # Dodaj recenzję wraz z produktami zamówienia
-        result.append({
-            "id": r.id,
-            "rating": r.rating,
-            "comment": r.comment,
-            "user_id": r.user_id,
-            "order_id": r.order_id,
-            "restaurant_id": restaurant.id,
-            "restaurant_name": restaurant.name,
-            "created_at": r.created_at,
-            "items": items  # <-- lista zamówionych produktów
-        })
-
-    return result
+    # Recenzje wraz z produktami zamówień (bez zapytania na każdą recenzję)
+    reviews, next_cursor = service.list_restaurant_reviews(db, restaurant, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
+
+# =========================
+# Eksport opinii - CSV / JSONL strumieniowo (właściciel / admin)
+# =========================
+@router.get("/reviews/export")
+async def export_reviews(
+    format: str = Query("csv", pattern="^(csv|jsonl)$"),
+    gzip: bool = False,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    restaurant_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    restaurant_ids = await export.export_scope(db, current_user, restaurant_id)
+    return export.export_reviews(restaurant_ids, date_from, date_to, format, gzip)
 
 # =========================
 # GET reviews dla restauracji (dla klientów)
@@ -351,32 +443,25 @@ def get_my_restaurant_reviews(
 @router.get("/{restaurant_id}/reviews")
 def get_restaurant_reviews(
     restaurant_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
+    latest: Optional[int] = Query(None, ge=1, le=service.MAX_PAGE_SIZE),
     db: Session = Depends(get_db)
 ):
     restaurant = db.query(Restaurant).filter(Restaurant.id == restaurant_id).first()
     if not restaurant:
         raise HTTPException(404, detail="Restauracja nie istnieje")
 
-    reviews = db.query(Review).filter(Review.restaurant_id == restaurant.id).all()
-    
-    result = []
-    for r in reviews:
-        order = db.query(Order).filter(Order.id == r.order_id).first()
-        items = [{"quantity": i.quantity, "name": i.name} for i in order.items] if order else []
-
-        result.append({
-            "id": r.id,
-            "rating": r.rating,
-            "comment": r.comment,
-            "user_id": r.user_id,
-            "order_id": r.order_id,
-            "restaurant_id": restaurant.id,
-            "restaurant_name": restaurant.name,
-            "created_at": r.created_at,
-            "items": items
-        })
-    
-    return result
+    # ?latest=N - tylko N najnowszych opinii (popup z opiniami), bez kursora
+    if latest:
+        reviews, _ = service.list_restaurant_reviews(db, restaurant, limit=latest)
+        return reviews
+
+    reviews, next_cursor = service.list_restaurant_reviews(db, restaurant, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
 
 
 # =========================
@@ -384,36 +469,34 @@ def get_restaurant_reviews(
 # =========================
 
 @router.post("/reorder")
-def reorder(request: ReorderRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    order = db.query(Order).filter(Order.id == request.order_id, Order.user_id == current_user.id).first()
+async def reorder(
+    request: ReorderRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    order = await db.scalar(
+        select(Order).options(selectinload(Order.items))
+        .where(Order.id == request.order_id, Order.user_id == current_user.id)
+    )
     if not order:
         raise HTTPException(status_code=404, detail="Nie znaleziono zamówienia")
+    restaurant = await db.get(Restaurant, order.restaurant_id)
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restauracja nie znaleziona")
 
-    new_order = Order(
-        user_id=current_user.id,
-        restaurant_id=order.restaurant_id,
-        status="confirmed",
-        total_amount=order.total_amount,
+    # ta sama ścieżka co POST /orders/ - historia statusów, statystyki i powiadomienie właściciela
+    serialized = await service.place_order(
+        db, current_user.id, restaurant,
+        [
+            {"product_id": item.product_id, "quantity": item.quantity, "price": item.price, "name": item.name}
+            for item in order.items
+        ],
         delivery_address=order.delivery_address,
         delivery_time_type=order.delivery_time_type,
         payment_method=order.payment_method,
         document_type=order.document_type,
+        nip=order.nip,
         remarks=order.remarks,
-        nip=order.nip
     )
-    db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
-
-    for item in order.items:
-        new_item = OrderItem(
-            order_id=new_order.id,
-            name=item.name,
-            quantity=item.quantity,
-            price=item.price,
-            product_id=item.product_id
-        )
-        db.add(new_item)
-    db.commit()
 
-    return {"detail": "Zamówienie zostało ponowione", "new_order_id": new_order.id}
+    return {"detail": "Zamówienie zostało ponowione", "new_order_id": serialized["id"]}
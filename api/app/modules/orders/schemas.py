@@ -1,18 +1,25 @@
-from pydantic import BaseModel, Field
+import json
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
+from .status import OrderStatus
 
 # =======================
 # ORDER ITEM SCHEMAS
 # =======================
 class OrderItemCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(..., gt=0)
+    # cena i nazwa są brane z bazy produktów; pola zostają dla zgodności z frontendem
+    price: Optional[float] = None
+    name: Optional[str] = None
+
+class OrderItemResponse(BaseModel):
+    id: int
     product_id: int
     quantity: int
     price: float
     name: str
-
-class OrderItemResponse(OrderItemCreate):
-    id: int
     class Config:
         from_attributes = True  # Zamiast orm_mode dla Pydantic v2
 
@@ -21,14 +28,14 @@ class OrderItemResponse(OrderItemCreate):
 # =======================
 class OrderCreate(BaseModel):
     restaurant_id: int
-    total_amount: float
+    total_amount: Optional[float] = None  # liczone po stronie serwera z cen produktów
     delivery_address: str
     delivery_time_type: str
     payment_method: str
     document_type: str
     nip: Optional[str] = None
     remarks: Optional[str] = None
-    items: List[OrderItemCreate]
+    items: List[OrderItemCreate] = Field(..., min_length=1)
 
 class OrderResponse(BaseModel):
     id: int
@@ -57,7 +64,16 @@ class OrderResponse(BaseModel):
 # NOWY SCHEMAT: ZMIANA STATUSU
 # =======================
 class OrderStatusUpdate(BaseModel):
-    new_status: str
+    new_status: OrderStatus
+
+    class Config:
+        from_attributes = True
+
+class OrderStatusEventResponse(BaseModel):
+    from_status: Optional[str] = None
+    to_status: str
+    changed_by: Optional[int] = None
+    created_at: datetime
 
     class Config:
         from_attributes = True
@@ -68,4 +84,67 @@ class ReviewCreate(BaseModel):
 
 # --- MODEL REQUEST ---
 class ReorderRequest(BaseModel):
-    order_id: int
\ No newline at end of file
+    order_id: int
+
+# =======================
+# STATYSTYKI WŁAŚCICIELA
+# =======================
+class StatsSummary(BaseModel):
+    order_count: int
+    revenue: float
+    average_basket: float
+    cancelled_count: int
+
+class StatsBucket(StatsSummary):
+    start: date
+
+class TopProduct(BaseModel):
+    product_id: int
+    name: Optional[str] = None
+    quantity: int
+    revenue: float
+
+class OwnerStatsResponse(BaseModel):
+    restaurant_id: int
+    period: str
+    date_from: date
+    date_to: date
+    totals: StatsSummary
+    buckets: List[StatsBucket]
+    top_products: List[TopProduct]
+
+# =======================
+# IMPORT HISTORYCZNYCH ZAMÓWIEŃ (POST /orders/import)
+# =======================
+class OrderImportItem(BaseModel):
+    product_id: int  # wymagane - OrderItemResponse zwraca product_id każdej pozycji
+    name: str
+    quantity: int = Field(..., gt=0)
+    price: float = Field(..., ge=0)
+
+class OrderImportRow(BaseModel):
+    restaurant_id: int
+    # klient: id albo e-mail istniejącego użytkownika
+    user_id: Optional[int] = None
+    user_email: Optional[str] = None
+    status: OrderStatus = OrderStatus.COMPLETED
+    created_at: datetime
+    total_amount: Optional[float] = None  # domyślnie suma pozycji
+    delivery_address: str = ""
+    delivery_time_type: str = "asap"
+    payment_method: str = ""
+    document_type: str = "paragon"
+    nip: Optional[str] = None
+    remarks: Optional[str] = None
+    items: List[OrderImportItem] = Field(..., min_length=1)
+
+    # w CSV pozycje są w jednej kolumnie jako tablica JSON
+    @field_validator("items", mode="before")
+    @classmethod
+    def parse_items(cls, value):
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                raise ValueError("items: oczekiwana tablica JSON")
+        return value
@@ -0,0 +1,279 @@
+import base64
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import or_, and_, update, select, insert, func, case, cast, bindparam, Float, Numeric
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from app.modules.restaurants.models import Restaurant
+from . import live, stats
+from .models import Order, OrderItem, OrderStatusEvent, Review
+from .status import ACTIVE_STATUSES, OrderStatus
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def orders_select():
+    """
+    SELECT zamówień z od razu dociągniętymi pozycjami i danymi restauracji
+    (stała liczba zapytań SQL niezależnie od liczby zamówień, brak leniwego ładowania).
+    """
+    return select(Order).options(
+        selectinload(Order.items),
+        joinedload(Order.restaurant).load_only(
+            Restaurant.name, Restaurant.street, Restaurant.number, Restaurant.city
+        ),
+    )
+
+
+def user_orders_select(user_id: int):
+    """Zamówienia klienta (/orders/my-orders, /orders/active)."""
+    return orders_select().where(Order.user_id == user_id)
+
+
+def restaurant_orders_select(restaurant_id: int):
+    """Zamówienia restauracji (/orders/owner)."""
+    return orders_select().where(Order.restaurant_id == restaurant_id)
+
+
+def active_orders_filter():
+    # wartości wpisane w SQL (literal_execute), a nie jako parametry - tylko wtedy
+    # SQLite dopasuje warunek do częściowego indeksu ix_orders_active_user
+    return Order.status.in_(bindparam("active_statuses", list(ACTIVE_STATUSES), expanding=True, literal_execute=True))
+
+
+def active_order_select(user_id: int):
+    """Najnowsze zamówienie klienta w toku."""
+    return user_orders_select(user_id).where(active_orders_filter()).order_by(Order.created_at.desc()).limit(1)
+
+
+async def get_order(db: AsyncSession, order_id: int) -> Optional[Order]:
+    # populate_existing - odśwież obiekt, jeśli jest już w sesji (np. po zmianie statusu)
+    result = await db.execute(
+        orders_select().where(Order.id == order_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+def serialize_order(order: Order, missing_restaurant_name: str = ""):
+    restaurant = order.restaurant
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "restaurant_id": order.restaurant_id,
+        "status": order.status,
+        "total_amount": order.total_amount,
+        "delivery_address": order.delivery_address,
+        "delivery_time_type": order.delivery_time_type,
+        "payment_method": order.payment_method,
+        "document_type": order.document_type,
+        "nip": order.nip,
+        "remarks": order.remarks,
+        "created_at": order.created_at,
+        "items": order.items,
+        "restaurant_name": restaurant.name if restaurant else missing_restaurant_name,
+        "restaurant_address": f"{restaurant.street} {restaurant.number}, {restaurant.city}" if restaurant else ""
+    }
+
+
+async def place_order(db: AsyncSession, user_id: int, restaurant: Restaurant, item_rows: List[dict], **details) -> dict:
+    """
+    Zapis nowego zamówienia (POST /orders/, /orders/reorder): zamówienie, pozycje, wpis historii statusów
+    i agregaty statystyk w jednej transakcji, potem powiadomienie na żywo.
+    item_rows: product_id, quantity, price, name; details: pola dostawy i płatności.
+    """
+    order = Order(
+        user_id=user_id,
+        restaurant_id=restaurant.id,
+        total_amount=round(sum(row["price"] * row["quantity"] for row in item_rows), 2),
+        status=OrderStatus.CONFIRMED.value,
+        **details,
+    )
+    # flush daje id zamówienia dla pozycji
+    db.add(order)
+    await db.flush()
+    item_rows = [{**row, "order_id": order.id} for row in item_rows]
+    items = (await db.scalars(insert(OrderItem).returning(OrderItem), item_rows)).all()
+    db.add(OrderStatusEvent(order_id=order.id, to_status=order.status, changed_by=user_id))
+    await stats.record_order(db, order, item_rows)
+    await db.commit()
+
+    set_committed_value(order, "items", items)
+    set_committed_value(order, "restaurant", restaurant)
+    serialized = serialize_order(order)
+    await live.publish_order(serialized)
+    return serialized
+
+
+# --- Stronicowanie kursorem (created_at, id) ---
+
+def encode_cursor(row) -> str:
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Niepoprawny kursor")
+
+
+def _page_statement(stmt, model, cursor: Optional[str], limit: int):
+    # od najnowszych; pobieramy limit + 1 wierszy, żeby wiedzieć czy jest następna strona
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def _split_page(rows, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    return rows, next_cursor
+
+
+def orders_page_statement(
+    stmt,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    statuses: Optional[List[str]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Strona zamówień z filtrami - SELECT wykonywany przez paginate_orders."""
+    if statuses:
+        stmt = stmt.where(Order.status.in_(statuses))
+    if date_from:
+        stmt = stmt.where(Order.created_at >= date_from)
+    if date_to:
+        stmt = stmt.where(Order.created_at < date_to)
+    return _page_statement(stmt, Order, cursor, limit)
+
+
+async def paginate_orders(
+    db: AsyncSession,
+    stmt,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    statuses: Optional[List[str]] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    Zwraca (zamówienia, kursor następnej strony) - od najnowszych.
+    Kursor to zakodowana para (created_at, id) ostatniego zwróconego zamówienia.
+    """
+    result = await db.execute(orders_page_statement(stmt, cursor, limit, statuses, date_from, date_to))
+    return _split_page(result.scalars().all(), limit)
+
+
+# --- Recenzje restauracji ---
+
+def restaurant_reviews_page_statement(restaurant_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    return _page_statement(select(Review).where(Review.restaurant_id == restaurant_id), Review, cursor, limit)
+
+
+def list_restaurant_reviews(
+    db: Session,
+    restaurant: Restaurant,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Zwraca (recenzje, kursor następnej strony) razem z pozycjami zamówień.
+    Dwa zapytania: strona recenzji + pozycje (quantity, name) wszystkich ich zamówień.
+    """
+    reviews, next_cursor = _split_page(
+        db.scalars(restaurant_reviews_page_statement(restaurant.id, cursor, limit)).all(), limit
+    )
+
+    items_by_order = defaultdict(list)
+    order_ids = [r.order_id for r in reviews if r.order_id is not None]
+    if order_ids:
+        rows = db.query(OrderItem.order_id, OrderItem.quantity, OrderItem.name)\
+            .filter(OrderItem.order_id.in_(order_ids))\
+            .order_by(OrderItem.id)
+        for order_id, quantity, name in rows:
+            items_by_order[order_id].append({"quantity": quantity, "name": name})
+
+    result = [
+        {
+            "id": r.id,
+            "rating": r.rating,
+            "comment": r.comment,
+            "user_id": r.user_id,
+            "order_id": r.order_id,
+            "restaurant_id": restaurant.id,
+            "restaurant_name": restaurant.name,
+            "created_at": r.created_at,
+            "items": items_by_order[r.order_id],
+        }
+        for r in reviews
+    ]
+    return result, next_cursor
+
+
+# --- Agregat ocen restauracji ---
+
+def _rounded_average(total, count):
+    # CAST do Numeric, bo PostgreSQL ma round(x, n) tylko dla numeric
+    return func.round(cast(cast(total, Float) / count, Numeric), 1)
+
+
+def apply_review_rating(db: Session, restaurant_id: int, rating: int) -> float:
+    """
+    Dolicza ocenę do agregatu restauracji jednym atomowym UPDATE
+    (bez odczytu wszystkich recenzji). Zwraca nową średnią. Nie robi commita.
+    """
+    new_sum = Restaurant.rating_sum + rating
+    new_count = Restaurant.rating_count + 1
+    average = db.execute(
+        update(Restaurant)
+        .where(Restaurant.id == restaurant_id)
+        .values(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=_rounded_average(new_sum, new_count),
+        )
+        .returning(Restaurant.rating)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    return float(average)
+
+
+def rebuild_rating_aggregates(db: Session) -> int:
+    """
+    Przelicza rating_sum / rating_count / rating wszystkich restauracji
+    z tabeli reviews jednym zapytaniem. Zwraca liczbę zmienionych wierszy.
+    """
+    review_sum = select(func.coalesce(func.sum(Review.rating), 0))\
+        .where(Review.restaurant_id == Restaurant.id).scalar_subquery()
+    review_count = select(func.count(Review.id))\
+        .where(Review.restaurant_id == Restaurant.id).scalar_subquery()
+
+    result = db.execute(
+        update(Restaurant)
+        .values(
+            rating_sum=review_sum,
+            rating_count=review_count,
+            # restauracje bez recenzji zachowują dotychczasową ocenę
+            rating=case(
+                (review_count > 0, _rounded_average(review_sum, review_count)),
+                else_=Restaurant.rating,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
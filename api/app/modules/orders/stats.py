@@ -0,0 +1,190 @@
+# Statystyki właściciela z agregatów dziennych: przychód, liczba zamówień, średni koszyk,
+# najczęściej zamawiane produkty. Odczyt kosztuje O(dni w zakresie), nie O(zamówień).
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import Date, case, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import Order, OrderItem, RestaurantDailyStats, RestaurantDailyProductStats
+from .status import OrderStatus
+
+def _dialect(db) -> str:
+    return db.bind.dialect.name
+
+
+def _upsert(db, model, keys, increments, replace=()):
+    """INSERT ... ON CONFLICT DO UPDATE: kolumny increments dodaje do istniejącego wiersza."""
+    insert_fn = postgresql_insert if _dialect(db) == "postgresql" else sqlite_insert
+    stmt = insert_fn(model)
+    updates = {column: getattr(model, column) + stmt.excluded[column] for column in increments}
+    updates.update({column: stmt.excluded[column] for column in replace})
+    return stmt.on_conflict_do_update(index_elements=list(keys), set_=updates)
+
+
+async def _apply(db: AsyncSession, order: Order, items: List[dict], sign: int, cancelled: int):
+    day = order.created_at.date()
+    await db.execute(
+        _upsert(db, RestaurantDailyStats, ("restaurant_id", "day"), ("order_count", "revenue", "cancelled_count")),
+        {
+            "restaurant_id": order.restaurant_id, "day": day,
+            "order_count": sign, "revenue": sign * (order.total_amount or 0), "cancelled_count": cancelled,
+        },
+    )
+    product_rows = [
+        {
+            "restaurant_id": order.restaurant_id, "day": day, "product_id": item["product_id"],
+            "name": item["name"], "quantity": sign * item["quantity"], "revenue": sign * item["quantity"] * item["price"],
+        }
+        for item in items
+        if item["product_id"] is not None
+    ]
+    if product_rows:
+        # jedno executemany dla wszystkich pozycji zamówienia
+        await db.execute(
+            _upsert(db, RestaurantDailyProductStats, ("restaurant_id", "day", "product_id"),
+                    ("quantity", "revenue"), ("name",)),
+            product_rows,
+        )
+
+
+async def record_order(db: AsyncSession, order: Order, items: List[dict]):
+    """Nowe zamówienie - w tej samej transakcji co jego zapis. items: product_id, quantity, price, name."""
+    await _apply(db, order, items, sign=1, cancelled=0)
+
+
+async def record_cancellation(db: AsyncSession, order: Order):
+    """Anulowane zamówienie znika z przychodu i produktów, liczy się w cancelled_count."""
+    rows = await db.execute(
+        select(OrderItem.product_id, OrderItem.quantity, OrderItem.price, OrderItem.name)
+        .where(OrderItem.order_id == order.id)
+    )
+    await _apply(db, order, [dict(row._mapping) for row in rows], sign=-1, cancelled=1)
+
+
+# --- Odbudowa z tabeli zamówień ---
+
+def rebuild_order_stats(db: Session) -> int:
+    """Przelicza wszystkie agregaty od zera. Zwraca liczbę wierszy dziennych."""
+    if _dialect(db) == "postgresql":
+        day = cast(Order.created_at, Date)
+    else:
+        day = func.date(Order.created_at)
+    counted = Order.status != OrderStatus.CANCELLED.value
+
+    db.execute(delete(RestaurantDailyProductStats))
+    db.execute(delete(RestaurantDailyStats))
+    result = db.execute(insert(RestaurantDailyStats).from_select(
+        ["restaurant_id", "day", "order_count", "revenue", "cancelled_count"],
+        select(
+            Order.restaurant_id,
+            day,
+            func.sum(case((counted, 1), else_=0)),
+            func.coalesce(func.sum(case((counted, Order.total_amount), else_=0)), 0),
+            func.sum(case((counted, 0), else_=1)),
+        )
+        .where(Order.restaurant_id.isnot(None))
+        .group_by(Order.restaurant_id, day)
+    ))
+    db.execute(insert(RestaurantDailyProductStats).from_select(
+        ["restaurant_id", "day", "product_id", "name", "quantity", "revenue"],
+        select(
+            Order.restaurant_id,
+            day,
+            OrderItem.product_id,
+            func.max(OrderItem.name),
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.price),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(counted, Order.restaurant_id.isnot(None), OrderItem.product_id.isnot(None))
+        .group_by(Order.restaurant_id, day, OrderItem.product_id)
+    ))
+    db.commit()
+    return result.rowcount
+
+
+def ensure_order_stats(db: Session):
+    """Jednorazowa migracja przy starcie: agregaty dla zamówień sprzed wprowadzenia statystyk."""
+    if db.query(RestaurantDailyStats.day).first() is not None:
+        return
+    if db.query(Order.id).first() is None:
+        return
+    rebuild_order_stats(db)
+
+
+# --- Odczyt ---
+
+def bucket_start(day: date, period: str) -> date:
+    if period == "week":
+        return day - timedelta(days=day.weekday())  # od poniedziałku
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _summary(order_count: int, revenue: float, cancelled_count: int) -> dict:
+    return {
+        "order_count": order_count,
+        "revenue": round(revenue, 2),
+        "average_basket": round(revenue / order_count, 2) if order_count else 0.0,
+        "cancelled_count": cancelled_count,
+    }
+
+
+async def restaurant_stats(
+    db: AsyncSession, restaurant_id: int, period: str, date_from: date, date_to: date, top: int
+) -> dict:
+    daily = (await db.scalars(
+        select(RestaurantDailyStats)
+        .where(
+            RestaurantDailyStats.restaurant_id == restaurant_id,
+            RestaurantDailyStats.day >= date_from,
+            RestaurantDailyStats.day <= date_to,
+        )
+        .order_by(RestaurantDailyStats.day)
+    )).all()
+
+    buckets = OrderedDict()
+    for row in daily:
+        bucket = buckets.setdefault(bucket_start(row.day, period), [0, 0.0, 0])
+        bucket[0] += row.order_count
+        bucket[1] += row.revenue
+        bucket[2] += row.cancelled_count
+
+    quantity = func.sum(RestaurantDailyProductStats.quantity).label("quantity")
+    products = await db.execute(
+        select(
+            RestaurantDailyProductStats.product_id,
+            func.max(RestaurantDailyProductStats.name).label("name"),
+            quantity,
+            func.sum(RestaurantDailyProductStats.revenue).label("revenue"),
+        )
+        .where(
+            RestaurantDailyProductStats.restaurant_id == restaurant_id,
+            RestaurantDailyProductStats.day >= date_from,
+            RestaurantDailyProductStats.day <= date_to,
+        )
+        .group_by(RestaurantDailyProductStats.product_id)
+        .having(quantity > 0)
+        .order_by(quantity.desc(), RestaurantDailyProductStats.product_id)
+        .limit(top)
+    )
+
+    totals = [sum(bucket[i] for bucket in buckets.values()) for i in range(3)]
+    return {
+        "restaurant_id": restaurant_id,
+        "period": period,
+        "date_from": date_from,
+        "date_to": date_to,
+        "totals": _summary(*totals),
+        "buckets": [{"start": start, **_summary(*values)} for start, values in buckets.items()],
+        "top_products": [
+            {"product_id": p.product_id, "name": p.name, "quantity": p.quantity, "revenue": round(p.revenue, 2)}
+            for p in products
+        ],
+    }
@@ -0,0 +1,67 @@
+# Cykl życia zamówienia: dozwolone statusy, przejścia i kto może je wykonać.
+import enum
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+class OrderStatus(str, enum.Enum):
+    CONFIRMED = "confirmed"
+    PREPARING = "preparing"
+    DELIVERY = "delivery"
+    ARRIVED = "arrived"
+    DELIVERED = "delivered"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+# status -> statusy, na które można przejść
+TRANSITIONS = {
+    OrderStatus.CONFIRMED: {OrderStatus.PREPARING, OrderStatus.CANCELLED},
+    OrderStatus.PREPARING: {OrderStatus.DELIVERY, OrderStatus.CANCELLED},
+    OrderStatus.DELIVERY: {OrderStatus.ARRIVED, OrderStatus.DELIVERED},
+    OrderStatus.ARRIVED: {OrderStatus.DELIVERED, OrderStatus.COMPLETED},
+    OrderStatus.DELIVERED: {OrderStatus.COMPLETED},
+    OrderStatus.COMPLETED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+# zamówienia "w toku" - /orders/active, częściowy indeks ix_orders_active_user
+ACTIVE_STATUSES = (
+    OrderStatus.CONFIRMED.value,
+    OrderStatus.PREPARING.value,
+    OrderStatus.DELIVERY.value,
+    OrderStatus.ARRIVED.value,
+)
+# literał SQL wspólny dla indeksu i zapytań: SQLite użyje indeksu częściowego
+# tylko wtedy, gdy warunek w zapytaniu jest identyczny (bez parametrów)
+ACTIVE_STATUSES_SQL = "status IN ({})".format(", ".join(f"'{s}'" for s in ACTIVE_STATUSES))
+
+# statusy, na które może przestawić zamówienie właściciel restauracji / klient
+OWNER_TARGETS = {
+    OrderStatus.PREPARING, OrderStatus.DELIVERY, OrderStatus.ARRIVED,
+    OrderStatus.DELIVERED, OrderStatus.CANCELLED,
+}
+CUSTOMER_TARGETS = {OrderStatus.DELIVERED, OrderStatus.COMPLETED, OrderStatus.CANCELLED}
+
+
+def is_active(status: Optional[str]) -> bool:
+    return status in ACTIVE_STATUSES
+
+
+def check_transition(current: str, new: OrderStatus, role: str):
+    """403 - rola nie może ustawić tego statusu, 409 - przejście niedozwolone z obecnego statusu."""
+    is_owner = role == "właściciel"
+    if is_owner and new not in OWNER_TARGETS:
+        raise HTTPException(status_code=403, detail=f"Właściciel nie może ustawić statusu {new.value}")
+    if not is_owner and new not in CUSTOMER_TARGETS:
+        raise HTTPException(status_code=403, detail="Klient może tylko potwierdzić odbiór lub anulować nowe zamówienie")
+    # klient anuluje tylko zamówienie, którego kuchnia jeszcze nie przyjęła
+    if new == OrderStatus.CANCELLED and not is_owner and current != OrderStatus.CONFIRMED.value:
+        raise HTTPException(status_code=409, detail="Zamówienia w realizacji nie można już anulować")
+    try:
+        targets = TRANSITIONS[OrderStatus(current)]
+    except ValueError:
+        targets = set()
+    if new not in targets:
+        raise HTTPException(status_code=409, detail=f"Nie można zmienić statusu z {current} na {new.value}")
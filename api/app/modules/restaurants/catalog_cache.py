@@ -0,0 +1,70 @@
+# Cache publicznych odczytów katalogu: gotowe bajty JSON + ETag.
+# Każdy zapis zmieniający katalog woła invalidate_catalog(), co podbija wersję.
+import hashlib
+import re
+import threading
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.cache import TTLCache
+from app.core.config import CATALOG_CACHE_TTL_SECONDS, CATALOG_CACHE_MAX_SIZE
+
+_cache = TTLCache(max_size=CATALOG_CACHE_MAX_SIZE, ttl_seconds=CATALOG_CACHE_TTL_SECONDS)
+_version = 0
+_version_lock = threading.Lock()
+
+# entity-tag z RFC 9110: opcjonalne W/ i wartość w cudzysłowie (może zawierać przecinki)
+_ENTITY_TAG = re.compile(r'\s*(?:(?:W/)?("[^"]*"))?\s*(?:,|$)')
+
+
+def catalog_version() -> int:
+    return _version
+
+
+def invalidate_catalog():
+    global _version
+    with _version_lock:
+        _version += 1
+    _cache.clear()
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match: "*" albo lista entity-tagów po przecinku. Porównanie słabe (W/ pomijane)
+    i dokładne - "abc" nie pasuje do "abcd". Nagłówek z błędną składnią nie pasuje do niczego.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    position, tags = 0, []
+    while position < len(if_none_match):
+        match = _ENTITY_TAG.match(if_none_match, position)
+        if match is None:
+            return False
+        if match.group(1):
+            tags.append(match.group(1))
+        position = match.end()
+    return etag.removeprefix("W/") in tags
+
+
+def cached_json_response(request: Request, key: str, adapter: TypeAdapter, build: Callable[[], Any]) -> Response:
+    """
+    Zwraca zserializowany wynik build() z cache (albo 304, gdy klient ma aktualny ETag).
+    build() jest wołane tylko przy braku wpisu dla bieżącej wersji katalogu.
+    """
+    version = _version
+    entry = _cache.get((version, key))
+    if entry is None:
+        # exclude_unset: pomija relacje, o które lista nie prosiła (?include=)
+        body = adapter.dump_json(adapter.validate_python(build(), from_attributes=True), exclude_unset=True)
+        entry = (body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"')
+        # nie zapisuj wyniku, jeśli w trakcie budowania katalog się zmienił
+        if version == _version:
+            _cache.set((version, key), entry)
+
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
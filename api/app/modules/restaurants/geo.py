@@ -0,0 +1,105 @@
+# Wyszukiwanie restauracji w pobliżu: siatka komórek (geo_cell) jako indeks,
+# prostokąt ograniczający jako wstępny filtr, dokładna odległość haversine na końcu.
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from .models import Restaurant
+
+EARTH_RADIUS_KM = 6371.0
+CELL_DEGREES = 0.05  # ~5.5 km szerokości geograficznej
+_COLUMNS = int(round(360 / CELL_DEGREES))
+
+
+def _row_col(lat: float, lon: float) -> Tuple[int, int]:
+    row = int(math.floor((lat + 90.0) / CELL_DEGREES))
+    col = int(math.floor((lon + 180.0) / CELL_DEGREES)) % _COLUMNS
+    return row, col
+
+
+def geo_cell(lat: Optional[float], lon: Optional[float]) -> Optional[int]:
+    if lat is None or lon is None:
+        return None
+    row, col = _row_col(lat, lon)
+    return row * _COLUMNS + col
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float):
+    """
+    (min_lat, max_lat, przedziały długości). Prostokąt przecinający południk 180° jest dzielony
+    na dwa przedziały po obu stronach; koło obejmujące biegun - pełny zakres długości.
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - d_lat, lat + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+
+    d_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    if d_lon >= 180.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+    west, east = lon - d_lon, lon + d_lon
+    if west < -180.0:
+        return min_lat, max_lat, [(west + 360.0, 180.0), (-180.0, east)]
+    if east > 180.0:
+        return min_lat, max_lat, [(west, 180.0), (-180.0, east - 360.0)]
+    return min_lat, max_lat, [(west, east)]
+
+
+def _cell_ranges(min_lat, max_lat, min_lon, max_lon):
+    # jeden przedział BETWEEN na wiersz siatki -> skan zakresu indeksu zamiast całej tabeli
+    row_min, col_min = _row_col(min_lat, min_lon)
+    row_max, _ = _row_col(max_lat, min_lon)
+    # lon = 180 to ta sama kolumna co -180 (modulo) - ostatnia kolumna siatki to _COLUMNS - 1
+    col_max = _COLUMNS - 1 if max_lon >= 180.0 else _row_col(min_lat, max_lon)[1]
+    return [(row * _COLUMNS + col_min, row * _COLUMNS + col_max) for row in range(row_min, row_max + 1)]
+
+
+def nearby_statement(lat: float, lon: float, radius_km: float):
+    """Kandydaci z komórek siatki w prostokącie ograniczającym (bez dokładnej odległości)."""
+    min_lat, max_lat, lon_ranges = bounding_box(lat, lon, radius_km)
+    # status w każdym członie OR - każdy zakres komórek to osobny przedział indeksu (status, geo_cell);
+    # przy wspólnym "status = ? AND (... OR ...)" SQLite dla kilku zakresów czyta cały status=approved
+    cells = or_(*[
+        and_(Restaurant.status == "approved", Restaurant.geo_cell.between(low, high))
+        for min_lon, max_lon in lon_ranges
+        for low, high in _cell_ranges(min_lat, max_lat, min_lon, max_lon)
+    ])
+    return select(Restaurant).where(
+        cells,
+        Restaurant.latitude.between(min_lat, max_lat),
+        or_(*[Restaurant.longitude.between(min_lon, max_lon) for min_lon, max_lon in lon_ranges]),
+    )
+
+
+def find_nearby(db: Session, lat: float, lon: float, radius_km: float, limit: int) -> List[Tuple[Restaurant, float]]:
+    """Zatwierdzone restauracje w promieniu radius_km, posortowane po odległości."""
+    candidates = db.scalars(nearby_statement(lat, lon, radius_km)).all()
+
+    results = []
+    for restaurant in candidates:
+        distance = haversine_km(lat, lon, restaurant.latitude, restaurant.longitude)
+        if distance <= radius_km:
+            results.append((restaurant, distance))
+    results.sort(key=lambda pair: pair[1])
+    return results[:limit]
+
+
+def backfill_geo_cells(db: Session) -> int:
+    """Uzupełnia geo_cell dla restauracji ze współrzędnymi (migracja istniejących danych)."""
+    restaurants = db.query(Restaurant).filter(
+        Restaurant.geo_cell.is_(None), Restaurant.latitude.isnot(None), Restaurant.longitude.isnot(None)
+    ).all()
+    for restaurant in restaurants:
+        restaurant.geo_cell = geo_cell(restaurant.latitude, restaurant.longitude)
+    db.commit()
+    return len(restaurants)
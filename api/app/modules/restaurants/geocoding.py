@@ -0,0 +1,151 @@
+# Geokodowanie adresów restauracji: cache w bazie + wymienny dostawca.
+# Endpointy nie czekają na zewnętrzne API - brakujące współrzędne uzupełnia zadanie w tle.
+import hashlib
+import json
+import logging
+import urllib.parse
+import urllib.request
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import GEOCODING_PROVIDER, GEOCODING_TIMEOUT_SECONDS, MAPBOX_TOKEN
+from app.db.database import SessionLocal
+from .models import GeocodeCache, Restaurant
+from .catalog_cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+
+def normalize_address(city: str, street: str, number: str) -> str:
+    address = f"{street or ''} {number or ''}, {city or ''}"
+    return " ".join(address.lower().split())
+
+
+# --- Dostawcy ---
+
+class GeocodingProvider:
+    name = "base"
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        raise NotImplementedError
+
+
+class MapboxProvider(GeocodingProvider):
+    name = "mapbox"
+
+    def __init__(self, token: str = MAPBOX_TOKEN, timeout: float = GEOCODING_TIMEOUT_SECONDS):
+        self.token = token
+        self.timeout = timeout
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        encoded_query = urllib.parse.quote(address)
+        url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{encoded_query}.json?access_token={self.token}&limit=1"
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                if response.status == 200:
+                    data = json.loads(response.read().decode())
+                    if data.get("features"):
+                        center = data["features"][0]["center"]
+                        return float(center[1]), float(center[0])
+        except Exception as e:
+            logger.warning(f"Mapbox error: {e}")
+        return None
+
+
+class FakeGeocodingProvider(GeocodingProvider):
+    """Offline: deterministyczne współrzędne w granicach Polski, wyliczone z adresu."""
+    name = "fake"
+
+    def geocode(self, address: str) -> Optional[Coordinates]:
+        digest = hashlib.sha256(address.encode()).digest()
+        lat = 49.0 + int.from_bytes(digest[:4], "big") / 2**32 * 5.8
+        lon = 14.1 + int.from_bytes(digest[4:8], "big") / 2**32 * 10.0
+        return round(lat, 6), round(lon, 6)
+
+
+_PROVIDERS = {"mapbox": MapboxProvider, "fake": FakeGeocodingProvider}
+_provider: Optional[GeocodingProvider] = None
+
+
+def get_provider() -> GeocodingProvider:
+    global _provider
+    if _provider is None:
+        _provider = _PROVIDERS[GEOCODING_PROVIDER]()
+    return _provider
+
+
+def set_provider(provider: GeocodingProvider):
+    global _provider
+    _provider = provider
+
+
+# --- Cache ---
+
+def cached_coordinates(db: Session, city: str, street: str, number: str) -> Optional[Coordinates]:
+    """Tylko odczyt z cache - bez wywołania dostawcy."""
+    row = db.query(GeocodeCache.latitude, GeocodeCache.longitude)\
+        .filter(GeocodeCache.address == normalize_address(city, street, number)).first()
+    return (row.latitude, row.longitude) if row else None
+
+
+def resolve_coordinates(db: Session, city: str, street: str, number: str) -> Optional[Coordinates]:
+    """Cache, a przy braku - dostawca; wynik zapisywany w cache."""
+    address = normalize_address(city, street, number)
+    row = db.query(GeocodeCache).filter(GeocodeCache.address == address).first()
+    if row:
+        return row.latitude, row.longitude
+
+    provider = get_provider()
+    coordinates = provider.geocode(address)
+    if coordinates:
+        db.add(GeocodeCache(address=address, latitude=coordinates[0], longitude=coordinates[1], provider=provider.name))
+        try:
+            db.commit()
+        except IntegrityError:
+            # ten sam adres zapisał równolegle inny worker
+            db.rollback()
+    return coordinates
+
+
+# --- Uzupełnianie współrzędnych restauracji ---
+
+def fill_restaurant_coordinates(restaurant_id: int):
+    """Zadanie w tle (BackgroundTasks) - ma własną sesję DB."""
+    db = SessionLocal()
+    try:
+        restaurant = db.get(Restaurant, restaurant_id)
+        if restaurant:
+            _apply_coordinates(db, restaurant)
+    finally:
+        db.close()
+
+
+def fill_missing_coordinates(db: Session, restaurant_ids: Optional[Iterable[int]] = None) -> int:
+    """Geokoduje wszystkie restauracje bez współrzędnych; każdy adres odpytuje raz."""
+    query = db.query(Restaurant).filter(Restaurant.latitude.is_(None))
+    if restaurant_ids is not None:
+        query = query.filter(Restaurant.id.in_(list(restaurant_ids)))
+    filled = 0
+    for restaurant in query.all():
+        if _apply_coordinates(db, restaurant):
+            filled += 1
+    return filled
+
+
+def _apply_coordinates(db: Session, restaurant: Restaurant) -> bool:
+    address = (restaurant.city, restaurant.street, restaurant.number)
+    coordinates = resolve_coordinates(db, *address)
+    if not coordinates:
+        return False
+    # adres mógł się zmienić w trakcie geokodowania
+    db.refresh(restaurant)
+    if (restaurant.city, restaurant.street, restaurant.number) != address:
+        return False
+    restaurant.latitude, restaurant.longitude = coordinates
+    db.commit()
+    invalidate_catalog()
+    return True
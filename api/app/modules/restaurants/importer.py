@@ -0,0 +1,127 @@
+# Import masowy restauracji i menu (CSV / JSONL / JSON) - zapis paczkami przez executemany.
+# Kolumny jak w schemas.RestaurantImportRow / ProductImportRow. Wiersze z błędami są pomijane
+# i opisane w raporcie; poprawne paczki trafiają do bazy razem z kuchniami i indeksem wyszukiwania.
+from typing import IO, List, Optional, Set
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core import bulk
+from app.core.config import BULK_IMPORT_CHUNK_SIZE
+from app.modules.users.models import User
+from .catalog_cache import invalidate_catalog
+from .geo import geo_cell
+from .models import Product, Restaurant, restaurant_cuisines
+from .schemas import ProductImportRow, RestaurantImportRow
+from .search import reindex_restaurants
+from .service import get_or_create_cuisines, normalize_cuisine, parse_cuisines
+
+RESTAURANT_COLUMNS = (
+    "name", "cuisines", "city", "street", "number", "description", "status",
+    "latitude", "longitude", "owner_id",
+)
+
+
+# --- Restauracje ---
+
+def _prepare_restaurants(db: Session, chunk: List[bulk.Record], report: bulk.ImportReport):
+    valid = bulk.validate(chunk, RestaurantImportRow, report)
+    emails = {row.owner_email.lower() for _, row in valid if row.owner_email}
+    owner_ids = {row.owner_id for _, row in valid if row.owner_id is not None}
+    by_email = dict(db.execute(
+        select(func.lower(User.email), User.id).where(func.lower(User.email).in_(emails))
+    ).all()) if emails else {}
+    known_ids = set(db.scalars(select(User.id).where(User.id.in_(owner_ids)))) if owner_ids else set()
+
+    rows = []
+    for number, row in valid:
+        owner_id = row.owner_id
+        if row.owner_email:
+            owner_id = by_email.get(row.owner_email.lower())
+            if owner_id is None:
+                report.error(number, f"owner_email: brak użytkownika {row.owner_email}")
+                continue
+        elif owner_id is not None and owner_id not in known_ids:
+            report.error(number, f"owner_id: brak użytkownika {owner_id}")
+            continue
+        data = row.model_dump(include=set(RESTAURANT_COLUMNS))
+        data["owner_id"] = owner_id
+        data["geo_cell"] = geo_cell(row.latitude, row.longitude)
+        data["rating"] = 0.0
+        data["rating_sum"] = data["rating_count"] = 0
+        rows.append((number, data))
+    return rows
+
+
+def _insert_restaurants(db: Session, rows: List[dict]):
+    # RETURNING w kolejności wierszy - id potrzebne do kuchni i indeksu wyszukiwania
+    ids = db.execute(
+        insert(Restaurant).returning(Restaurant.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+
+    names = {restaurant_id: parse_cuisines(row["cuisines"]) for restaurant_id, row in zip(ids, rows)}
+    cuisines = {c.normalized_name: c for c in get_or_create_cuisines(db, [n for ns in names.values() for n in ns])}
+    db.flush()
+    links = [
+        {"restaurant_id": restaurant_id, "cuisine_id": cuisines[normalize_cuisine(name)].id}
+        for restaurant_id, restaurant_names in names.items()
+        for name in restaurant_names
+    ]
+    if links:
+        db.execute(restaurant_cuisines.insert(), links)
+    reindex_restaurants(db.connection(), ids)
+
+
+def import_restaurants(db: Session, stream: IO[bytes], fmt: str, chunk_size: int = BULK_IMPORT_CHUNK_SIZE):
+    """Brakujące współrzędne uzupełnia potem: python -m app.cli geocode-restaurants."""
+    report = bulk.import_records(
+        db, bulk.read_records(stream, fmt), _prepare_restaurants, _insert_restaurants, chunk_size
+    )
+    if report.inserted:
+        invalidate_catalog()
+    return report
+
+
+# --- Produkty ---
+
+def _products_preparer(owner_id: Optional[int]):
+    """owner_id - właściciel może dopisywać produkty tylko do swoich restauracji (None - admin / CLI)."""
+    def prepare(db: Session, chunk: List[bulk.Record], report: bulk.ImportReport):
+        valid = bulk.validate(chunk, ProductImportRow, report)
+        restaurant_ids = {row.restaurant_id for _, row in valid}
+        query = select(Restaurant.id).where(Restaurant.id.in_(restaurant_ids))
+        if owner_id is not None:
+            query = query.where(Restaurant.owner_id == owner_id)
+        allowed: Set[int] = set(db.scalars(query)) if restaurant_ids else set()
+
+        rows = []
+        for number, row in valid:
+            if row.restaurant_id not in allowed:
+                report.error(number, f"restaurant_id: brak restauracji {row.restaurant_id}"
+                             + (" wśród Twoich" if owner_id is not None else ""))
+                continue
+            rows.append((number, row.model_dump()))
+        return rows
+    return prepare
+
+
+def import_products(
+    db: Session, stream: IO[bytes], fmt: str, owner_id: Optional[int] = None,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE,
+):
+    touched: Set[int] = set()
+
+    def insert_products(db: Session, rows: List[dict]):
+        db.execute(insert(Product), rows)
+        touched.update(row["restaurant_id"] for row in rows)
+
+    report = bulk.import_records(
+        db, bulk.read_records(stream, fmt), _products_preparer(owner_id), insert_products, chunk_size
+    )
+    if report.inserted:
+        # produkty są częścią dokumentu wyszukiwania restauracji - jedno przeliczenie na koniec,
+        # a nie po każdej paczce (menu z tysiącami pozycji liczyłoby się setki razy)
+        reindex_restaurants(db.connection(), touched)
+        db.commit()
+        invalidate_catalog()
+    return report
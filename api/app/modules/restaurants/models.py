@@ -1,7 +1,28 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Table, Index
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
+from datetime import datetime
 from app.db.database import Base 
 
+# Kuchnie restauracji (znormalizowane z pola tekstowego Restaurant.cuisines)
+restaurant_cuisines = Table(
+    "restaurant_cuisines",
+    Base.metadata,
+    Column("restaurant_id", Integer, ForeignKey("restaurants.id", ondelete="CASCADE"), primary_key=True),
+    Column("cuisine_id", Integer, ForeignKey("cuisines.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_restaurant_cuisines_cuisine", "cuisine_id", "restaurant_id"),
+)
+
+
+class Cuisine(Base):
+    __tablename__ = "cuisines"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    # klucz wyszukiwania: małe litery, bez zbędnych spacji
+    normalized_name = Column(String, unique=True, index=True, nullable=False)
+
+
 class Restaurant(Base):
     __tablename__ = "restaurants"
 
@@ -9,12 +30,17 @@ class Restaurant(Base):
     name = Column(String, index=True)
     rating = Column(Float, default=0.0)
     #average_rating = Column(Float, default=0.0)
+    # Agregat ocen - aktualizowany przy każdej nowej recenzji (rating = rating_sum / rating_count)
+    rating_sum = Column(Integer, default=0, nullable=False, server_default="0")
+    rating_count = Column(Integer, default=0, nullable=False, server_default="0")
     cuisines = Column(String) 
     city = Column(String, default="")
     street = Column(String, default="")
     number = Column(String, default="")
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    # komórka siatki geograficznej (geo.geo_cell) - indeks dla /restaurants/nearby
+    geo_cell = Column(Integer, nullable=True)
 
     # Status: 'pending', 'approved', 'rejected'
     status = Column(String, default="pending") 
@@ -26,10 +52,24 @@ class Restaurant(Base):
     description = Column(String, nullable=True, default="")  
 
     products = relationship("Product", back_populates="restaurant", cascade="all, delete-orphan")
+    cuisine_tags = relationship("Cuisine", secondary=restaurant_cuisines)
     owner = relationship("app.modules.users.models.User", back_populates="restaurants")
 
     orders = relationship("app.modules.orders.models.Order", back_populates="restaurant")
 
+    # status ma indeks przez ix_restaurants_status_geo_cell (pierwsza kolumna)
+    __table_args__ = (
+        Index("ix_restaurants_status_geo_cell", "status", "geo_cell"),
+        Index("ix_restaurants_owner_id", "owner_id"),
+    )
+
+
+@event.listens_for(Restaurant, "before_insert")
+@event.listens_for(Restaurant, "before_update")
+def _update_geo_cell(mapper, connection, target):
+    from .geo import geo_cell
+    target.geo_cell = geo_cell(target.latitude, target.longitude)
+
 
 class Product(Base):
     __tablename__ = "products"
@@ -40,4 +80,21 @@ class Product(Base):
     price = Column(Float)
     category = Column(String)
 
-    restaurant = relationship("Restaurant", back_populates="products")
\ No newline at end of file
+    restaurant = relationship("Restaurant", back_populates="products")
+
+    # menu restauracji (/{id}/products, /menus - ORDER BY category)
+    __table_args__ = (
+        Index("ix_products_restaurant_category", "restaurant_id", "category"),
+    )
+
+
+# Cache geokodowania: znormalizowany adres -> współrzędne
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    id = Column(Integer, primary_key=True)
+    address = Column(String, unique=True, index=True, nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    provider = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
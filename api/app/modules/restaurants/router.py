@@ -1,85 +1,78 @@
 # api/app/modules/restaurants/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
-from jose import jwt, JWTError
-import urllib.request
-import urllib.parse
-import json
 
 from app.db.database import get_db
-from app.core.config import SECRET_KEY, ALGORITHM
-from app.modules.users import models as user_models
-from . import models, schemas
+from app.core.auth import get_current_user
+from app.core.bulk import ImportResult, upload_format
+from app.core.config import MENUS_MAX_RESTAURANTS, MENUS_MAX_PER_RESTAURANT, NEARBY_MAX_RADIUS_KM, NEARBY_MAX_RESULTS, SEARCH_MAX_RESULTS
+from app.modules.users.schemas import CurrentUser
+from . import models, schemas, geo, geocoding, importer, search, service
+from .catalog_cache import cached_json_response, invalidate_catalog
 
 router = APIRouter()
 
-MAPBOX_TOKEN = "pk.eyJ1Ijoicm9yaWsiLCJhIjoiY21qN3JvaDh5MDV4cDNncXpkM3RlNmVzZCJ9.HemoDNLmVXXnG2OTEb3H7g"
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
-
-# --- POMOCNIK: Get User ---
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = db.query(user_models.User).filter(user_models.User.email == email).first()
-    if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
-
-# --- GEOCODING ---
-def get_coordinates(city: str, street: str, number: str):
-    try:
-        full_address = f"{street} {number}, {city}"
-        encoded_query = urllib.parse.quote(full_address)
-        url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{encoded_query}.json?access_token={MAPBOX_TOKEN}&limit=1"
-        
-        with urllib.request.urlopen(url) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode())
-                if data.get("features"):
-                    center = data["features"][0]["center"]
-                    return float(center[1]), float(center[0])
-    except Exception as e:
-        print(f"Mapbox error: {e}")
-        pass
-    return None, None
+_restaurant_list = TypeAdapter(List[schemas.RestaurantListOut])
+_product_list = TypeAdapter(List[schemas.ProductOut])
+_string_list = TypeAdapter(List[str])
+_menu_list = TypeAdapter(List[schemas.RestaurantMenu])
 
 # ==========================================
 # ENDPOINTY
 # ==========================================
 
 # 1. PUBLICZNE: Tylko zatwierdzone
-@router.get("/", response_model=List[schemas.RestaurantOut])
-def get_approved_restaurants(cuisine: Optional[str] = None, db: Session = Depends(get_db)):
-    query = db.query(models.Restaurant).filter(models.Restaurant.status == "approved")
-    if cuisine:
-        all_restaurants = query.all()
-        return [r for r in all_restaurants if cuisine.lower() in r.cuisines.lower()]
-    return query.all()
+@router.get("/", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
+def get_approved_restaurants(
+    request: Request,
+    cuisine: Optional[str] = None,
+    include: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    cuisine_key = service.normalize_cuisine(cuisine) if cuisine else ""
+    includes = service.parse_include(include)
+
+    def build():
+        query = db.query(models.Restaurant)\
+            .options(*service.list_options(includes))\
+            .filter(models.Restaurant.status == "approved")
+        if cuisine_key:
+            query = query.join(models.restaurant_cuisines)\
+                .join(models.Cuisine)\
+                .filter(models.Cuisine.normalized_name == cuisine_key)
+        return service.serialize_restaurant_list(query.all(), includes)
+
+    cache_key = f"restaurants:{cuisine_key}:{','.join(sorted(includes))}"
+    return cached_json_response(request, cache_key, _restaurant_list, build)
 
 # 2. WŁAŚCICIEL: Moje restauracje
-@router.get("/mine", response_model=List[schemas.RestaurantOut])
-def get_my_restaurants(current_user: user_models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return db.query(models.Restaurant).filter(models.Restaurant.owner_id == current_user.id).all()
+@router.get("/mine", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
+def get_my_restaurants(
+    include: Optional[str] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    includes = service.parse_include(include)
+    restaurants = db.query(models.Restaurant)\
+        .options(*service.list_options(includes))\
+        .filter(models.Restaurant.owner_id == current_user.id).all()
+    return service.serialize_restaurant_list(restaurants, includes)
 
 # 3. WŁAŚCICIEL: Wniosek (Tworzenie)
 @router.post("/", response_model=schemas.RestaurantOut, status_code=status.HTTP_201_CREATED)
 def create_restaurant_application(
     restaurant: schemas.RestaurantCreate, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    lat, lon = get_coordinates(restaurant.city, restaurant.street, restaurant.number)
+    # współrzędne z cache; jeśli ich nie ma, geokodowanie idzie w tle po odpowiedzi
+    coordinates = geocoding.cached_coordinates(db, restaurant.city, restaurant.street, restaurant.number)
+    lat, lon = coordinates or (None, None)
     db_restaurant = models.Restaurant(
         name=restaurant.name, 
-        rating=restaurant.rating, 
         cuisines=restaurant.cuisines,
         city=restaurant.city,
         street=restaurant.street,
@@ -90,30 +83,56 @@ def create_restaurant_application(
         owner_id=current_user.id,
         description=restaurant.description
     )
+    service.sync_restaurant_cuisines(db, db_restaurant)
     db.add(db_restaurant)
     db.commit()
     db.refresh(db_restaurant)
+    if coordinates is None:
+        background_tasks.add_task(geocoding.fill_restaurant_coordinates, db_restaurant.id)
     return db_restaurant
 
+# ADMIN: Import masowy restauracji z pliku CSV / JSONL / JSON (kolumny jak schemas.RestaurantImportRow)
+@router.post("/import", response_model=ImportResult)
+def import_restaurants(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv / jsonl / json - domyślnie z rozszerzenia pliku"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
+    fmt = upload_format(file.filename, format)
+    return importer.import_restaurants(db, file.file, fmt).result()
+
 # 4. ADMIN: Nowe wnioski (pending)
-@router.get("/applications", response_model=List[schemas.RestaurantOut])
+@router.get("/applications", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
 def get_restaurant_applications(
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != 'admin':
         raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
-    return db.query(models.Restaurant).filter(models.Restaurant.status == "pending").all()
+    includes = service.parse_include(include)
+    restaurants = db.query(models.Restaurant)\
+        .options(*service.list_options(includes))\
+        .filter(models.Restaurant.status == "pending").all()
+    return service.serialize_restaurant_list(restaurants, includes)
 
 # 5. ADMIN: Historia wniosków (approved/rejected)
-@router.get("/applications/history", response_model=List[schemas.RestaurantOut])
+@router.get("/applications/history", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
 def get_applications_history(
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != 'admin':
         raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
-    return db.query(models.Restaurant).filter(models.Restaurant.status != "pending").all()
+    includes = service.parse_include(include)
+    restaurants = db.query(models.Restaurant)\
+        .options(*service.list_options(includes))\
+        .filter(models.Restaurant.status.in_(["approved", "rejected"])).all()  # IN zamiast != - indeks po status
+    return service.serialize_restaurant_list(restaurants, includes)
 
 # 6. ADMIN: Zmiana statusu (Decyzja)
 @router.put("/{restaurant_id}/status", response_model=schemas.RestaurantOut)
@@ -121,7 +140,7 @@ def update_restaurant_status(
     restaurant_id: int,
     status_data: schemas.RestaurantStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != 'admin':
         raise HTTPException(status_code=403, detail="Brak uprawnień administratora")
@@ -141,27 +160,32 @@ def update_restaurant_status(
         restaurant.rejection_reason = None
 
     db.commit()
+    invalidate_catalog()
     db.refresh(restaurant)
     return restaurant
 
 # 7. ADMIN: Pobierz WSZYSTKIE (do tabeli zarządzania)
-@router.get("/all", response_model=List[schemas.RestaurantOut])
+@router.get("/all", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
 def get_all_restaurants_for_admin(
+    include: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != 'admin':
         raise HTTPException(status_code=403, detail="Brak uprawnień")
     
-    return db.query(models.Restaurant).all()
+    includes = service.parse_include(include)
+    restaurants = db.query(models.Restaurant).options(*service.list_options(includes)).all()
+    return service.serialize_restaurant_list(restaurants, includes)
 
 # 8. EDYCJA DANYCH (PUT) - ADMIN i WŁAŚCICIEL
 @router.put("/{restaurant_id}", response_model=schemas.RestaurantOut)
 def update_restaurant_details(
     restaurant_id: int,
     restaurant_update: schemas.RestaurantUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Pobierz restaurację
     db_rest = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
@@ -183,8 +207,7 @@ def update_restaurant_details(
         db_rest.name = restaurant_update.name
     if restaurant_update.cuisines:
         db_rest.cuisines = restaurant_update.cuisines
-    if restaurant_update.rating is not None:
-        db_rest.rating = restaurant_update.rating
+        service.sync_restaurant_cuisines(db, db_rest)
     if restaurant_update.description is not None:
         db_rest.description = restaurant_update.description
 
@@ -200,13 +223,16 @@ def update_restaurant_details(
         db_rest.number = restaurant_update.number
         address_changed = True
     
+    coordinates = None
     if address_changed:
-        lat, lon = get_coordinates(db_rest.city, db_rest.street, db_rest.number)
-        db_rest.latitude = lat
-        db_rest.longitude = lon
+        coordinates = geocoding.cached_coordinates(db, db_rest.city, db_rest.street, db_rest.number)
+        db_rest.latitude, db_rest.longitude = coordinates or (None, None)
 
     db.commit()
+    invalidate_catalog()
     db.refresh(db_rest)
+    if address_changed and coordinates is None:
+        background_tasks.add_task(geocoding.fill_restaurant_coordinates, db_rest.id)
     return db_rest
 
 # 9. DELETE (Uniwersalne usuwanie)
@@ -214,7 +240,7 @@ def update_restaurant_details(
 def delete_restaurant(
     restaurant_id: int, 
     db: Session = Depends(get_db),
-    current_user: user_models.User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     restaurant = db.query(models.Restaurant).filter(models.Restaurant.id == restaurant_id).first()
     if not restaurant:
@@ -226,48 +252,120 @@ def delete_restaurant(
     
     db.delete(restaurant)
     db.commit()
+    invalidate_catalog()
     return {"message": "Restauracja usunięta"}
 
 # --- Produkty ---
 @router.get("/{restaurant_id}/products", response_model=List[schemas.ProductOut])
-def get_products(restaurant_id: int, db: Session = Depends(get_db)):
-    return db.query(models.Product).filter(models.Product.restaurant_id == restaurant_id).all()
+def get_products(restaurant_id: int, request: Request, db: Session = Depends(get_db)):
+    return cached_json_response(
+        request, f"products:{restaurant_id}", _product_list,
+        lambda: db.query(models.Product).filter(models.Product.restaurant_id == restaurant_id).all()
+    )
+
+# Menu wielu restauracji w jednym żądaniu: /restaurants/menus?ids=1&ids=2
+@router.get("/menus", response_model=List[schemas.RestaurantMenu])
+def get_menus(
+    request: Request,
+    ids: Optional[List[int]] = Query(None),
+    per_restaurant: int = Query(100, ge=1, le=MENUS_MAX_PER_RESTAURANT),
+    db: Session = Depends(get_db)
+):
+    restaurant_ids = list(dict.fromkeys(ids or []))  # bez duplikatów, kolejność jak w żądaniu
+    if not restaurant_ids:
+        raise HTTPException(status_code=400, detail="Podaj co najmniej jedno ids")
+    if len(restaurant_ids) > MENUS_MAX_RESTAURANTS:
+        raise HTTPException(status_code=400, detail=f"Maksymalnie {MENUS_MAX_RESTAURANTS} restauracji na żądanie")
+    return cached_json_response(
+        request, f"menus:{','.join(map(str, restaurant_ids))}:{per_restaurant}", _menu_list,
+        lambda: service.load_menus(db, restaurant_ids, per_restaurant)
+    )
+
+# Restauracje w pobliżu: /restaurants/nearby?lat=52.23&lon=21.01&radius_km=5
+@router.get("/nearby", response_model=List[schemas.RestaurantNearbyOut], response_model_exclude_unset=True)
+def get_nearby_restaurants(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5, gt=0, le=NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(50, ge=1, le=NEARBY_MAX_RESULTS),
+    db: Session = Depends(get_db)
+):
+    nearby = geo.find_nearby(db, lat, lon, radius_km, limit)
+    items = service.serialize_restaurant_list([restaurant for restaurant, _ in nearby], set())
+    for item, (_, distance) in zip(items, nearby):
+        item["distance_km"] = round(distance, 3)
+    return items
+
+# Wyszukiwanie pełnotekstowe: /restaurants/search?q=pizza marg
+# Następna strona: ?cursor=<X-Next-Cursor>
+@router.get("/search", response_model=List[schemas.RestaurantListOut], response_model_exclude_unset=True)
+def search_restaurants(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_RESULTS),
+    db: Session = Depends(get_db)
+):
+    # wyniki są rankingowane, więc kursor to po prostu przesunięcie
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Niepoprawny kursor")
+    offset = int(cursor or 0)
+    found = search.search_restaurants(db, q, limit, offset)
+    if len(found) > limit:
+        found = found[:limit]
+        response.headers["X-Next-Cursor"] = str(offset + limit)
+    return service.serialize_restaurant_list([restaurant for restaurant, _ in found], set())
 
 @router.post("/products", response_model=schemas.ProductOut)
-def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db), current_user: user_models.User = Depends(get_current_user)):
+def create_product(product: schemas.ProductCreate, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     # Opcjonalnie można dodać sprawdzanie, czy current_user to właściciel restauracji
     db_product = models.Product(**product.dict())
     db.add(db_product)
     db.commit()
+    invalidate_catalog()
     db.refresh(db_product)
     return db_product
 
+# Import masowy menu z pliku CSV / JSONL / JSON (kolumny: restaurant_id, name, price, category).
+# Właściciel - tylko do swoich restauracji, admin - do dowolnych.
+@router.post("/products/import", response_model=ImportResult)
+def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv / jsonl / json - domyślnie z rozszerzenia pliku"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if current_user.role not in ("admin", "właściciel"):
+        raise HTTPException(status_code=403, detail="Brak uprawnień")
+    fmt = upload_format(file.filename, format)
+    owner_id = None if current_user.role == "admin" else current_user.id
+    return importer.import_products(db, file.file, fmt, owner_id=owner_id).result()
+
 @router.delete("/products/{product_id}")
-def delete_product(product_id: int, db: Session = Depends(get_db), current_user: user_models.User = Depends(get_current_user)):
+def delete_product(product_id: int, db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     product = db.query(models.Product).filter(models.Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Produkt nie znaleziony")
     db.delete(product)
     db.commit()
+    invalidate_catalog()
     return {"message": "Produkt usunięty"}
 
 
 # 10. PUBLICZNE: Lista dostępnych kuchni
 @router.get("/cuisines", response_model=List[str])
-def get_available_cuisines(db: Session = Depends(get_db)):
-    restaurants = db.query(models.Restaurant).filter(
-        models.Restaurant.status == "approved"
-    ).all()
-
-    cuisines_set = set()
-
-    for r in restaurants:
-        if r.cuisines:
-            # rozbijamy po przecinku
-            for c in r.cuisines.split(","):
-                cuisines_set.add(c.strip())
-
-    return sorted(list(cuisines_set))
+def get_available_cuisines(request: Request, db: Session = Depends(get_db)):
+    def build():
+        rows = db.query(models.Cuisine.name)\
+            .join(models.restaurant_cuisines)\
+            .join(models.Restaurant)\
+            .filter(models.Restaurant.status == "approved")\
+            .distinct()\
+            .order_by(models.Cuisine.name)\
+            .all()
+        return [name for (name,) in rows]
+
+    return cached_json_response(request, "cuisines", _string_list, build)
 
 # 10. Dodawanie opisu restauracji
 @router.put("/restaurants/{restaurant_id}", response_model=schemas.RestaurantOut)
@@ -275,7 +373,7 @@ def update_restaurant(
     restaurant_id: int,
     payload: schemas.RestaurantUpdate,
     db: Session = Depends(get_db),
-    user=Depends(get_current_user)
+    user: CurrentUser = Depends(get_current_user)
 ):
     rest = db.query(models.Restaurant).filter(models.Restaurant.id==restaurant_id, models.Restaurant.owner_id==user.id).first()
     if not rest:
@@ -284,8 +382,23 @@ def update_restaurant(
     # aktualizacja tylko pól, które zostały przesłane
     for key, value in payload.dict(exclude_unset=True).items():
         setattr(rest, key, value)
+    if "cuisines" in payload.dict(exclude_unset=True):
+        service.sync_restaurant_cuisines(db, rest)
 
     db.commit()
+    invalidate_catalog()
     db.refresh(rest)
     return rest
 
+
+# 11. PUBLICZNE: Szczegóły restauracji z pełnym menu
+# (na końcu pliku, żeby /{restaurant_id} nie przechwytywał /cuisines, /mine itp.)
+@router.get("/{restaurant_id}", response_model=schemas.RestaurantOut)
+def get_restaurant_details(restaurant_id: int, db: Session = Depends(get_db)):
+    restaurant = db.query(models.Restaurant)\
+        .options(selectinload(models.Restaurant.products), selectinload(models.Restaurant.owner))\
+        .filter(models.Restaurant.id == restaurant_id, models.Restaurant.status == "approved")\
+        .first()
+    if not restaurant:
+        raise HTTPException(status_code=404, detail="Restauracja nie znaleziona")
+    return restaurant
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 # --- Produkty ---
 class ProductBase(BaseModel):
@@ -21,6 +21,16 @@ class Product(ProductBase):
     class Config:
         from_attributes = True
 
+# --- Menu wielu restauracji naraz (/restaurants/menus) ---
+class MenuCategory(BaseModel):
+    category: str
+    products: List[ProductOut]
+
+class RestaurantMenu(BaseModel):
+    restaurant_id: int
+    categories: List[MenuCategory]
+    truncated: bool = False  # menu ucięte do limitu per_restaurant
+
 # --- Pomocniczy schemat właściciela ---
 class OwnerInfo(BaseModel):
     first_name: str
@@ -39,7 +49,8 @@ class RestaurantBase(BaseModel):
     description: Optional[str] = None
 
 class RestaurantCreate(RestaurantBase):
-    rating: Optional[float] = 0.0
+    # bez rating - ocena wynika z recenzji (rating_sum / rating_count)
+    pass
 
 # --- EDYCJA DANYCH RESTAURACJI (Brakujący element) ---
 class RestaurantUpdate(BaseModel):
@@ -48,7 +59,6 @@ class RestaurantUpdate(BaseModel):
     city: Optional[str] = None
     street: Optional[str] = None
     number: Optional[str] = None
-    rating: Optional[float] = None
     description: Optional[str] = None
 
 # --- AKTUALIZACJA STATUSU ---
@@ -56,6 +66,32 @@ class RestaurantStatusUpdate(BaseModel):
     status: str
     rejection_reason: Optional[str] = None
 
+# Lekki widok listy: bez menu i właściciela, chyba że zamówione przez ?include=products,owner
+class RestaurantListOut(BaseModel):
+    id: int
+    name: str
+    cuisines: str
+    rating: float
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    city: str
+    street: str
+    number: str
+    description: Optional[str] = None
+
+    status: str
+    rejection_reason: Optional[str] = None
+    owner_id: Optional[int] = None
+
+    owner: Optional[OwnerInfo] = None
+    products: Optional[List[ProductOut]] = None
+
+    class Config:
+        from_attributes = True
+
+class RestaurantNearbyOut(RestaurantListOut):
+    distance_km: float
+
 class RestaurantOut(RestaurantBase):
     id: int
     rating: float
@@ -71,4 +107,17 @@ class RestaurantOut(RestaurantBase):
     products: List[ProductOut] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# --- Import masowy (POST /restaurants/import, /restaurants/products/import) ---
+class RestaurantImportRow(RestaurantBase):
+    # bez kolumny rating - ocena wynika z recenzji (rating_sum / rating_count), import zaczyna od zera
+    status: Literal["approved", "pending", "rejected"] = "approved"
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    # właściciel: id albo e-mail istniejącego użytkownika (opcjonalnie)
+    owner_id: Optional[int] = None
+    owner_email: Optional[str] = None
+
+class ProductImportRow(ProductCreate):
+    price: float = Field(..., ge=0)
@@ -0,0 +1,213 @@
+# Wyszukiwanie pełnotekstowe restauracji: nazwa, kuchnie, opis oraz nazwy/kategorie produktów.
+# SQLite: tabela wirtualna FTS5 (rowid = id restauracji), PostgreSQL: tsvector + indeks GIN.
+# Indeks aktualizuje hook after_flush sesji - każdy zapis przez ORM (endpointy, CLI, import)
+# przelicza dokumenty zmienionych restauracji w tej samej transakcji.
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, List, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from .models import Product, Restaurant
+
+SEARCH_TABLE = "restaurant_search"
+
+# pola, których zmiana wymaga przeliczenia dokumentu
+_RESTAURANT_FIELDS = ("name", "cuisines", "description")
+_PRODUCT_FIELDS = ("name", "category", "restaurant_id")
+
+# wagi kolumn FTS5 (name, cuisines, products, description) dla bm25()
+_SQLITE_WEIGHTS = "10.0, 5.0, 2.0, 1.0"
+
+# unicode61 / 'simple' nie rozkładają "ł", więc dokumenty i zapytania składamy w Pythonie
+_FOLD = str.maketrans({"ł": "l", "Ł": "L"})
+
+
+def fold_text(value: str) -> str:
+    """Małe litery bez polskich znaków: "Włoska Łosoś" -> "wloska losos"."""
+    decomposed = unicodedata.normalize("NFKD", (value or "").translate(_FOLD))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def _dialect(bind) -> str:
+    return bind.dialect.name
+
+
+# --- Schemat ---
+
+def ensure_search_index(db: Session):
+    """Tworzy indeks przy starcie; pusty indeks przy niepustej tabeli restauracji - przebudowuje."""
+    bind = db.get_bind()
+    if _dialect(bind) == "postgresql":
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "restaurant_id INTEGER PRIMARY KEY REFERENCES restaurants(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        db.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"
+        ))
+    else:
+        db.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "name, cuisines, products, description, tokenize = 'unicode61')"
+        ))
+    db.commit()
+
+    if db.execute(text(f"SELECT 1 FROM {SEARCH_TABLE} LIMIT 1")).first() is None \
+            and db.query(Restaurant.id).first() is not None:
+        rebuild_search_index(db)
+
+
+def rebuild_search_index(db: Session) -> int:
+    """Przelicza dokumenty wszystkich restauracji. Zwraca liczbę zaindeksowanych restauracji."""
+    db.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    ids = [restaurant_id for (restaurant_id,) in db.query(Restaurant.id)]
+    reindex_restaurants(db.connection(), ids)
+    db.commit()
+    return len(ids)
+
+
+def _documents(connection, ids: List[int]) -> List[dict]:
+    restaurants = connection.execute(
+        select(Restaurant.id, Restaurant.name, Restaurant.cuisines, Restaurant.description)
+        .where(Restaurant.id.in_(ids))
+    ).all()
+    products = defaultdict(list)
+    for restaurant_id, name, category in connection.execute(
+        select(Product.restaurant_id, Product.name, Product.category)
+        .where(Product.restaurant_id.in_(ids))
+        .order_by(Product.id)
+    ):
+        products[restaurant_id].append(f"{name or ''} {category or ''}")
+    return [
+        {
+            "id": r.id,
+            "name": fold_text(r.name),
+            "cuisines": fold_text(r.cuisines),
+            "products": fold_text(" ".join(products[r.id])),
+            "description": fold_text(r.description),
+        }
+        for r in restaurants
+    ]
+
+
+def reindex_restaurants(connection, restaurant_ids: Iterable[int]):
+    """Usuwa i wstawia dokumenty podanych restauracji (usunięte restauracje znikają z indeksu)."""
+    ids = sorted(set(restaurant_ids))
+    if not ids:
+        return
+    documents = _documents(connection, ids)
+    if _dialect(connection) == "postgresql":
+        connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE restaurant_id = ANY(:ids)"), {"ids": ids})
+        insert = text(
+            f"INSERT INTO {SEARCH_TABLE} (restaurant_id, document) VALUES (:id, "
+            "setweight(to_tsvector('simple', :name), 'A') || "
+            "setweight(to_tsvector('simple', :cuisines), 'B') || "
+            "setweight(to_tsvector('simple', :products), 'C') || "
+            "setweight(to_tsvector('simple', :description), 'D'))"
+        )
+    else:
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+        insert = text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, name, cuisines, products, description) "
+            "VALUES (:id, :name, :cuisines, :products, :description)"
+        )
+    if documents:
+        connection.execute(insert, documents)
+
+
+# --- Synchronizacja z zapisami ---
+
+def _changed(obj, fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _affected_restaurants(session: Session) -> Set[int]:
+    ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Restaurant):
+            if obj in session.new or obj in session.deleted or _changed(obj, _RESTAURANT_FIELDS):
+                ids.add(obj.id)
+        elif isinstance(obj, Product):
+            if obj in session.new or obj in session.deleted or _changed(obj, _PRODUCT_FIELDS):
+                # przeniesiony produkt zmienia dokument starej i nowej restauracji
+                ids.update(inspect(obj).attrs.restaurant_id.history.deleted or ())
+                ids.add(obj.restaurant_id)
+    ids.discard(None)
+    return ids
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _collect_search_changes(session, flush_context, instances):
+    # historia atrybutów jest dostępna tylko przed flushem; id nowych obiektów - dopiero po nim
+    pending = session.info.setdefault("search_reindex", set())
+    pending.update(_affected_restaurants(session))
+    session.info.setdefault("search_new", []).extend(
+        obj for obj in session.new if isinstance(obj, (Restaurant, Product))
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _reindex_after_flush(session, flush_context):
+    ids = session.info.pop("search_reindex", set())
+    for obj in session.info.pop("search_new", []):
+        ids.add(obj.id if isinstance(obj, Restaurant) else obj.restaurant_id)
+    ids.discard(None)
+    if ids:
+        reindex_restaurants(session.connection(), ids)
+
+
+# --- Wyszukiwanie ---
+
+def _terms(q: str) -> List[str]:
+    terms = re.findall(r"\w+", fold_text(q))
+    if not terms:
+        raise HTTPException(status_code=400, detail="Podaj frazę do wyszukania")
+    return terms
+
+
+def search_statement(dialect: str, q: str, limit: int, offset: int = 0):
+    """Ranking dopasowań (id, score) - limit + 1 wierszy, żeby wywołujący wiedział, czy jest następna strona."""
+    terms = _terms(q)
+    if dialect == "postgresql":
+        ranked = text(
+            f"SELECT s.restaurant_id AS id, ts_rank(s.document, query) AS score "
+            f"FROM {SEARCH_TABLE} s JOIN restaurants r ON r.id = s.restaurant_id "
+            "CROSS JOIN to_tsquery('simple', :query) query "
+            "WHERE s.document @@ query AND r.status = 'approved' "
+            "ORDER BY score DESC, s.restaurant_id LIMIT :limit OFFSET :offset"
+        )
+        query = " & ".join(f"{term}:*" for term in terms)
+    else:
+        # bm25() zwraca wartości ujemne - im mniejsza, tym lepsze dopasowanie
+        ranked = text(
+            f"SELECT {SEARCH_TABLE}.rowid AS id, -bm25({SEARCH_TABLE}, {_SQLITE_WEIGHTS}) AS score "
+            f"FROM {SEARCH_TABLE} JOIN restaurants r ON r.id = {SEARCH_TABLE}.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH :query AND r.status = 'approved' "
+            "ORDER BY score DESC, id LIMIT :limit OFFSET :offset"
+        )
+        query = " ".join(f'"{term}"*' for term in terms)
+    return ranked.bindparams(query=query, limit=limit + 1, offset=offset)
+
+
+def search_restaurants(db: Session, q: str, limit: int, offset: int = 0) -> List[Tuple[Restaurant, float]]:
+    """
+    Zatwierdzone restauracje pasujące do wszystkich słów zapytania (każde słowo jako prefiks),
+    od najlepiej dopasowanej.
+    Pobiera limit + 1 wierszy, żeby wywołujący wiedział, czy jest następna strona.
+    """
+    rows = db.execute(search_statement(_dialect(db.get_bind()), q, limit, offset)).all()
+    restaurants = {
+        restaurant.id: restaurant
+        for restaurant in db.query(Restaurant).filter(Restaurant.id.in_([row.id for row in rows]))
+    } if rows else {}
+    return [(restaurants[row.id], row.score) for row in rows if row.id in restaurants]
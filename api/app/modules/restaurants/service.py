@@ -0,0 +1,146 @@
+from typing import List, Optional, Set
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+from .models import Cuisine, Product, Restaurant, restaurant_cuisines
+from .schemas import OwnerInfo, ProductOut, RestaurantListOut
+
+
+def normalize_cuisine(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def parse_cuisines(cuisines: str) -> List[str]:
+    # "Włoska, Pizza" -> ["Włoska", "Pizza"] (bez pustych i powtórzeń)
+    names = {}
+    for raw in (cuisines or "").split(","):
+        name = " ".join(raw.split())
+        if name:
+            names.setdefault(normalize_cuisine(name), name)
+    return list(names.values())
+
+
+def get_or_create_cuisines(db: Session, names: List[str]) -> List[Cuisine]:
+    by_key = {normalize_cuisine(n): n for n in names}
+    if not by_key:
+        return []
+    existing = {
+        c.normalized_name: c
+        for c in db.query(Cuisine).filter(Cuisine.normalized_name.in_(list(by_key)))
+    }
+    for key, name in by_key.items():
+        if key not in existing:
+            existing[key] = Cuisine(name=name, normalized_name=key)
+            db.add(existing[key])
+    return [existing[key] for key in by_key]
+
+
+def sync_restaurant_cuisines(db: Session, restaurant: Restaurant):
+    """Ustawia powiązania restaurant_cuisines na podstawie pola tekstowego cuisines. Bez commita."""
+    restaurant.cuisine_tags = get_or_create_cuisines(db, parse_cuisines(restaurant.cuisines))
+
+
+def rebuild_cuisine_index(db: Session) -> int:
+    """Migracja / naprawa: odbudowuje restaurant_cuisines z pola cuisines wszystkich restauracji."""
+    restaurants = db.query(Restaurant.id, Restaurant.cuisines).all()
+    names_per_restaurant = {r.id: parse_cuisines(r.cuisines) for r in restaurants}
+    all_names = [name for names in names_per_restaurant.values() for name in names]
+    cuisines = {c.normalized_name: c for c in get_or_create_cuisines(db, all_names)}
+    db.flush()
+
+    db.execute(restaurant_cuisines.delete())
+    rows = [
+        {"restaurant_id": restaurant_id, "cuisine_id": cuisines[normalize_cuisine(name)].id}
+        for restaurant_id, names in names_per_restaurant.items()
+        for name in names
+    ]
+    if rows:
+        db.execute(restaurant_cuisines.insert(), rows)
+    db.commit()
+    return len(rows)
+
+
+def ensure_cuisine_index(db: Session):
+    """Jednorazowa migracja przy starcie: wypełnia tabelę powiązań, jeśli jest pusta."""
+    if db.query(restaurant_cuisines).first() is not None:
+        return
+    if db.query(Restaurant.id).filter(Restaurant.cuisines.isnot(None), Restaurant.cuisines != "").first() is None:
+        return
+    rebuild_cuisine_index(db)
+
+
+# --- Lista restauracji: ?include=products,owner ---
+
+LIST_INCLUDES = {"products", "owner"}
+
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    requested = {part.strip() for part in (include or "").split(",") if part.strip()}
+    unknown = requested - LIST_INCLUDES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Nieznane include: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def list_options(include: Set[str]):
+    # relacje ładowane zbiorczo (jedno zapytanie na relację), tylko gdy o nie poproszono
+    options = []
+    if "products" in include:
+        options.append(selectinload(Restaurant.products))
+    if "owner" in include:
+        options.append(selectinload(Restaurant.owner))
+    return options
+
+
+def serialize_restaurant_list(restaurants: List[Restaurant], include: Set[str]) -> List[dict]:
+    """Słowniki bez kluczy niezamówionych relacji (odpowiedź z exclude_unset)."""
+    result = []
+    for restaurant in restaurants:
+        item = RestaurantListOut.model_validate({
+            field: getattr(restaurant, field)
+            for field in RestaurantListOut.model_fields
+            if field not in LIST_INCLUDES
+        }).model_dump(exclude_unset=True)
+        if "owner" in include:
+            item["owner"] = OwnerInfo.model_validate(restaurant.owner).model_dump() if restaurant.owner else None
+        if "products" in include:
+            item["products"] = [ProductOut.model_validate(p).model_dump() for p in restaurant.products]
+        result.append(item)
+    return result
+
+
+# --- Menu wielu restauracji ---
+
+def menus_statement(restaurant_ids: List[int], per_restaurant: int):
+    """ROW_NUMBER() ogranicza liczbę produktów na restaurację (+1, żeby wykryć ucięcie)."""
+    position = func.row_number().over(
+        partition_by=Product.restaurant_id, order_by=(Product.category, Product.id)
+    ).label("position")
+    ranked = select(Product.id, position)\
+        .where(Product.restaurant_id.in_(restaurant_ids))\
+        .subquery()
+    return select(Product)\
+        .join(ranked, ranked.c.id == Product.id)\
+        .where(ranked.c.position <= per_restaurant + 1)\
+        .order_by(Product.restaurant_id, Product.category, Product.id)
+
+
+def load_menus(db: Session, restaurant_ids: List[int], per_restaurant: int) -> List[dict]:
+    """Menu podanych restauracji jednym zapytaniem IN, pogrupowane po kategorii."""
+    products = db.scalars(menus_statement(restaurant_ids, per_restaurant)).all()
+
+    by_restaurant = {restaurant_id: [] for restaurant_id in restaurant_ids}
+    for product in products:
+        by_restaurant[product.restaurant_id].append(product)
+
+    menus = []
+    for restaurant_id, items in by_restaurant.items():
+        categories = {}
+        for product in items[:per_restaurant]:
+            categories.setdefault(product.category or "", []).append(ProductOut.model_validate(product))
+        menus.append({
+            "restaurant_id": restaurant_id,
+            "categories": [{"category": c, "products": p} for c, p in categories.items()],
+            "truncated": len(items) > per_restaurant,
+        })
+    return menus
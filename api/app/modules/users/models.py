@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -34,6 +34,11 @@ class User(Base):
     #relacja z zamówieniami
     orders = relationship("app.modules.orders.models.Order", back_populates="user")
 
+    # lista wniosków o rolę właściciela (role_request == "pending")
+    __table_args__ = (
+        Index("ix_users_role_request", "role_request"),
+    )
+
 
 # NOWA TABELA
 class UserAddress(Base):
@@ -49,4 +54,8 @@ class UserAddress(Base):
     
     user = relationship("User", back_populates="additional_addresses")
 
+    __table_args__ = (
+        Index("ix_user_addresses_user_id", "user_id"),
+    )
+
 
@@ -1,49 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from typing import List
 from datetime import timedelta
 
 from app.db.database import get_db
-from app.core.security import hash_password, verify_password, create_access_token
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.security import hash_password_async, verify_and_update_password_async, create_access_token
+from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.auth import get_current_user, get_current_db_user, invalidate_user
 from . import models, schemas
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
-
-# --- Helper (Bez zmian) ---
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if user is None:
-        raise credentials_exception
+
+def _find_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+def _save_user(db: Session, user: models.User):
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    user.additional_addresses  # ładujemy tu, a nie podczas serializacji w pętli zdarzeń
     return user
 
 # ==========================
-# ENDPOINTY (Logowanie/Rejestracja BEZ ZMIAN)
+# ENDPOINTY (Logowanie/Rejestracja)
 # ==========================
 
 @router.post("/register", response_model=schemas.UserOut)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == user.email).first()
+async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    # zapytania do bazy w puli wątków, bcrypt w puli procesów - pętla zdarzeń zostaje wolna
+    db_user = await run_in_threadpool(_find_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_pwd = hash_password(user.password)
+    hashed_pwd = await hash_password_async(user.password)
     new_user = models.User(
         email=user.email,
         hashed_password=hashed_pwd,
@@ -58,17 +48,22 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
         marketing_consent=user.marketing_consent,
         data_processing_consent=user.data_processing_consent
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    return await run_in_threadpool(_save_user, db, new_user)
 
 @router.post("/login", response_model=schemas.Token)
-def login_user(user_data: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == user_data.email).first()
-    
-    if not user or not verify_password(user_data.password, user.hashed_password):
+async def login_user(user_data: schemas.UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user_by_email, db, user_data.email)
+    if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    valid, new_hash = await verify_and_update_password_async(user_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    # zmienił się koszt bcrypt -> zapisujemy hash przeliczony z nowym kosztem
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
@@ -79,7 +74,7 @@ def login_user(user_data: schemas.UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.UserOut)
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+def read_users_me(current_user: models.User = Depends(get_current_db_user)):
     return current_user
 
 # --- ADMIN ---
@@ -94,12 +89,14 @@ def change_user_role(user_id: int, role: str, db: Session = Depends(get_db)):
     if user:
         user.role = role
         db.commit()
+        invalidate_user(user_id)
     return {"message": "Role updated"}
 
 @router.delete("/{user_id}")
 def delete_user(user_id: int, db: Session = Depends(get_db)):
     db.query(models.User).filter(models.User.id == user_id).delete()
     db.commit()
+    invalidate_user(user_id)
     return {"message": "User deleted"}
 
 # ==========================
@@ -109,7 +106,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
 @router.get("/addresses", response_model=List[schemas.UserAddressOut])
 def get_my_addresses(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_db_user)
 ):
     return current_user.additional_addresses
 
@@ -117,7 +114,7 @@ def get_my_addresses(
 def add_new_address(
     address: schemas.UserAddressCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.CurrentUser = Depends(get_current_user)
 ):
     new_address = models.UserAddress(
         user_id=current_user.id,
@@ -135,7 +132,7 @@ def add_new_address(
 def delete_address(
     address_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.CurrentUser = Depends(get_current_user)
 ):
     address = db.query(models.UserAddress).filter(
         models.UserAddress.id == address_id,
@@ -152,7 +149,7 @@ def delete_address(
 @router.post("/request-owner")
 def request_restaurant_owner(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: models.User = Depends(get_current_db_user)
 ):
     if current_user.role != "user":
         raise HTTPException(status_code=400, detail="Nie możesz złożyć wniosku")
@@ -168,7 +165,7 @@ def request_restaurant_owner(
 @router.get("/owner-requests", response_model=List[schemas.UserOut])
 def get_owner_requests(
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403)
@@ -182,7 +179,7 @@ def owner_decision(
     user_id: int,
     approve: bool,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user)
+    current_user: schemas.CurrentUser = Depends(get_current_user)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403)
@@ -198,6 +195,7 @@ def owner_decision(
         user.role_request = "rejected"
 
     db.commit()
+    invalidate_user(user_id)
     return {"message": "Decyzja zapisana"}
 
 
@@ -54,6 +54,15 @@ class UserOut(UserBase):
     class Config:
         from_attributes = True
 
+# Dane zalogowanego użytkownika trzymane w cache autoryzacji
+class CurrentUser(BaseModel):
+    id: int
+    email: str
+    role: str
+
+    class Config:
+        from_attributes = True
+
 class Token(BaseModel):
     access_token: str
     token_type: str
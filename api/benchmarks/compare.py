@@ -0,0 +1,52 @@
+# Porównanie dwóch przebiegów Locusta (pliki <prefix>_stats.csv z opcji --csv):
+#   python -m benchmarks.compare benchmarks/results/baseline benchmarks/results/po_zmianie
+import argparse
+import csv
+from typing import Dict
+
+
+def load_stats(prefix: str) -> Dict[str, dict]:
+    """Wiersze <prefix>_stats.csv: "GET /orders/my-orders" -> p50, p99 (ms), rps, błędy."""
+    path = prefix if prefix.endswith(".csv") else f"{prefix}_stats.csv"
+    with open(path, newline="", encoding="utf-8") as f:
+        return {
+            f"{row['Type']} {row['Name']}".strip(): {
+                "p50": float(row["50%"] or 0),
+                "p99": float(row["99%"] or 0),
+                "rps": float(row["Requests/s"] or 0),
+                "failures": int(row["Failure Count"] or 0),
+            }
+            for row in csv.DictReader(f)
+        }
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "    -"
+    return f"{(after - before) / before * 100:+5.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline", help="Prefiks --csv przebiegu bazowego")
+    parser.add_argument("candidate", help="Prefiks --csv przebiegu po zmianie")
+    args = parser.parse_args()
+
+    baseline, candidate = load_stats(args.baseline), load_stats(args.candidate)
+    print(f"{'endpoint':45} {'p50 ms':>16} {'p99 ms':>16} {'req/s':>16}")
+    for name in list(baseline) + [n for n in candidate if n not in baseline]:
+        before, after = baseline.get(name), candidate.get(name)
+        if before is None or after is None:
+            print(f"{name:45} {'tylko w ' + ('bazowym' if after is None else 'nowym'):>16}")
+            continue
+        print(
+            f"{name:45} "
+            f"{after['p50']:8.0f} {_change(before['p50'], after['p50'])}  "
+            f"{after['p99']:8.0f} {_change(before['p99'], after['p99'])}  "
+            f"{after['rps']:8.1f} {_change(before['rps'], after['rps'])}"
+            + (f"  błędy: {after['failures']}" if after["failures"] else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Scenariusze obciążeniowe (Locust) na danych z benchmarks.seed.
+# Uruchomienie z folderu api, przy działającym backendzie na tej samej bazie:
+#   locust -f benchmarks/locustfile.py --host http://localhost:8000 --headless -u 50 -r 10 -t 2m \
+#       --csv benchmarks/results/baseline
+# Locust wypisuje p50/p99 i przepustowość per endpoint; porównanie dwóch przebiegów:
+#   python -m benchmarks.compare benchmarks/results/baseline benchmarks/results/po_zmianie
+# BENCH_USERS / BENCH_RESTAURANTS - te same liczby co --users / --restaurants przy seedowaniu.
+# Domyślnie tylko endpointy i pola, które ma też wersja sprzed optymalizacji - ten sam scenariusz
+# mierzy przebieg bazowy i po zmianie. BENCH_NEW_ENDPOINTS=1 dokłada wyszukiwarkę i statystyki
+# właściciela (istnieją dopiero po zmianach - nie do porównań z bazowym).
+import os
+import random
+
+from locust import HttpUser, SequentialTaskSet, between, task
+
+BENCH_PASSWORD = "benchmark"  # jak w benchmarks/seed.py (bez importu aplikacji - locust działa osobno)
+BENCH_USERS = int(os.getenv("BENCH_USERS", "1000"))
+BENCH_RESTAURANTS = int(os.getenv("BENCH_RESTAURANTS", "50"))
+BENCH_NEW_ENDPOINTS = os.getenv("BENCH_NEW_ENDPOINTS") == "1"
+
+# token właściciela restauracji - wspólny dla wszystkich symulowanych klientów
+_owner_tokens = {}
+
+
+def _login(client, email: str):
+    response = client.post(
+        "/users/login", json={"email": email, "password": BENCH_PASSWORD}, name="/users/login"
+    )
+    if response.status_code != 200:
+        return None
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _owner_headers(client, restaurant_id: int):
+    if restaurant_id not in _owner_tokens:
+        headers = _login(client, f"owner{restaurant_id - 1}@bench.local")
+        if headers is None:
+            return None
+        _owner_tokens[restaurant_id] = headers
+    return _owner_tokens[restaurant_id]
+
+
+class OrderingFlow(SequentialTaskSet):
+    """Pełna ścieżka klienta: lista -> menu -> logowanie -> zamówienie -> realizacja -> ocena."""
+
+    def on_start(self):
+        self.restaurant_id = None
+        self.products = []
+        self.order_id = None
+
+    @task
+    def browse(self):
+        response = self.client.get("/restaurants/", name="/restaurants/")
+        restaurants = response.json() if response.status_code == 200 else []
+        self.restaurant_id = random.choice(restaurants)["id"] if restaurants else random.randint(1, BENCH_RESTAURANTS)
+        if BENCH_NEW_ENDPOINTS and random.random() < 0.3:
+            self.client.get("/restaurants/search", params={"q": "pizza"}, name="/restaurants/search")
+
+    @task
+    def menu(self):
+        response = self.client.get(
+            f"/restaurants/{self.restaurant_id}/products", name="/restaurants/{restaurant_id}/products"
+        )
+        self.products = response.json() if response.status_code == 200 else []
+
+    @task
+    def login(self):
+        # jedno logowanie na symulowanego klienta - bcrypt zdominowałby pozostałe pomiary
+        if self.user.headers is None:
+            self.user.headers = _login(self.client, f"customer{random.randrange(BENCH_USERS)}@bench.local")
+
+    @task
+    def place_order(self):
+        if self.user.headers is None or not self.products:
+            self.interrupt(reschedule=True)
+        # cena, nazwa i suma jak z koszyka frontendu - wersja bazowa wymaga ich w żądaniu
+        items = [
+            {"product_id": product["id"], "quantity": random.randint(1, 3),
+             "price": product["price"], "name": product["name"]}
+            for product in random.sample(self.products, min(len(self.products), random.randint(1, 3)))
+        ]
+        response = self.client.post("/orders/", name="/orders/", headers=self.user.headers, json={
+            "restaurant_id": self.restaurant_id,
+            "total_amount": round(sum(item["price"] * item["quantity"] for item in items), 2),
+            "delivery_address": "Testowa 1",
+            "delivery_time_type": "asap",
+            "payment_method": "blik",
+            "document_type": "paragon",
+            "items": items,
+        })
+        self.order_id = response.json()["id"] if response.status_code == 200 else None
+        self.client.get("/orders/active", name="/orders/active", headers=self.user.headers)
+
+    @task
+    def status_updates(self):
+        owner = _owner_headers(self.client, self.restaurant_id)
+        if self.order_id is None or owner is None:
+            self.interrupt(reschedule=True)
+        for status in ("preparing", "delivery", "delivered"):
+            self.client.patch(
+                f"/orders/{self.order_id}/status", name="/orders/{order_id}/status",
+                headers=owner, json={"new_status": status},
+            )
+        self.client.get("/orders/my-orders", name="/orders/my-orders", headers=self.user.headers)
+
+    @task
+    def review(self):
+        self.client.post(
+            f"/orders/{self.order_id}/review", name="/orders/{order_id}/review",
+            headers=self.user.headers, json={"rating": random.randint(3, 5), "comment": "Benchmark"},
+        )
+
+
+class Customer(HttpUser):
+    weight = 9
+    wait_time = between(0.5, 2)
+    tasks = [OrderingFlow]
+
+    def on_start(self):
+        self.headers = None
+
+
+class Owner(HttpUser):
+    """Panel właściciela: lista zamówień i statystyki."""
+    weight = 1
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        self.headers = _login(self.client, f"owner{random.randrange(BENCH_RESTAURANTS)}@bench.local")
+
+    @task(3)
+    def orders(self):
+        self.client.get("/orders/owner", name="/orders/owner", headers=self.headers)
+
+    @task(1)
+    def stats(self):
+        if not BENCH_NEW_ENDPOINTS:
+            return
+        self.client.get("/orders/owner/stats", name="/orders/owner/stats", headers=self.headers,
+                        params={"period": "day"})
+
+    @task(1)
+    def reviews(self):
+        self.client.get("/orders/reviews/mine", name="/orders/reviews/mine", headers=self.headers)
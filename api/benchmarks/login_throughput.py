@@ -0,0 +1,53 @@
+# Przepustowość weryfikacji haseł (koszt logowania) - inline vs pula procesów.
+# Uruchomienie z folderu api:
+#   python -m benchmarks.login_throughput --logins 64
+import argparse
+import asyncio
+import time
+
+from app.core import security
+from app.core.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+
+def bench_inline(hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    for _ in range(logins):
+        security.verify_and_update_password("benchmark", hashed)
+    return logins / (time.perf_counter() - start)
+
+
+async def bench_pool(hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    done = 0
+    # paczki po PASSWORD_HASH_MAX_PENDING, żeby nie dostać 429 z własnego limitu
+    while done < logins:
+        batch = min(PASSWORD_HASH_MAX_PENDING, logins - done)
+        await asyncio.gather(*[
+            security.verify_and_update_password_async("benchmark", hashed) for _ in range(batch)
+        ])
+        done += batch
+    return logins / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    hashed = security.hash_password("benchmark")
+    # rozgrzanie puli (start procesów nie wlicza się do pomiaru)
+    asyncio.run(bench_pool(hashed, PASSWORD_HASH_WORKERS))
+
+    inline = bench_inline(hashed, max(args.logins // PASSWORD_HASH_WORKERS, 4))
+    pooled = asyncio.run(bench_pool(hashed, args.logins))
+    security.shutdown_hash_pool()
+
+    print(f"bcrypt rounds:        {BCRYPT_ROUNDS}")
+    print(f"workers:              {PASSWORD_HASH_WORKERS}")
+    print(f"inline (1 rdzeń):     {inline:8.2f} logowań/s")
+    print(f"pula procesów:        {pooled:8.2f} logowań/s")
+    print(f"pula / rdzeń:         {pooled / PASSWORD_HASH_WORKERS:8.2f} logowań/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Mikrobenchmarki (pytest-benchmark) zapytań i serializacji z gorących ścieżek, na danych z benchmarks.seed.
+# Uruchomienie z folderu api (nazwa pliku nie pasuje do test_*.py - zwykłe "pytest" go nie zbiera):
+#   python -m pytest benchmarks/micro.py --benchmark-autosave
+#   python -m pytest benchmarks/micro.py --benchmark-compare   # względem ostatniego zapisanego przebiegu
+# Baza: BENCH_DATABASE_URL (domyślnie świeży plik SQLite w katalogu tymczasowym).
+import asyncio
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func
+
+pytest.importorskip("pytest_benchmark")
+
+# adres bazy musi być ustawiony przed importem aplikacji - config czyta go przy imporcie
+os.environ["DATABASE_URL"] = os.getenv(
+    "BENCH_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='foodapp-bench-'), 'micro.db')}",
+)
+
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine, engine  # noqa: E402
+from app.db.schema import upgrade_schema  # noqa: E402
+from app.modules.orders import service as order_service, stats as order_stats  # noqa: E402
+from app.modules.orders.models import Order  # noqa: E402
+from app.modules.orders.schemas import OrderResponse  # noqa: E402
+from app.modules.restaurants import geo, search  # noqa: E402
+from app.modules.restaurants import service as restaurant_service  # noqa: E402
+from app.modules.restaurants.models import Restaurant  # noqa: E402
+from benchmarks.seed import CITIES, seed  # noqa: E402
+
+USERS = 500
+RESTAURANTS = 40
+ORDERS = 20000
+
+
+@pytest.fixture(scope="module")
+def db():
+    upgrade_schema(engine)
+    session = SessionLocal()
+    if session.query(Restaurant.id).first() is None:
+        seed(session, users=USERS, restaurants=RESTAURANTS, products=20, orders=ORDERS, reviews=3000)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def run_async():
+    # jedna pętla na cały moduł - połączenia aiosqlite są przypięte do pętli
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(async_engine.dispose())
+    loop.close()
+
+
+def _busiest(db, column):
+    return db.query(column).group_by(column).order_by(func.count().desc()).limit(1).scalar()
+
+
+# --- Katalog restauracji ---
+
+def test_restaurant_list(benchmark, db):
+    def run():
+        restaurants = db.query(Restaurant).filter(Restaurant.status == "approved").all()
+        db.expire_all()
+        return restaurant_service.serialize_restaurant_list(restaurants, set())
+    assert len(benchmark(run)) == RESTAURANTS
+
+
+def test_menus(benchmark, db):
+    ids = list(range(1, 11))
+    assert len(benchmark(restaurant_service.load_menus, db, ids, 100)) == len(ids)
+
+
+def test_nearby(benchmark, db):
+    _, lat, lon = CITIES[0]
+    benchmark(geo.find_nearby, db, lat, lon, 10, 50)
+
+
+def test_search(benchmark, db):
+    benchmark(search.search_restaurants, db, "pizza", 20)
+
+
+# --- Zamówienia ---
+
+def test_my_orders_page(benchmark, db, run_async):
+    user_id = _busiest(db, Order.user_id)
+
+    async def page():
+        async with AsyncSessionLocal() as session:
+            stmt = order_service.user_orders_select(user_id)
+            return await order_service.paginate_orders(session, stmt, limit=50)
+
+    orders, _ = benchmark(lambda: run_async(page()))
+    assert orders
+
+
+def test_owner_orders_page(benchmark, db, run_async):
+    restaurant_id = _busiest(db, Order.restaurant_id)
+
+    async def page():
+        async with AsyncSessionLocal() as session:
+            stmt = order_service.restaurant_orders_select(restaurant_id)
+            return await order_service.paginate_orders(session, stmt, limit=50, statuses=["confirmed", "preparing"])
+
+    benchmark(lambda: run_async(page()))
+
+
+def test_order_serialization(benchmark, db):
+    orders = db.scalars(order_service.orders_select().order_by(Order.id).limit(50)).all()
+    benchmark(lambda: [OrderResponse.model_validate(order_service.serialize_order(o)).model_dump() for o in orders])
+
+
+def test_owner_stats(benchmark, db, run_async):
+    restaurant_id = _busiest(db, Order.restaurant_id)
+    date_to = date.today()
+
+    async def load():
+        async with AsyncSessionLocal() as session:
+            return await order_stats.restaurant_stats(
+                session, restaurant_id, "week", date_to - timedelta(days=90), date_to, 10
+            )
+
+    assert benchmark(lambda: run_async(load()))["totals"]["order_count"] > 0
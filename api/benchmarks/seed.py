@@ -0,0 +1,225 @@
+# Generator danych do benchmarków: użytkownicy, restauracje, produkty, zamówienia i recenzje
+# w świeżej bazie (SQLite albo PostgreSQL - adres z DATABASE_URL, jak w aplikacji).
+# Uruchomienie z folderu api:
+#   DATABASE_URL=sqlite:///benchmarks/bench.db python -m benchmarks.seed --users 1000 --restaurants 50
+# Wszyscy mają hasło BENCH_PASSWORD; klienci: customer{i}@bench.local, właściciele: owner{i}@bench.local
+# (owner{i} prowadzi restaurację o id i + 1). Ten sam --seed daje te same dane.
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, text
+
+from app.core.security import hash_password
+from app.db.database import SessionLocal, engine
+from app.db.schema import upgrade_schema
+from app.modules.orders.models import Order, OrderItem, OrderStatusEvent, Review
+from app.modules.orders.service import rebuild_rating_aggregates
+from app.modules.orders.stats import rebuild_order_stats
+from app.modules.restaurants.geo import geo_cell
+from app.modules.restaurants.models import Product, Restaurant
+from app.modules.restaurants.search import ensure_search_index
+from app.modules.restaurants.service import rebuild_cuisine_index
+from app.modules.users.models import User
+
+BENCH_PASSWORD = "benchmark"
+CHUNK_SIZE = 1000
+
+CITIES = [
+    ("Kraków", 50.0614, 19.9366),
+    ("Warszawa", 52.2297, 21.0122),
+    ("Wrocław", 51.1079, 17.0385),
+    ("Gdańsk", 54.3520, 18.6466),
+    ("Poznań", 52.4064, 16.9252),
+    ("Łódź", 51.7592, 19.4560),
+]
+CUISINES = ["Włoska", "Pizza", "Polska", "Azjatycka", "Sushi", "Burgery", "Wegańska", "Meksykańska", "Indyjska", "Kebab"]
+DISHES = {
+    "Przystawki": ["Bruschetta", "Zupa pomidorowa", "Pierogi ruskie", "Sajgonki", "Nachos"],
+    "Dania główne": ["Margherita", "Pad thai", "Burger klasyczny", "Schabowy", "Curry z kurczakiem", "Ramen"],
+    "Desery": ["Tiramisu", "Sernik", "Lody waniliowe", "Szarlotka"],
+    "Napoje": ["Cola", "Lemoniada", "Woda", "Herbata mrożona"],
+}
+COMMENTS = [None, "Pyszne!", "Dostawa na czas", "Trochę zimne", "Polecam", "Za długo czekałem"]
+
+# status końcowy -> ścieżka statusów od utworzenia (zgodnie z orders/status.py) i jego udział
+STATUS_PATHS = {
+    "completed": ["confirmed", "preparing", "delivery", "delivered", "completed"],
+    "delivered": ["confirmed", "preparing", "delivery", "delivered"],
+    "arrived": ["confirmed", "preparing", "delivery", "arrived"],
+    "delivery": ["confirmed", "preparing", "delivery"],
+    "preparing": ["confirmed", "preparing"],
+    "confirmed": ["confirmed"],
+    "cancelled": ["confirmed", "cancelled"],
+}
+STATUS_WEIGHTS = {
+    "completed": 60, "delivered": 10, "arrived": 3, "delivery": 5,
+    "preparing": 6, "confirmed": 8, "cancelled": 8,
+}
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+def _user(user_id: int, email: str, role: str, hashed: str, rng: random.Random) -> dict:
+    city = rng.choice(CITIES)[0]
+    return {
+        "id": user_id, "email": email, "hashed_password": hashed, "role": role,
+        "first_name": "Bench", "last_name": str(user_id), "phone_number": f"500{user_id:06d}",
+        "street": f"Testowa {user_id}", "city": city, "postal_code": "00-000",
+        "terms_accepted": True, "marketing_consent": False, "data_processing_consent": True,
+    }
+
+
+def seed(
+    db,
+    users: int = 1000,
+    restaurants: int = 50,
+    products: int = 20,
+    orders: int = 10000,
+    reviews: int = 3000,
+    days: int = 90,
+    rng_seed: int = 42,
+) -> dict:
+    """Wypełnia pustą bazę. Zwraca liczbę wierszy każdego rodzaju."""
+    rng = random.Random(rng_seed)
+    hashed = hash_password(BENCH_PASSWORD)  # jeden hash dla wszystkich - bcrypt jest celowo wolny
+    now = datetime.utcnow()
+
+    customer_rows = [_user(i + 1, f"customer{i}@bench.local", "user", hashed, rng) for i in range(users)]
+    owner_rows = [
+        _user(users + i + 1, f"owner{i}@bench.local", "właściciel", hashed, rng) for i in range(restaurants)
+    ]
+    _insert(db, User, customer_rows + owner_rows)
+
+    restaurant_rows = []
+    for i in range(restaurants):
+        city, lat, lon = rng.choice(CITIES)
+        latitude, longitude = lat + rng.uniform(-0.08, 0.08), lon + rng.uniform(-0.12, 0.12)
+        restaurant_rows.append({
+            "id": i + 1, "name": f"{rng.choice(CUISINES)} {city} {i}",
+            "cuisines": ", ".join(rng.sample(CUISINES, rng.randint(1, 3))),
+            "city": city, "street": f"Rynek {i}", "number": str(i + 1),
+            "latitude": latitude, "longitude": longitude, "geo_cell": geo_cell(latitude, longitude),
+            "status": "approved", "owner_id": users + i + 1, "description": "Restauracja testowa",
+            "rating": 0.0, "rating_sum": 0, "rating_count": 0,
+        })
+    _insert(db, Restaurant, restaurant_rows)
+
+    product_rows = []
+    menus = {}
+    for restaurant_id in range(1, restaurants + 1):
+        menu = menus[restaurant_id] = []
+        for _ in range(products):
+            category = rng.choice(list(DISHES))
+            row = {
+                "id": len(product_rows) + 1, "restaurant_id": restaurant_id, "category": category,
+                "name": rng.choice(DISHES[category]), "price": round(rng.uniform(5, 60), 2),
+            }
+            product_rows.append(row)
+            menu.append(row)
+    _insert(db, Product, product_rows)
+
+    order_rows, item_rows, event_rows, reviewable = [], [], [], []
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    for order_id in range(1, orders + 1):
+        user_id = rng.randint(1, users)
+        restaurant_id = rng.randint(1, restaurants)
+        created_at = now - timedelta(seconds=rng.randint(0, days * 24 * 3600))
+        path = STATUS_PATHS[rng.choices(statuses, weights)[0]]
+
+        total = 0.0
+        for product in rng.sample(menus[restaurant_id], min(rng.randint(1, 4), products)):
+            quantity = rng.randint(1, 3)
+            total += quantity * product["price"]
+            item_rows.append({
+                "order_id": order_id, "product_id": product["id"], "quantity": quantity,
+                "price": product["price"], "name": product["name"],
+            })
+        order_rows.append({
+            "id": order_id, "user_id": user_id, "restaurant_id": restaurant_id, "status": path[-1],
+            "total_amount": round(total, 2), "delivery_address": f"Testowa {user_id}",
+            "delivery_time_type": "asap", "payment_method": "blik", "document_type": "paragon",
+            "created_at": created_at,
+        })
+        changed_at, previous = created_at, None
+        for status in path:
+            event_rows.append({
+                "order_id": order_id, "from_status": previous, "to_status": status,
+                "changed_by": user_id if status in ("confirmed", "completed") else users + restaurant_id,
+                "created_at": changed_at,
+            })
+            previous, changed_at = status, changed_at + timedelta(minutes=rng.randint(3, 20))
+        if path[-1] in ("delivered", "completed"):
+            reviewable.append((order_id, user_id, restaurant_id, changed_at))
+    _insert(db, Order, order_rows)
+    _insert(db, OrderItem, item_rows)
+    _insert(db, OrderStatusEvent, event_rows)
+
+    review_rows = [
+        {
+            "order_id": order_id, "user_id": user_id, "restaurant_id": restaurant_id,
+            "rating": rng.choices([1, 2, 3, 4, 5], [1, 1, 3, 6, 9])[0],
+            "comment": rng.choice(COMMENTS), "created_at": reviewed_at,
+        }
+        for order_id, user_id, restaurant_id, reviewed_at in rng.sample(reviewable, min(reviews, len(reviewable)))
+    ]
+    _insert(db, Review, review_rows)
+
+    if db.bind.dialect.name == "postgresql":
+        # jawne id - sekwencje muszą zacząć za nimi, inaczej pierwsze INSERT z aplikacji się nie uda
+        for table in ("users", "restaurants", "products", "orders"):
+            db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"))
+    db.commit()
+
+    # pochodne: kuchnie, indeks wyszukiwania, statystyki właścicieli, średnie ocen
+    rebuild_cuisine_index(db)
+    ensure_search_index(db)
+    rebuild_order_stats(db)
+    rebuild_rating_aggregates(db)
+
+    return {
+        "users": len(customer_rows) + len(owner_rows),
+        "restaurants": len(restaurant_rows),
+        "products": len(product_rows),
+        "orders": len(order_rows),
+        "order_items": len(item_rows),
+        "reviews": len(review_rows),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed")
+    parser.add_argument("--users", type=int, default=1000, help="Liczba klientów")
+    parser.add_argument("--restaurants", type=int, default=50, help="Liczba restauracji (i ich właścicieli)")
+    parser.add_argument("--products", type=int, default=20, help="Produktów na restaurację")
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--reviews", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=90, help="Zakres dat zamówień wstecz od dziś")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    upgrade_schema(engine)
+    db = SessionLocal()
+    try:
+        if db.query(func.count(User.id)).scalar() or db.query(func.count(Restaurant.id)).scalar():
+            print(f"Baza {engine.url.render_as_string(hide_password=True)} nie jest pusta - "
+                  "benchmark wymaga świeżej bazy (ustaw DATABASE_URL)")
+            sys.exit(1)
+        started = time.perf_counter()
+        counts = seed(
+            db, users=args.users, restaurants=args.restaurants, products=args.products,
+            orders=args.orders, reviews=args.reviews, days=args.days, rng_seed=args.seed,
+        )
+        print(", ".join(f"{name}: {count}" for name, count in counts.items()))
+        print(f"Gotowe w {time.perf_counter() - started:.1f} s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Środowisko Alembica: metadane modeli aplikacji i adres bazy z app.core.config
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import DATABASE_URL
+from app.db.database import Base
+
+# modele muszą być zaimportowane, żeby trafiły do Base.metadata
+from app.modules.users import models as user_models  # noqa: F401
+from app.modules.restaurants import models as restaurant_models  # noqa: F401
+from app.modules.orders import models as order_models  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # tabele spoza modeli (indeks FTS5 restaurant_search i jego tabele pomocnicze) - pomijamy
+    if type_ == "table" and reflected and compare_to is None:
+        return False
+    return True
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=True,  # SQLite nie ma pełnego ALTER TABLE
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    _configure(url=DATABASE_URL, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # app/db/schema.py przekazuje własne połączenie; "alembic" z wiersza poleceń tworzy nowe
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
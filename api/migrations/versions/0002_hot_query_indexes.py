@@ -0,0 +1,44 @@
+"""hot query indexes
+
+Indeksy pod filtry używane w gorących ścieżkach routerów. orders.user_id / restaurant_id
+i restaurants.status mają już indeksy złożone z rewizji 0001 (pierwsza kolumna).
+if_not_exists - bazy sprzed migracji mogą je już mieć z sync_schema.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 07:45:47.855372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # (nazwa, tabela, kolumny)
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_orders_restaurant_status_created', 'orders', ['restaurant_id', 'status', 'created_at']),
+    ('ix_products_restaurant_category', 'products', ['restaurant_id', 'category']),
+    ('ix_restaurants_owner_id', 'restaurants', ['owner_id']),
+    ('ix_reviews_restaurant_created', 'reviews', ['restaurant_id', 'created_at']),
+    ('ix_user_addresses_user_id', 'user_addresses', ['user_id']),
+    ('ix_users_role_request', 'users', ['role_request']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,55 @@
+"""backfill rating aggregates
+
+Jednorazowe przeliczenie restaurants.rating_sum / rating_count / rating z tabeli reviews.
+Bazy sprzed agregatu ocen dostały te kolumny z wartością 0 (sync_schema), więc pierwsza
+nowa recenzja nadpisałaby średnią. Restauracje bez recenzji zachowują dotychczasową ocenę.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# bez importu modeli aplikacji - migracja ma działać także po ich późniejszych zmianach
+restaurants = sa.table(
+    'restaurants',
+    sa.column('id', sa.Integer), sa.column('rating', sa.Float),
+    sa.column('rating_sum', sa.Integer), sa.column('rating_count', sa.Integer),
+)
+reviews = sa.table(
+    'reviews',
+    sa.column('id', sa.Integer), sa.column('restaurant_id', sa.Integer), sa.column('rating', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    review_sum = sa.select(sa.func.coalesce(sa.func.sum(reviews.c.rating), 0))\
+        .where(reviews.c.restaurant_id == restaurants.c.id).scalar_subquery()
+    review_count = sa.select(sa.func.count(reviews.c.id))\
+        .where(reviews.c.restaurant_id == restaurants.c.id).scalar_subquery()
+    # jak orders.service.rebuild_rating_aggregates (CAST do Numeric - round(x, n) w PostgreSQL)
+    average = sa.func.round(sa.cast(sa.cast(review_sum, sa.Float) / review_count, sa.Numeric), 1)
+    op.execute(
+        restaurants.update().values(
+            rating_sum=review_sum,
+            rating_count=review_count,
+            rating=sa.case((review_count > 0, average), else_=restaurants.c.rating),
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # tylko dane - kolumny zostają, nie ma czego cofać
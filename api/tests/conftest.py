@@ -0,0 +1,116 @@
+# Testy backendu na świeżej bazie SQLite w katalogu tymczasowym.
+# Uruchomienie z folderu api: python -m pytest tests
+import os
+import tempfile
+from contextlib import contextmanager
+from itertools import count
+
+import pytest
+from sqlalchemy import event
+
+# adres bazy musi być ustawiony przed importem aplikacji - config czyta go przy imporcie
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='foodapp-tests-'), 'test.db')}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.auth import get_current_user  # noqa: E402
+from app.db.database import SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.modules.orders.models import Order, OrderItem  # noqa: E402
+from app.modules.restaurants.models import Product, Restaurant  # noqa: E402
+from app.modules.users.models import User  # noqa: E402
+from app.modules.users.schemas import CurrentUser  # noqa: E402
+
+_ids = count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(client):
+    # client - start aplikacji (lifespan) tworzy indeks wyszukiwania i uzupełnia dane
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def login_as():
+    """login_as(user) - kolejne żądania jako ten użytkownik (bez tokena i hashowania haseł)."""
+    def login(user: User):
+        snapshot = CurrentUser(id=user.id, email=user.email, role=user.role)
+        app.dependency_overrides[get_current_user] = lambda: snapshot
+    yield login
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@contextmanager
+def count_queries():
+    """Zapytania SQL wysłane w bloku (silnik sync i async) jako lista (sql, parametry)."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
+
+# --- Dane testowe ---
+
+def make_user(db, role: str = "user") -> User:
+    n = next(_ids)
+    user = User(
+        email=f"user{n}@test.local", hashed_password="-", role=role,
+        first_name="Jan", last_name=f"Test{n}", phone_number="000000000",
+        street="Testowa 1", city="Kraków", postal_code="30-001",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_restaurant(db, owner: User) -> Restaurant:
+    restaurant = Restaurant(
+        name=f"Restauracja {next(_ids)}", cuisines="Włoska", city="Kraków", street="Rynek", number="1",
+        status="approved", owner_id=owner.id,
+    )
+    db.add(restaurant)
+    db.commit()
+    return restaurant
+
+
+def make_product(db, restaurant: Restaurant, price: float = 20.0) -> Product:
+    product = Product(name=f"Danie {next(_ids)}", price=price, category="Dania", restaurant_id=restaurant.id)
+    db.add(product)
+    db.commit()
+    return product
+
+
+def make_orders(db, user: User, restaurant: Restaurant, products, count: int):
+    orders = []
+    for _ in range(count):
+        order = Order(
+            user_id=user.id, restaurant_id=restaurant.id, status="confirmed",
+            total_amount=sum(p.price for p in products), delivery_address="Testowa 1",
+            delivery_time_type="asap", payment_method="blik", document_type="paragon",
+        )
+        db.add(order)
+        db.flush()
+        db.add_all([
+            OrderItem(order_id=order.id, product_id=p.id, quantity=1, price=p.price, name=p.name)
+            for p in products
+        ])
+        orders.append(order)
+    db.commit()
+    return orders
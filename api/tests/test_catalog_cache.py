@@ -0,0 +1,33 @@
+# Cache katalogu: ETag i warunkowe GET (If-None-Match).
+import pytest
+
+from app.modules.restaurants.catalog_cache import etag_matches
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", W/"abc"', True),
+    ('"a,b" , "abc"', True),
+    ('"x", , "abc"', True),
+    ('*', True),
+    ('"ab"', False),
+    ('"abcd"', False),
+    ('"x", "y"', False),
+    ('abc', False),
+    ('"x" "abc"', False),
+    ('', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_restaurant_list_conditional_get(client):
+    response = client.get("/restaurants/")
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    for header in (etag, f"W/{etag}", f'"inny", {etag}', "*"):
+        assert client.get("/restaurants/", headers={"If-None-Match": header}).status_code == 304
+    # prefiks bieżącego ETagu to inny tag - pełna odpowiedź
+    assert client.get("/restaurants/", headers={"If-None-Match": etag[:-2] + '"'}).status_code == 200
@@ -0,0 +1,115 @@
+# Eksport zamówień i opinii (GET /orders/export, GET /orders/reviews/export).
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from app.modules.orders.export import ORDER_FIELDS, REVIEW_FIELDS
+from app.modules.orders.models import Review
+
+from conftest import make_orders, make_product, make_restaurant, make_user
+
+
+def _restaurant_with_orders(db, created_at):
+    owner = make_user(db, role="właściciel")
+    restaurant = make_restaurant(db, owner)
+    products = [make_product(db, restaurant, price=10.0), make_product(db, restaurant, price=5.5)]
+    orders = make_orders(db, make_user(db), restaurant, products, len(created_at))
+    for order, moment in zip(orders, created_at):
+        order.created_at = moment
+    db.commit()
+    return owner, restaurant, orders
+
+
+def _csv_rows(body: bytes):
+    return list(csv.reader(io.StringIO(body.decode("utf-8-sig"))))
+
+
+def _export(client, path: str = "/orders/export", **params):
+    response = client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_export_scope(client, db, login_as):
+    owner, restaurant, _ = _restaurant_with_orders(db, [datetime(2024, 1, 1, 12)])
+    other_owner, other, _ = _restaurant_with_orders(db, [datetime(2024, 1, 1, 12)])
+
+    login_as(owner)
+    for path in ("/orders/export", "/orders/reviews/export"):
+        assert client.get(path, params={"restaurant_id": other.id}).status_code == 403
+        assert client.get(path, params={"restaurant_id": 10 ** 9}).status_code == 404
+    login_as(make_user(db))
+    assert client.get("/orders/export").status_code == 403
+    login_as(make_user(db, role="admin"))
+    assert client.get("/orders/export", params={"restaurant_id": 10 ** 9}).status_code == 404
+
+    # bez restaurant_id właściciel dostaje tylko swoje zamówienia
+    login_as(owner)
+    rows = _csv_rows(_export(client).content)
+    assert {row[ORDER_FIELDS.index("restaurant_id")] for row in rows[1:]} == {str(restaurant.id)}
+
+
+def test_export_date_bounds(client, db, login_as):
+    owner, restaurant, orders = _restaurant_with_orders(db, [
+        datetime(2024, 1, 9, 23, 59, 59), datetime(2024, 1, 10, 0, 0), datetime(2024, 1, 10, 23, 59, 59),
+        datetime(2024, 1, 11, 0, 0),
+    ])
+    ids = [order.id for order in orders]
+
+    def exported(**params):
+        body = _export(client, format="jsonl", restaurant_id=restaurant.id, **params).text
+        return [json.loads(line)["id"] for line in body.splitlines()]
+
+    login_as(owner)
+    # oba dni włącznie: od początku date_from do końca date_to
+    assert exported(date_from="2024-01-10", date_to="2024-01-10") == ids[1:3]
+    assert exported(date_from="2024-01-11") == ids[3:]
+    assert exported(date_to="2024-01-09") == ids[:1]
+    assert client.get("/orders/export", params={"date_from": "2024-01-11", "date_to": "2024-01-10"}).status_code == 400
+
+
+def test_export_csv_without_matches_keeps_header(client, db, login_as):
+    owner, restaurant, _ = _restaurant_with_orders(db, [datetime(2024, 1, 1, 12)])
+
+    login_as(owner)
+    response = _export(client, restaurant_id=restaurant.id, date_from="2030-01-01")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert _csv_rows(response.content) == [list(ORDER_FIELDS)]
+    reviews = _export(client, "/orders/reviews/export", restaurant_id=restaurant.id)
+    assert _csv_rows(reviews.content) == [list(REVIEW_FIELDS)]
+
+
+def test_export_jsonl(client, db, login_as):
+    owner, restaurant, orders = _restaurant_with_orders(db, [datetime(2024, 2, 1, 12), datetime(2024, 2, 2, 12)])
+    db.add(Review(order_id=orders[0].id, user_id=orders[0].user_id, restaurant_id=restaurant.id, rating=4,
+                  comment="Dobre", created_at=datetime(2024, 2, 1, 13)))
+    db.commit()
+
+    login_as(owner)
+    response = _export(client, format="jsonl", restaurant_id=restaurant.id)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="zamowienia.jsonl"' in response.headers["content-disposition"]
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["id"] for record in records] == [order.id for order in orders]
+    assert set(records[0]) == set(ORDER_FIELDS)
+    assert [(item["quantity"], item["price"]) for item in records[0]["items"]] == [(1, 10.0), (1, 5.5)]
+
+    reviews = _export(client, "/orders/reviews/export", format="jsonl", restaurant_id=restaurant.id)
+    assert [(r["order_id"], r["rating"], r["comment"]) for r in map(json.loads, reviews.text.splitlines())] == [
+        (orders[0].id, 4, "Dobre")
+    ]
+
+
+def test_export_gzip_matches_plain(client, db, login_as):
+    owner, restaurant, _ = _restaurant_with_orders(db, [datetime(2024, 3, day, 12) for day in range(1, 6)])
+
+    login_as(owner)
+    for fmt in ("csv", "jsonl"):
+        plain = _export(client, format=fmt, restaurant_id=restaurant.id, date_from="2024-03-01")
+        packed = _export(client, format=fmt, gzip=True, restaurant_id=restaurant.id, date_from="2024-03-01")
+        assert packed.headers["content-type"] == "application/gzip"
+        assert packed.headers["content-disposition"].endswith(f'.{fmt}.gz"')
+        # TestClient nie rozpakowuje - odpowiedź nie ma Content-Encoding, tylko jest plikiem .gz
+        assert gzip.decompress(packed.content) == plain.content
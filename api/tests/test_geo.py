@@ -0,0 +1,43 @@
+# Wyszukiwanie w pobliżu (geo.find_nearby) na krawędziach siatki: południk 180° i bieguny.
+from app.modules.restaurants import geo
+
+from conftest import make_restaurant, make_user
+
+
+def _placed(db, lat: float, lon: float):
+    restaurant = make_restaurant(db, make_user(db, role="właściciel"))
+    restaurant.latitude, restaurant.longitude = lat, lon
+    restaurant.geo_cell = geo.geo_cell(lat, lon)
+    db.commit()
+    return restaurant.id
+
+
+def _found(db, lat: float, lon: float, radius_km: float):
+    return {restaurant.id for restaurant, _ in geo.find_nearby(db, lat, lon, radius_km, limit=50)}
+
+
+def test_nearby_across_antimeridian(db):
+    west = _placed(db, -16.5, 179.98)   # Fidżi, po obu stronach południka 180°
+    east = _placed(db, -16.5, -179.98)
+    far = _placed(db, -16.5, -179.5)
+
+    assert _found(db, -16.5, 179.99, 10) == {west, east}
+    assert _found(db, -16.5, -179.99, 10) == {west, east}
+    assert far in _found(db, -16.5, 179.99, 60)
+
+
+def test_nearby_around_pole(db):
+    # koło obejmujące biegun - wszystkie długości geograficzne
+    here = _placed(db, 89.95, 10.0)
+    opposite = _placed(db, 89.95, -170.0)
+
+    assert _found(db, 89.99, 100.0, 20) == {here, opposite}
+
+
+def test_bounding_box_splits_at_antimeridian():
+    min_lat, max_lat, lon_ranges = geo.bounding_box(0.0, 179.95, 20)
+    assert min_lat < 0 < max_lat
+    assert len(lon_ranges) == 2
+    (west_from, west_to), (east_from, east_to) = lon_ranges
+    assert west_to == 180.0 and east_from == -180.0
+    assert 179.7 < west_from < 179.95 and -179.9 < east_to < -179.7
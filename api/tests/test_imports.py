@@ -0,0 +1,153 @@
+# Import masowy (app.core.bulk + importery restauracji, menu i zamówień).
+import json
+from datetime import date
+from itertools import count
+
+from sqlalchemy import func, insert, select
+
+from app.core import bulk
+from app.modules.orders.models import RestaurantDailyStats
+from app.modules.restaurants.models import Cuisine, Product
+
+from conftest import make_product, make_restaurant, make_user
+
+next_suffix = count(1).__next__
+
+
+def _upload(client, path: str, rows, filename: str = "dane.jsonl"):
+    body = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode()
+    response = client.post(path, files={"file": (filename, body)})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _order_row(restaurant, customer, items, **fields):
+    return {
+        "restaurant_id": restaurant.id, "user_id": customer.id, "created_at": "2024-03-01T12:00:00",
+        "delivery_address": "Testowa 1", "items": items, **fields,
+    }
+
+
+def test_order_import_requires_product_id(client, db, login_as):
+    # pozycja bez product_id nie może trafić do bazy - listy zamówień zwracają product_id każdej pozycji
+    admin = make_user(db, role="admin")
+    owner = make_user(db, role="właściciel")
+    restaurant = make_restaurant(db, owner)
+    product = make_product(db, restaurant)
+    customer = make_user(db)
+
+    login_as(admin)
+    result = _upload(client, "/orders/import", [
+        _order_row(restaurant, customer, [{"product_id": product.id, "name": product.name, "quantity": 1, "price": 20}]),
+        _order_row(restaurant, customer, [{"name": "Usunięte danie", "quantity": 1, "price": 15}]),
+    ])
+    assert result["inserted"] == 1
+    assert [error["row"] for error in result["errors"]] == [2]
+    assert "product_id" in result["errors"][0]["error"]
+
+    login_as(customer)
+    response = client.get("/orders/my-orders")
+    assert response.status_code == 200
+    assert [item["product_id"] for order in response.json() for item in order["items"]] == [product.id]
+
+    login_as(owner)
+    assert client.get("/orders/owner").status_code == 200
+
+
+def test_row_errors_are_reported_with_row_numbers(client, db, login_as):
+    admin = make_user(db, role="admin")
+    restaurant = make_restaurant(db, make_user(db, role="właściciel"))
+
+    login_as(admin)
+    csv_body = (
+        "restaurant_id,name,price,category\n"
+        f"{restaurant.id},Pierogi,18.5,Dania\n"
+        f"{restaurant.id},Zupa,-3,Zupy\n"
+        f"{restaurant.id},,12,Dania\n"
+        f"{restaurant.id},Kompot,6,Napoje\n"
+    ).encode()
+    response = client.post("/restaurants/products/import", files={"file": ("menu.csv", csv_body)})
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["inserted"], result["failed"]) == (2, 2)
+    assert [(error["row"], error["error"].split(":")[0]) for error in result["errors"]] == [(2, "price"), (3, "name")]
+    names = sorted(product["name"] for product in client.get(f"/restaurants/{restaurant.id}/products").json())
+    assert names == ["Kompot", "Pierogi"]
+
+
+def test_database_error_retries_chunk_row_by_row(db):
+    # drugi wiersz łamie unikalność normalized_name - pozostałe wiersze paczki mają zostać zapisane
+    suffix = next_suffix()
+    records = [
+        (1, {"name": f"Gruzińska {suffix}"}),
+        (2, {"name": f"GRUZIŃSKA {suffix}"}),
+        (3, {"name": f"Peruwiańska {suffix}"}),
+    ]
+
+    def prepare(db, chunk, report):
+        return [(number, {"name": data["name"], "normalized_name": data["name"].lower()}) for number, data in chunk]
+
+    def insert_cuisines(db, rows):
+        db.execute(insert(Cuisine), rows)
+
+    report = bulk.import_records(db, records, prepare, insert_cuisines, chunk_size=10)
+    assert report.inserted == 2
+    assert [error["row"] for error in report.errors] == [2]
+    saved = db.scalars(select(Cuisine.name).where(Cuisine.normalized_name.like(f"% {suffix}"))).all()
+    assert sorted(saved) == [f"Gruzińska {suffix}", f"Peruwiańska {suffix}"]
+
+
+def test_owner_imports_products_only_into_own_restaurants(client, db, login_as):
+    owner = make_user(db, role="właściciel")
+    own = make_restaurant(db, owner)
+    foreign = make_restaurant(db, make_user(db, role="właściciel"))
+
+    login_as(owner)
+    result = _upload(client, "/restaurants/products/import", [
+        {"restaurant_id": own.id, "name": "Schabowy", "price": 32, "category": "Dania"},
+        {"restaurant_id": foreign.id, "name": "Podrzucony", "price": 1, "category": "Dania"},
+    ])
+    assert result["inserted"] == 1
+    assert [error["row"] for error in result["errors"]] == [2]
+    assert db.scalar(select(func.count(Product.id)).where(Product.restaurant_id == foreign.id)) == 0
+    assert db.scalar(select(func.count(Product.id)).where(Product.restaurant_id == own.id)) == 1
+
+
+def test_order_import_rebuilds_owner_stats(client, db, login_as):
+    admin = make_user(db, role="admin")
+    restaurant = make_restaurant(db, make_user(db, role="właściciel"))
+    product = make_product(db, restaurant, price=25.0)
+    customer = make_user(db)
+    item = {"product_id": product.id, "name": product.name, "quantity": 2, "price": 25.0}
+
+    login_as(admin)
+    result = _upload(client, "/orders/import", [
+        _order_row(restaurant, customer, [item], created_at="2023-05-10T12:00:00"),
+        _order_row(restaurant, customer, [item], created_at="2023-05-10T18:00:00", status="cancelled"),
+    ])
+    assert result["inserted"] == 2
+
+    db.expire_all()
+    day = db.get(RestaurantDailyStats, (restaurant.id, date(2023, 5, 10)))
+    assert (day.order_count, day.revenue, day.cancelled_count) == (1, 50.0, 1)
+
+
+def test_restaurant_import_resolves_owner_and_cuisines(client, db, login_as):
+    admin = make_user(db, role="admin")
+    owner = make_user(db, role="właściciel")
+    name = f"Importowana {next_suffix()}"
+
+    login_as(admin)
+    result = _upload(client, "/restaurants/import", [
+        {"name": name, "cuisines": "Polska, Wegetariańska", "city": "Kraków", "street": "Długa", "number": "5",
+         "owner_email": owner.email.upper()},
+        {"name": "Bez właściciela", "cuisines": "Polska", "city": "Kraków", "street": "Krótka", "number": "1",
+         "owner_email": "nikt@test.local"},
+    ])
+    assert result["inserted"] == 1
+    assert [error["row"] for error in result["errors"]] == [2]
+
+    login_as(owner)
+    mine = client.get("/restaurants/mine").json()
+    assert [(r["name"], r["rating"]) for r in mine] == [(name, 0.0)]
+    assert sorted(c.strip() for c in mine[0]["cuisines"].split(",")) == ["Polska", "Wegetariańska"]
@@ -0,0 +1,32 @@
+# Liczba zapytań SQL list zamówień nie może rosnąć z liczbą zamówień (regresja N+1).
+import pytest
+
+from conftest import count_queries, make_orders, make_product, make_restaurant, make_user
+
+MANY = 10
+
+
+def _scenario(db, orders: int):
+    owner = make_user(db, role="właściciel")
+    restaurant = make_restaurant(db, owner)
+    products = [make_product(db, restaurant) for _ in range(3)]
+    customer = make_user(db)
+    make_orders(db, customer, restaurant, products, orders)
+    return owner, customer
+
+
+@pytest.mark.parametrize("path, viewer", [("/orders/my-orders", "customer"), ("/orders/owner", "owner")])
+def test_order_list_query_count_is_constant(client, db, login_as, path, viewer):
+    counts = {}
+    for orders in (1, MANY):
+        owner, customer = _scenario(db, orders)
+        login_as(owner if viewer == "owner" else customer)
+        client.get(path)  # rozgrzewka - jednorazowe zapytania (np. cache) nie wchodzą do pomiaru
+        with count_queries() as executed:
+            response = client.get(path)
+        assert response.status_code == 200
+        assert len(response.json()) == orders
+        assert all(len(order["items"]) == 3 for order in response.json())
+        counts[orders] = len(executed)
+
+    assert counts[1] == counts[MANY], f"{path}: {counts[1]} zapytań dla 1 zamówienia, {counts[MANY]} dla {MANY}"
@@ -0,0 +1,68 @@
+# Plany zapytań (EXPLAIN) gorących ścieżek - żadne nie może przechodzić całej tabeli bez indeksu.
+from app.db.database import engine
+from app.db.query_plans import check_query_plans, explain, full_scans
+from app.modules.restaurants import geo
+
+from conftest import count_queries, make_orders, make_product, make_restaurant, make_user
+
+
+def test_hot_query_plans(client):
+    with engine.connect() as connection:
+        failures = {name: scans for name, _, scans in check_query_plans(connection) if scans}
+    assert not failures
+
+
+def test_nearby_reads_geo_cell_ranges(client):
+    # zapytanie ma czytać tylko komórki siatki z prostokąta, nie wszystkie zatwierdzone restauracje
+    with engine.connect() as connection:
+        for radius_km in (2, 10, 50):
+            plan = explain(connection, geo.nearby_statement(50.06, 19.94, radius_km))
+            assert all("geo_cell" in line for line in plan if line.startswith("SEARCH restaurants")), plan
+
+
+def test_endpoint_query_plans(client, db, login_as):
+    """SQL faktycznie wysłany przez endpointy - razem z zapytaniami selectinload i filtrami z routerów."""
+    admin = make_user(db, role="admin")
+    owner = make_user(db, role="właściciel")
+    restaurant = make_restaurant(db, owner)
+    products = [make_product(db, restaurant) for _ in range(2)]
+    customer = make_user(db)
+    orders = make_orders(db, customer, restaurant, products, 3)
+
+    requests = [
+        (customer, "/orders/my-orders"),
+        (customer, "/orders/my-orders?limit=1"),
+        (customer, "/orders/active"),
+        (customer, f"/orders/{orders[0].id}/history"),
+        (owner, "/orders/owner"),
+        (owner, "/orders/owner?status=confirmed&date_from=2020-01-01T00:00:00"),
+        (owner, "/orders/reviews/mine"),
+        (owner, "/restaurants/mine"),
+        (customer, "/restaurants/"),
+        (customer, f"/restaurants/{restaurant.id}/products"),
+        (customer, f"/restaurants/menus?ids={restaurant.id}"),
+        (customer, "/restaurants/nearby?lat=50.06&lon=19.94&radius_km=10"),
+        (customer, "/restaurants/search?q=restauracja"),
+        (customer, f"/orders/{restaurant.id}/reviews"),
+        (admin, "/restaurants/applications"),
+        (admin, "/restaurants/applications/history"),
+        (admin, "/users/owner-requests"),
+    ]
+    with count_queries() as executed:
+        for user, path in requests:
+            login_as(user)
+            response = client.get(path)
+            assert response.status_code == 200, (path, response.text)
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor:
+                assert client.get(f"{path}&cursor={cursor}").status_code == 200
+
+    selects = {(sql, tuple(parameters)) for sql, parameters in executed if sql.lstrip().upper().startswith("SELECT")}
+    assert selects
+    with engine.connect() as connection:
+        failures = {}
+        for sql, parameters in selects:
+            scans = full_scans(explain(connection, sql, parameters))
+            if scans:
+                failures[sql] = scans
+    assert not failures
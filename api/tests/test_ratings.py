@@ -0,0 +1,46 @@
+# Ocena restauracji wynika wyłącznie z recenzji (rating_sum / rating_count).
+from sqlalchemy import create_engine, insert, select
+
+from app.db.database import Base
+from app.db.schema import upgrade_schema
+from app.modules.orders.models import Review
+from app.modules.restaurants.models import Restaurant
+
+from conftest import make_restaurant, make_user
+
+
+def test_legacy_database_gets_rating_aggregates_once(tmp_path):
+    # baza z create_all, bez alembic_version: kolumny agregatu są, ale z zerami - jak po sync_schema
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as connection:
+        connection.execute(insert(Restaurant), [
+            {"id": 1, "name": "Z opiniami", "cuisines": "Polska", "city": "Kraków", "street": "A", "number": "1",
+             "status": "approved", "rating": 4.5, "rating_sum": 0, "rating_count": 0},
+            {"id": 2, "name": "Bez opinii", "cuisines": "Polska", "city": "Kraków", "street": "B", "number": "2",
+             "status": "approved", "rating": 3.0, "rating_sum": 0, "rating_count": 0},
+        ])
+        connection.execute(insert(Review), [
+            {"restaurant_id": 1, "rating": 5}, {"restaurant_id": 1, "rating": 4},
+        ])
+
+    upgrade_schema(legacy)
+
+    with legacy.connect() as connection:
+        rows = connection.execute(
+            select(Restaurant.id, Restaurant.rating, Restaurant.rating_sum, Restaurant.rating_count)
+            .order_by(Restaurant.id)
+        ).all()
+        assert [tuple(row) for row in rows] == [(1, 4.5, 9, 2), (2, 3.0, 0, 0)]
+        assert connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar() == "0003"
+    legacy.dispose()
+
+
+def test_restaurant_update_ignores_rating(client, db, login_as):
+    owner = make_user(db, role="właściciel")
+    restaurant = make_restaurant(db, owner)
+
+    login_as(owner)
+    response = client.put(f"/restaurants/{restaurant.id}", json={"description": "Nowy opis", "rating": 5.0})
+    assert response.status_code == 200, response.text
+    assert (response.json()["description"], response.json()["rating"]) == ("Nowy opis", 0.0)
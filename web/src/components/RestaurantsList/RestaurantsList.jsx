@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import MenuModal from '../MenuModal/MenuModal';
 import ReviewsModal from "../ReviewsModal/ReviewsModal";
 
@@ -22,6 +22,29 @@ const RestaurantsList = ({ restaurants, onSelectRestaurant, selectedId, onShowMe
     // --- STANY FILTRÓW ---
     const [minRating, setMinRating] = useState(0);
     const [selectedCuisine, setSelectedCuisine] = useState("Wszystkie");
+    const [searchQuery, setSearchQuery] = useState("");
+    const [searchIds, setSearchIds] = useState(null); // id restauracji w kolejności trafności
+
+    // --- WYSZUKIWANIE (po stronie serwera, z opóźnieniem przy pisaniu) ---
+    useEffect(() => {
+        const query = searchQuery.trim();
+        if (!query) {
+            setSearchIds(null);
+            return;
+        }
+        const timer = setTimeout(async () => {
+            try {
+                const res = await fetch(`http://127.0.0.1:8000/restaurants/search?q=${encodeURIComponent(query)}&limit=100`);
+                if (!res.ok) throw new Error("Błąd wyszukiwania");
+                const found = await res.json();
+                setSearchIds(found.map(r => r.id));
+            } catch (err) {
+                console.error(err);
+                setSearchIds([]);
+            }
+        }, 300);
+        return () => clearTimeout(timer);
+    }, [searchQuery]);
 
     // --- OTWIERANIE MODALA MENU ---
     const handleOpenMenu = async (restaurant) => {
@@ -49,7 +72,7 @@ const RestaurantsList = ({ restaurants, onSelectRestaurant, selectedId, onShowMe
         setLoadingReviews(true);
 
         try {
-            const res = await fetch(`http://127.0.0.1:8000/orders/${restaurant.id}/reviews`);
+            const res = await fetch(`http://127.0.0.1:8000/orders/${restaurant.id}/reviews?latest=20`);
             if (!res.ok) throw new Error("Błąd pobierania recenzji");
             const reviews = await res.json();
             setRestaurantReviews(reviews);
@@ -62,7 +85,11 @@ const RestaurantsList = ({ restaurants, onSelectRestaurant, selectedId, onShowMe
     };
 
     // --- FILTROWANIE RESTAURACJI ---
-    const filteredRestaurants = restaurants.filter(r => {
+    const rankedRestaurants = searchIds === null
+        ? restaurants
+        : searchIds.map(id => restaurants.find(r => r.id === id)).filter(Boolean);
+
+    const filteredRestaurants = rankedRestaurants.filter(r => {
         if (r.rating < minRating) return false;
         if (selectedCuisine !== "Wszystkie") {
             const cuisinesData = Array.isArray(r.cuisines) ? r.cuisines.join(" ") : r.cuisines || "";
@@ -97,6 +124,13 @@ const RestaurantsList = ({ restaurants, onSelectRestaurant, selectedId, onShowMe
                 </h2>
                 
                 <div className="flex flex-col gap-3">
+                    <input
+                        type="search"
+                        value={searchQuery}
+                        onChange={(e) => setSearchQuery(e.target.value)}
+                        placeholder="Szukaj restauracji lub dania..."
+                        className="w-full p-2 bg-gray-100 dark:bg-gray-700 border-none rounded-lg text-sm focus:ring-2 focus:ring-purple-500 dark:text-white"
+                    />
                     <div>
                         <label className="text-xs font-semibold text-gray-500 uppercase dark:text-gray-400">Rodzaj Kuchni</label>
                         <select
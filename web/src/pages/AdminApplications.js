@@ -23,7 +23,7 @@ const AdminApplications = () => {
   // 1. Pobieranie nowych wniosków restauracji
   const fetchNewApplications = async () => {
     try {
-      const response = await fetch('http://127.0.0.1:8000/restaurants/applications', {
+      const response = await fetch('http://127.0.0.1:8000/restaurants/applications?include=owner', {
         headers: { "Authorization": `Bearer ${token}` }
       });
       if (!response.ok) throw new Error("Błąd pobierania wniosków restauracji");
@@ -90,7 +90,7 @@ const AdminApplications = () => {
   const fetchHistory = async () => {
     setLoading(true);
     try {
-      const response = await fetch('http://127.0.0.1:8000/restaurants/applications/history', {
+      const response = await fetch('http://127.0.0.1:8000/restaurants/applications/history?include=owner', {
         headers: { "Authorization": `Bearer ${token}` }
       });
       if (!response.ok) throw new Error("Błąd pobierania historii");
@@ -27,8 +27,7 @@ const AdminRestaurants = () => {
       cuisines: "",
       city: "",
       street: "",
-      number: "",
-      rating: 5.0
+      number: ""
   });
 
   // 1. POBIERANIE WSZYSTKICH RESTAURACJI
@@ -60,8 +59,7 @@ const AdminRestaurants = () => {
         cuisines: restaurant.cuisines,
         city: restaurant.city,
         street: restaurant.street,
-        number: restaurant.number,
-        rating: restaurant.rating
+        number: restaurant.number
     });
     setIsModalOpen(true);
   };
@@ -264,13 +262,6 @@ const AdminRestaurants = () => {
                                     value={formData.number} onChange={e => setFormData({...formData, number: e.target.value})}
                                 />
                             </div>
-                            <div>
-                                <label className="text-gray-400 text-sm">Ocena (Rating)</label>
-                                <input 
-                                    type="number" step="0.1" className="w-full p-2 bg-gray-900 border border-gray-600 rounded text-white"
-                                    value={formData.rating} onChange={e => setFormData({...formData, rating: parseFloat(e.target.value)})}
-                                />
-                            </div>
                         </div>
                     </div>
 
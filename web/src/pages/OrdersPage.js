@@ -65,6 +65,9 @@ const OrdersPage = () => {
     const [reviewOrder, setReviewOrder] = useState(null);
     const [rating, setRating] = useState(0);
     const [comment, setComment] = useState("");
+    // stronicowanie kursorem: /orders/my-orders zwraca stronę, X-Next-Cursor wskazuje starsze zamówienia
+    const [nextCursor, setNextCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const navigate = useNavigate();
     const token = localStorage.getItem("access_token");
@@ -83,6 +86,7 @@ const OrdersPage = () => {
             const data = await response.json();
             console.log("Pobrane zamówienia:", data);
             setOrders(data);
+            setNextCursor(response.headers.get("X-Next-Cursor"));
         } catch (err) {
             console.error("Błąd pobierania zamówień:", err);
             setError(err.message);
@@ -98,6 +102,27 @@ const OrdersPage = () => {
         }
     }, [token]);
 
+    const loadMoreOrders = async () => {
+        if (!nextCursor) return;
+        try {
+            setLoadingMore(true);
+            const response = await fetch(
+                `http://127.0.0.1:8000/orders/my-orders?cursor=${encodeURIComponent(nextCursor)}`,
+                { headers: { "Authorization": `Bearer ${token}` } }
+            );
+            if (!response.ok) {
+                throw new Error(`Błąd ${response.status}: ${await response.text()}`);
+            }
+            const data = await response.json();
+            setOrders(prev => [...prev, ...data]);
+            setNextCursor(response.headers.get("X-Next-Cursor"));
+        } catch (err) {
+            alert(err.message);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         if (!token) {
             navigate("/login");
@@ -395,6 +420,17 @@ const OrdersPage = () => {
                             {pastOrders.map(renderOrderCard)}
                         </div>
                     )}
+                    {nextCursor && (
+                        <div className="text-center mt-6">
+                            <button
+                                onClick={loadMoreOrders}
+                                disabled={loadingMore}
+                                className="bg-purple-600 hover:bg-purple-700 disabled:opacity-50 text-white px-6 py-2 rounded-lg font-semibold transition"
+                            >
+                                {loadingMore ? "Ładowanie..." : "Pokaż starsze zamówienia"}
+                            </button>
+                        </div>
+                    )}
                 </div>
 
             </div>
@@ -41,12 +41,15 @@ const Dashboard = () => {
   const [products, setProducts] = useState([]);
   const [loadingProducts, setLoadingProducts] = useState(false);
   const [loadingOrders, setLoadingOrders] = useState(false);
+  // /orders/owner zwraca stronę zamówień - X-Next-Cursor wskazuje starsze
+  const [ordersCursor, setOrdersCursor] = useState(null);
+  const [loadingMoreOrders, setLoadingMoreOrders] = useState(false);
 
   // Modale i Formularze (bez zmian)
   const [isRestModalOpen, setIsRestModalOpen] = useState(false);
   const [isProdModalOpen, setIsProdModalOpen] = useState(false);
   const [restForm, setRestForm] = useState({ 
-      name: "", category: RESTAURANT_CATEGORIES[0], city: "", street: "", number: "", rating: 5.0 
+      name: "", category: RESTAURANT_CATEGORIES[0], city: "", street: "", number: "" 
   });
   const [editForm, setEditForm] = useState(null);
   const [prodForm, setProdForm] = useState({ 
@@ -69,6 +72,19 @@ const Dashboard = () => {
     // eslint-disable-next-line
   }, [hasAccess]);
 
+  // --- ZAMÓWIENIA NA ŻYWO (SSE) - nowe zamówienia i zmiany statusów bez odświeżania ---
+  useEffect(() => {
+    if (!hasAccess || !token) return;
+    const source = new EventSource(`http://127.0.0.1:8000/orders/owner/events?access_token=${encodeURIComponent(token)}`);
+    source.addEventListener("order", (event) => {
+      const order = JSON.parse(event.data);
+      setOrders(prev => prev.some(o => o.id === order.id)
+        ? prev.map(o => o.id === order.id ? order : o)
+        : [order, ...prev]);
+    });
+    return () => source.close();
+  }, [hasAccess, token]);
+
   // --- ŁADOWANIE RECENZJI PO PRZEŁĄCZENIU ZAKŁADKI ---
   useEffect(() => {
     if (activeTab === 'reviews') loadReviews();
@@ -85,20 +101,52 @@ const Dashboard = () => {
     } catch (err) { console.error(err); }
   };
 
+  const fetchOrdersPage = async (params) => {
+    const res = await fetch(`http://127.0.0.1:8000/orders/owner?${params}`, {
+      headers: { "Authorization": `Bearer ${token}` }
+    });
+    if (!res.ok) throw new Error(`Błąd ${res.status}`);
+    return { data: await res.json(), cursor: res.headers.get("X-Next-Cursor") };
+  };
+
+  // dołącza zamówienia bez duplikatów, od najnowszych
+  const mergeOrders = (current, more) => {
+    const known = new Set(current.map(o => o.id));
+    return [...current, ...more.filter(o => !known.has(o.id))]
+      .sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+  };
+
   const fetchOrders = async () => {
     setLoadingOrders(true);
     try {
-      const res = await fetch("http://127.0.0.1:8000/orders/owner", {
-        headers: { "Authorization": `Bearer ${token}` }
-      });
-      if (res.ok) {
-        const data = await res.json();
-        setOrders(data);
+      const first = await fetchOrdersPage("");
+      // liczniki nowych zamówień muszą widzieć wszystkie 'confirmed', nie tylko pierwszą stronę
+      let confirmed = [];
+      if (first.cursor) {
+        let page = await fetchOrdersPage("status=confirmed");
+        confirmed = page.data;
+        while (page.cursor) {
+          page = await fetchOrdersPage(`status=confirmed&cursor=${encodeURIComponent(page.cursor)}`);
+          confirmed = confirmed.concat(page.data);
+        }
       }
+      setOrders(mergeOrders(first.data, confirmed));
+      setOrdersCursor(first.cursor);
     } catch (error) { console.error("Błąd pobierania zamówień", error); }
     finally { setLoadingOrders(false); }
   };
 
+  const loadMoreOrders = async () => {
+    if (!ordersCursor) return;
+    setLoadingMoreOrders(true);
+    try {
+      const page = await fetchOrdersPage(`cursor=${encodeURIComponent(ordersCursor)}`);
+      setOrders(prev => mergeOrders(prev, page.data));
+      setOrdersCursor(page.cursor);
+    } catch (error) { console.error("Błąd pobierania zamówień", error); }
+    finally { setLoadingMoreOrders(false); }
+  };
+
   // --- LOGIKA LICZNIKÓW ---
   const getNewOrdersCount = (restaurantId) => {
       // Liczymy zamówienia o statusie 'confirmed' (czyli nowe, nieprzyjęte jeszcze do kuchni)
@@ -169,7 +217,7 @@ const Dashboard = () => {
         const newRest = await res.json();
         setRestaurants([...restaurants, newRest]);
         setIsRestModalOpen(false);
-        setRestForm({ name: "", category: RESTAURANT_CATEGORIES[0], city: "", street: "", number: "", rating: 5.0 });
+        setRestForm({ name: "", category: RESTAURANT_CATEGORIES[0], city: "", street: "", number: "" });
     } catch (err) { alert("Błąd"); }
   };
 
@@ -465,7 +513,7 @@ const Dashboard = () => {
                                     Zamówienia: <span className="text-purple-600">{selectedRestaurantForOrders.name}</span>
                                 </h2>
                                 <span className="text-sm text-gray-500">
-                                    Łącznie: {filteredOrders.length}
+                                    Łącznie: {filteredOrders.length}{ordersCursor ? "+" : ""}
                                 </span>
                             </div>
 
@@ -523,7 +571,7 @@ const Dashboard = () => {
                                                                 </button>
                                                             )}
                                                             {(order.status === 'confirmed' || order.status === 'preparing') && (
-                                                                <button className="text-gray-400 hover:text-red-500 text-xs underline w-full text-center">Anuluj</button>
+                                                                <button onClick={() => handleStatusChange(order.id, 'cancelled')} className="text-gray-400 hover:text-red-500 text-xs underline w-full text-center">Anuluj</button>
                                                             )}
                                                         </div>
                                                     </div>
@@ -532,6 +580,17 @@ const Dashboard = () => {
                                         ))}
                                     </div>
                                 )}
+                                {!loadingOrders && ordersCursor && (
+                                    <div className="text-center mt-4">
+                                        <button
+                                            onClick={loadMoreOrders}
+                                            disabled={loadingMoreOrders}
+                                            className="bg-purple-600 hover:bg-purple-700 disabled:opacity-50 text-white px-6 py-2 rounded-lg font-semibold text-sm transition"
+                                        >
+                                            {loadingMoreOrders ? "Ładowanie..." : "Pokaż starsze zamówienia"}
+                                        </button>
+                                    </div>
+                                )}
                             </div>
                         </>
                     )}